@@ -8,6 +8,7 @@ function show_help() {
     echo "Available commands:"
     echo "  setup       - Set up development environment"
     echo "  server      - Run the FastAPI server"
+    echo "  serve       - Run the FastAPI server with production settings"
     echo "  test        - Run all tests"
     echo "  test:unit   - Run unit tests"
     echo "  lint        - Run linting checks"
@@ -26,6 +27,12 @@ case "$1" in
         echo "Starting FastAPI server..."
         uvicorn src.app.main:app --reload
         ;;
+    serve)
+        echo "Starting FastAPI server (production)..."
+        uvicorn src.app.main:app --host 0.0.0.0 --port 8000 \
+            --loop uvloop --http httptools \
+            --workers "$(nproc)" --limit-concurrency 1000 --timeout-keep-alive 30
+        ;;
     test)
         echo "Running all tests..."
         pytest
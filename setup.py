@@ -7,7 +7,7 @@ setup(
     package_dir={"":"src"},
     install_requires=[
         "fastapi>=0.88.0",
-        "uvicorn>=0.15.0",
+        "uvicorn[standard]>=0.15.0",
         "langchain>=0.0.267",
         "langchain-anthropic>=0.1.23",
         "anthropic>=0.5.0",
@@ -15,9 +15,10 @@ setup(
         "influxdb-client>=1.26.0",
         "pydantic>=2.0.0",
         "pydantic-settings>=2.0.0",
-        "python-jose>=3.3.0",
+        "pyjwt[crypto]>=2.8.0",
         "passlib>=1.7.4",
         "python-multipart>=0.0.5",
+        "orjson>=3.9.0",
         "websockets>=10.0",
         "pandas>=1.3.5",
         "numpy>=1.21.0",
@@ -39,6 +40,9 @@ setup(
             "mypy>=0.910",
             "flake8>=4.0.0"
         ],
+        "jit": [
+            "numba>=0.59.0"
+        ],
     },
     python_requires=">=3.9",
 )
\ No newline at end of file
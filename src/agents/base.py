@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 import json
+import logging
 import uuid
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class Agent(ABC):
     """
     Base class for all agents in the trading strategy system.
@@ -80,6 +83,15 @@ class Agent(ABC):
         required_fields = ["message_id", "timestamp", "sender", "recipient", "message_type", "content"]
         return all(field in message for field in required_fields)
     
+    def is_message_logging_enabled(self) -> bool:
+        """
+        Check whether log_message would emit anything.
+        
+        Returns:
+            True if message logging is enabled (DEBUG level)
+        """
+        return logger.isEnabledFor(logging.DEBUG)
+    
     def log_message(self, message: Dict[str, Any], direction: str = "received") -> None:
         """
         Log a message for debugging purposes.
@@ -88,7 +100,14 @@ class Agent(ABC):
             message: Message to log
             direction: "received" or "sent"
         """
-        # In a real implementation, this would use a proper logger
-        print(f"[{self.name}] {direction.upper()} from {message['sender']}: {message['message_type']}")
+        # Skip all argument work on the steady-state path when DEBUG is off
+        if not self.is_message_logging_enabled():
+            return
         # Don't log entire content in production to avoid exposing sensitive data
-        # print(json.dumps(message, indent=2))
\ No newline at end of file
+        logger.debug(
+            "[%s] %s from %s: %s",
+            self.name,
+            direction.upper(),
+            message.get("sender"),
+            message.get("message_type"),
+        )
\ No newline at end of file
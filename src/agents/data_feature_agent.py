@@ -8,19 +8,40 @@ generating features for strategies, and validating data availability.
 import logging
 import json
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Union, Any, Set, Coroutine
 from datetime import datetime
 
+import numpy as np
+
 from .base import Agent
 from ..services.indicators import IndicatorService
 from ..services.data_availability import DataAvailabilityService
 from ..services.data_retrieval import DataRetrievalService
 from ..models.market_data import OHLCV, OHLCVPoint, MarketDataRequest
-from ..models.strategy import DataConfig, DataSource, DataSourceType
-from ..database.influxdb import InfluxDBClient
+from ..models.strategy import BacktestDataRange, DataConfig, DataSource, DataSourceType
+from ..database.connection import get_influxdb_client
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads used to calculate indicators for a single request
+MAX_INDICATOR_WORKERS = 8
+
+
+@dataclass
+class HandlerResult:
+    """
+    Tagged result passed between the agent's internal helpers.
+    
+    Helpers return a HandlerResult instead of an error-keyed dict so callers
+    branch on ``ok`` rather than scanning the payload; handlers convert it to
+    message content at the edge.
+    """
+    ok: bool
+    value: Any = None
+    error: Optional[str] = None
+
 
 class DataFeatureAgent(Agent):
     """
@@ -43,10 +64,10 @@ class DataFeatureAgent(Agent):
         """
         super().__init__(name="data_feature")
         
-        # Create InfluxDB client if needed for services
+        # Use the shared InfluxDB client if needed for services
         influxdb_client = None
         if data_availability_service is None or data_retrieval_service is None:
-            influxdb_client = InfluxDBClient()
+            influxdb_client = get_influxdb_client()
         
         # Initialize services with defaults if not provided
         self.indicator_service = indicator_service or IndicatorService()
@@ -175,27 +196,22 @@ class DataFeatureAgent(Agent):
                 }
             
             # Get market data
-            market_data_request = {
+            market_data = self._retrieve_market_data({
                 "instrument": instrument,
                 "timeframe": timeframe,
                 "start_date": start_date,
                 "end_date": end_date,
                 "sources": sources
-            }
-            
-            market_data_result = self._handle_get_market_data(market_data_request)
-            
-            if "error" in market_data_result:
-                return market_data_result
-            
-            ohlcv_data = market_data_result.get("data", {}).get("ohlcv")
+            })
             
-            if not ohlcv_data:
+            if not market_data.ok:
                 return {
                     "type": "error",
-                    "error": "Failed to retrieve market data"
+                    "error": market_data.error
                 }
             
+            ohlcv_data = market_data.value
+            
             # Calculate indicator
             indicator_result = self.indicator_service.calculate_indicator(
                 indicator_type=indicator_type,
@@ -231,6 +247,39 @@ class DataFeatureAgent(Agent):
         Returns:
             Market data retrieval result
         """
+        result = self._retrieve_market_data(data)
+        if not result.ok:
+            return {
+                "type": "error",
+                "error": result.error
+            }
+        
+        ohlcv_data = result.value
+        return {
+            "type": "market_data_result",
+            "data": {
+                "ohlcv": ohlcv_data,
+                "metadata": {
+                    "instrument": data.get("instrument"),
+                    "timeframe": data.get("timeframe"),
+                    "start_date": data.get("start_date"),
+                    "end_date": data.get("end_date"),
+                    "source": ohlcv_data.source,
+                    "data_points": len(ohlcv_data.data)
+                }
+            }
+        }
+    
+    def _retrieve_market_data(self, data: Dict[str, Any]) -> "HandlerResult":
+        """
+        Retrieve OHLCV data for a market data request.
+        
+        Args:
+            data: Market data request parameters
+            
+        Returns:
+            HandlerResult holding the OHLCV data, or the error message
+        """
         try:
             # Extract parameters from message
             instrument = data.get("instrument")
@@ -241,10 +290,7 @@ class DataFeatureAgent(Agent):
             
             # Validate required parameters
             if not all([instrument, timeframe, start_date, end_date]):
-                return {
-                    "type": "error",
-                    "error": "Missing required parameters"
-                }
+                return HandlerResult(ok=False, error="Missing required parameters")
             
             # Convert sources to proper DataSource objects
             data_sources = []
@@ -263,7 +309,8 @@ class DataFeatureAgent(Agent):
                     # If not a valid enum value, keep as string
                     pass
                 
-                data_sources.append(DataSource(
+                # Values were just normalised above, so skip re-validation
+                data_sources.append(DataSource.model_construct(
                     type=source_type,
                     priority=priority
                 ))
@@ -290,32 +337,13 @@ class DataFeatureAgent(Agent):
                 )
             
             if not ohlcv_data:
-                return {
-                    "type": "error",
-                    "error": "Failed to retrieve market data"
-                }
+                return HandlerResult(ok=False, error="Failed to retrieve market data")
             
-            return {
-                "type": "market_data_result",
-                "data": {
-                    "ohlcv": ohlcv_data,
-                    "metadata": {
-                        "instrument": instrument,
-                        "timeframe": timeframe,
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "source": ohlcv_data.source,
-                        "data_points": len(ohlcv_data.data)
-                    }
-                }
-            }
+            return HandlerResult(ok=True, value=ohlcv_data)
             
         except Exception as e:
             logger.error(f"Error retrieving market data: {e}")
-            return {
-                "type": "error",
-                "error": f"Error retrieving market data: {str(e)}"
-            }
+            return HandlerResult(ok=False, error=f"Error retrieving market data: {str(e)}")
     
     def _handle_prepare_strategy_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -450,21 +478,23 @@ class DataFeatureAgent(Agent):
                     "error": "Missing required parameters"
                 }
             
-            # Create DataConfig object for availability check
-            data_config = DataConfig(
+            # Create DataConfig object for availability check. The agent authors
+            # these values itself, so build the models without re-running
+            # validation on every message
+            data_config = DataConfig.model_construct(
                 instrument=instrument,
                 frequency=timeframe,
                 sources=[
-                    DataSource(
+                    DataSource.model_construct(
                         type=source.get("type"),
                         priority=source.get("priority", 1)
                     )
                     for source in sources
                 ],
-                backtest_range={
-                    "start_date": start_date,
-                    "end_date": end_date
-                }
+                backtest_range=BacktestDataRange.model_construct(
+                    start_date=start_date,
+                    end_date=end_date
+                )
             )
             
             # Check data availability (run async function synchronously)
@@ -517,26 +547,21 @@ class DataFeatureAgent(Agent):
                 }
             
             # Get market data
-            market_data_request = {
+            market_data = self._retrieve_market_data({
                 "instrument": instrument,
                 "timeframe": timeframe,
                 "start_date": start_date,
                 "end_date": end_date
-            }
-            
-            market_data_result = self._handle_get_market_data(market_data_request)
-            
-            if "error" in market_data_result:
-                return market_data_result
+            })
             
-            ohlcv_data = market_data_result.get("data", {}).get("ohlcv")
-            
-            if not ohlcv_data:
+            if not market_data.ok:
                 return {
                     "type": "error",
-                    "error": "Failed to retrieve market data for visualization"
+                    "error": market_data.error
                 }
             
+            ohlcv_data = market_data.value
+            
             # Format OHLCV data for visualization
             formatted_ohlcv = self._format_ohlcv_for_visualization(ohlcv_data)
             
@@ -544,9 +569,8 @@ class DataFeatureAgent(Agent):
             formatted_indicators = {}
             
             if indicators:
-                indicator_results = self.indicator_service.calculate_multiple_indicators(
-                    ohlcv_data=ohlcv_data,
-                    indicators_config=indicators
+                indicator_results = self._calculate_indicators_concurrently(
+                    ohlcv_data, indicators
                 )
                 
                 for name, data in indicator_results.items():
@@ -567,7 +591,7 @@ class DataFeatureAgent(Agent):
                 "type": "visualization_result",
                 "data": {
                     "data": visualization_data,
-                    "format": "json"
+                    "format": "numpy"
                 }
             }
             
@@ -578,6 +602,46 @@ class DataFeatureAgent(Agent):
                 "error": f"Error creating visualization: {str(e)}"
             }
     
+    def _calculate_indicators_concurrently(self, ohlcv_data: OHLCV,
+                                           indicators: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Calculate independent indicators in parallel threads.
+        
+        Each configuration is submitted as its own single-item batch so naming,
+        default parameters and per-indicator error handling match
+        calculate_multiple_indicators. The TA-Lib/NumPy kernels release the GIL,
+        so independent indicators scale across threads.
+        
+        Args:
+            ohlcv_data: OHLCV data to calculate indicators on
+            indicators: List of indicator configurations
+            
+        Returns:
+            Dict of indicator results keyed by indicator name
+        """
+        if len(indicators) == 1:
+            return self.indicator_service.calculate_multiple_indicators(
+                ohlcv_data=ohlcv_data,
+                indicators_config=indicators
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_INDICATOR_WORKERS, len(indicators))) as executor:
+            futures = [
+                executor.submit(
+                    self.indicator_service.calculate_multiple_indicators,
+                    ohlcv_data=ohlcv_data,
+                    indicators_config=[config]
+                )
+                for config in indicators
+            ]
+            
+            # Merge in submission order so duplicate names resolve as before
+            results = {}
+            for future in futures:
+                results.update(future.result())
+        
+        return results
+    
     def _validate_data_for_strategy(self, strategy_id: str, data_config: DataConfig) -> Dict[str, Any]:
         """
         Validate data availability for a strategy.
@@ -634,32 +698,65 @@ class DataFeatureAgent(Agent):
             ohlcv_data: OHLCV data to format
             
         Returns:
-            Formatted data for visualization
+            Formatted data for visualization. Prices are float32 numpy arrays
+            and volume is a float64 array, so the payload needs a NumPy-aware
+            encoder such as orjson with ``OPT_SERIALIZE_NUMPY``
         """
-        timestamps = []
-        opens = []
-        highs = []
-        lows = []
-        closes = []
-        volumes = []
-        
-        for point in ohlcv_data.data:
-            timestamps.append(point.timestamp.isoformat())
-            opens.append(float(point.open))
-            highs.append(float(point.high))
-            lows.append(float(point.low))
-            closes.append(float(point.close))
-            volumes.append(float(point.volume))
+        points = ohlcv_data.data
+        count = len(points)
+        
+        # Keep the columns as typed arrays rather than six lists of Python
+        # floats; float32 is plenty of precision for charting prices
+        def column(field: str, dtype: type = np.float32) -> np.ndarray:
+            return np.fromiter(
+                (getattr(point, field) for point in points),
+                dtype=dtype,
+                count=count
+            )
         
         return {
-            "timestamps": timestamps,
-            "open": opens,
-            "high": highs,
-            "low": lows,
-            "close": closes,
-            "volume": volumes
+            "timestamps": self._format_timestamps([point.timestamp for point in points]),
+            "open": column("open"),
+            "high": column("high"),
+            "low": column("low"),
+            "close": column("close"),
+            # float32 rounds integers above 2**24, well within daily volumes
+            "volume": column("volume", np.float64)
         }
     
+    def _format_timestamps(self, timestamps: List[datetime]) -> List[str]:
+        """
+        Format a batch of timestamps as ISO 8601 strings in one vectorized call.
+        
+        Produces the same strings as calling ``isoformat()`` on each timestamp.
+        Batches that are timezone-aware, or that mix whole-second and
+        sub-second values, fall back to the per-point path.
+        
+        Args:
+            timestamps: Timestamps of the data points
+            
+        Returns:
+            List of ISO 8601 timestamp strings
+        """
+        if not timestamps:
+            return []
+        
+        if any(timestamp.tzinfo is not None for timestamp in timestamps):
+            return [timestamp.isoformat() for timestamp in timestamps]
+        
+        values = np.array(timestamps, dtype="datetime64[us]")
+        # isoformat() only includes microseconds when they are non-zero, so a
+        # single unit only fits batches that agree on it
+        has_micros = (values.astype(np.int64) % 1_000_000) != 0
+        if has_micros.all():
+            unit = "us"
+        elif not has_micros.any():
+            unit = "s"
+        else:
+            return [timestamp.isoformat() for timestamp in timestamps]
+        
+        return np.datetime_as_string(values, unit=unit).tolist()
+    
     def _format_indicator_for_visualization(self, indicator_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Format indicator data for visualization.
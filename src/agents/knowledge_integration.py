@@ -5,12 +5,94 @@ This module contains helper functions for integrating the Neo4j knowledge graph
 with the agent system to provide knowledge-driven recommendations and validations.
 """
 
+import asyncio
+import copy
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of recommendations keyed on (repository, strategy_type).
+# Recommendations are stable across sessions and repositories are long-lived
+# singletons, so holding a reference to them here is fine.
+RECOMMENDATION_CACHE_SIZE = 128
+_recommendation_cache: "OrderedDict[Tuple[Any, str], Dict[str, Any]]" = OrderedDict()
+_recommendation_cache_lock = threading.Lock()
+
+
+def clear_recommendation_cache() -> None:
+    """Clear the cached knowledge recommendations."""
+    with _recommendation_cache_lock:
+        _recommendation_cache.clear()
+    _template_for.cache_clear()
+
+
+def _get_cached_recommendations(key: Tuple[Any, str]) -> Optional[Dict[str, Any]]:
+    """Return a copy of cached recommendations, or None on a miss."""
+    with _recommendation_cache_lock:
+        if key not in _recommendation_cache:
+            return None
+        _recommendation_cache.move_to_end(key)
+        # Copy so callers mutating the result don't poison the cache
+        return copy.deepcopy(_recommendation_cache[key])
+
+
+def _cache_recommendations(key: Tuple[Any, str], recommendations: Dict[str, Any]) -> None:
+    """Store a copy of recommendations, evicting the least recently used entry."""
+    with _recommendation_cache_lock:
+        _recommendation_cache[key] = copy.deepcopy(recommendations)
+        _recommendation_cache.move_to_end(key)
+        if len(_recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+            _recommendation_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=256)
+def _template_for(strategy_repository, strategy_type: str, instrument: str, timeframe: str) -> Dict[str, Any]:
+    """
+    Generate a strategy template, memoized per repository and arguments.
+    
+    Callers must treat the returned template as read-only.
+    
+    Raises:
+        RuntimeError: If the repository could not build a complete template,
+            so that failures are not cached
+    """
+    template = strategy_repository.generate_strategy_template(
+        strategy_type=strategy_type,
+        instrument=instrument,
+        timeframe=timeframe
+    )
+    if template and "error" in template:
+        raise RuntimeError(template["error"])
+    return template
+
+
+def _get_recommendation_components(strategy_repository, strategy_type: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch recommended indicators, position sizing and risk management.
+    
+    All three come back from the repository's single bundle query.
+    
+    Args:
+        strategy_repository: Repository for Neo4j operations
+        strategy_type: Type of trading strategy
+        
+    Returns:
+        Dictionary with "indicators", "position_sizing" and "risk_management" lists
+    """
+    return strategy_repository.get_recommendations_bundle(
+        strategy_type=strategy_type,
+        min_strength=0.7,
+        min_compatibility=0.7,
+        indicator_limit=3,
+        position_sizing_limit=1,
+        risk_management_limit=2
+    )
+
 
 def get_knowledge_recommendations(strategy_repository, strategy_type: str) -> Dict[str, Any]:
     """
@@ -30,56 +112,72 @@ def get_knowledge_recommendations(strategy_repository, strategy_type: str) -> Di
         "explanation": ""
     }
     
-    if not strategy_repository:
+    # Nothing to look up until the strategy type is known
+    if not strategy_repository or not strategy_type or not isinstance(strategy_type, str):
         return recommendations
     
+    cache_key = (strategy_repository, strategy_type)
+    cached = _get_cached_recommendations(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Get recommended indicators
-        indicators = strategy_repository.get_indicators_for_strategy_type(
-            strategy_type=strategy_type, 
-            min_strength=0.7,
-            limit=3
-        )
+        # Get indicators, position sizing and risk management together
+        bundle = _get_recommendation_components(strategy_repository, strategy_type)
+        rationale_parts = []
+        
+        indicators = bundle.get("indicators", [])
         if indicators:
             recommendations["indicators"] = [i["name"] for i in indicators]
             
             # Get explanation for first indicator
             if indicators[0].get("explanation"):
-                recommendations["explanation"] += f"Indicator rationale: {indicators[0]['explanation']} "
+                rationale_parts.append(f"Indicator rationale: {indicators[0]['explanation']}")
         
-        # Get position sizing
-        position_sizing = strategy_repository.get_position_sizing_for_strategy_type(
-            strategy_type=strategy_type,
-            min_compatibility=0.7,
-            limit=1
-        )
-        if position_sizing and len(position_sizing) > 0:
+        position_sizing = bundle.get("position_sizing", [])
+        if position_sizing:
             recommendations["position_sizing"] = position_sizing[0]["name"]
             
             # Get explanation
             if position_sizing[0].get("explanation"):
-                recommendations["explanation"] += f"Position sizing rationale: {position_sizing[0]['explanation']} "
+                rationale_parts.append(f"Position sizing rationale: {position_sizing[0]['explanation']}")
         
-        # Get risk management
-        risk_management = strategy_repository.get_risk_management_for_strategy_type(
-            strategy_type=strategy_type,
-            min_compatibility=0.7,
-            limit=2
-        )
+        risk_management = bundle.get("risk_management", [])
         if risk_management:
             recommendations["risk_management"] = [rm["name"] for rm in risk_management]
             
             # Get explanation
             if risk_management[0].get("explanation"):
-                recommendations["explanation"] += f"Risk management rationale: {risk_management[0]['explanation']}"
+                rationale_parts.append(f"Risk management rationale: {risk_management[0]['explanation']}")
+        
+        recommendations["explanation"] = " ".join(rationale_parts)
                 
     except Exception as e:
         logger.error(f"Error getting knowledge recommendations: {e}")
         recommendations["explanation"] = f"Error retrieving recommendations: {str(e)}"
+        return recommendations
+    
+    # Only cache results that found something, so an unavailable graph is retried
+    if any(recommendations[key] for key in ("indicators", "position_sizing", "risk_management")):
+        _cache_recommendations(cache_key, recommendations)
         
     return recommendations
 
 
+async def get_knowledge_recommendations_async(strategy_repository, strategy_type: str) -> Dict[str, Any]:
+    """
+    Get knowledge-driven recommendations without blocking the event loop.
+    
+    Args:
+        strategy_repository: Neo4j strategy repository instance
+        strategy_type: Type of trading strategy
+        
+    Returns:
+        Dictionary with recommendations
+    """
+    return await asyncio.to_thread(get_knowledge_recommendations, strategy_repository, strategy_type)
+
+
 def enhance_validation_feedback(strategy_repository, errors: List[str], strategy_type: str) -> List[str]:
     """
     Generate knowledge-driven suggestions based on validation errors.
@@ -92,28 +190,42 @@ def enhance_validation_feedback(strategy_repository, errors: List[str], strategy
     Returns:
         List of knowledge-driven suggestions
     """
-    if not strategy_repository:
+    if not strategy_repository or not strategy_type:
         return []
         
     knowledge_suggestions = []
     
     try:
+        # Each suggestion category fires at most once, however many errors match it
+        fired = set()
         for error in errors:
-            if "lookback_period" in error or "period" in error:
-                # Get indicator recommendations
-                indicators = strategy_repository.get_indicators_for_strategy_type(strategy_type)
-                if indicators:
+            if "indicators" not in fired and ("lookback_period" in error or "period" in error):
+                fired.add("indicators")
+                # Get indicator recommendations; only names are shown
+                indicator_names = strategy_repository.get_indicator_names_for_strategy_type(strategy_type, limit=3)
+                if indicator_names:
                     knowledge_suggestions.append(
                         f"Based on our trading knowledge, the {strategy_type} strategy typically works best with these indicators: "
-                        f"{', '.join([i['name'] for i in indicators[:3]])}"
+                        f"{', '.join(indicator_names)}"
                     )
             
-            if "threshold" in error or "deviation" in error:
+            if "parameters" not in fired and ("threshold" in error or "deviation" in error):
+                fired.add("parameters")
                 # Add strategy-specific suggestions
                 knowledge_suggestions.append(
                     f"For {strategy_type} strategies, consider using default parameters from our knowledge base. "
                     f"These parameters have been optimized based on historical performance."
                 )
+                
+        # If no specific error-based suggestions, provide general recommendation
+        if not knowledge_suggestions and strategy_type:
+            template = _template_for(strategy_repository, strategy_type, "generic", "daily")
+            if template:
+                knowledge_suggestions.append(
+                    f"Consider using our pre-defined template for {strategy_type} strategies, "
+                    f"which includes recommended indicators ({', '.join(template.get('component_indicators', [])[:3])}) "
+                    f"and position sizing methods ({template.get('component_position_sizing', 'percent')})."
+                )
     except Exception as e:
         logger.error(f"Error enhancing validation feedback: {e}")
         
@@ -145,10 +257,13 @@ def enhance_strategy_with_knowledge(
         # Get strategy recommendations
         recommendations = get_knowledge_recommendations(strategy_repository, strategy_type)
         
-        # Add indicators with parameters
+        # Add indicators with parameters, fetched for all indicators at once
+        params_by_indicator = strategy_repository.get_parameters_for_indicators(
+            recommendations["indicators"]
+        )
         indicators = []
         for indicator_name in recommendations["indicators"]:
-            params = strategy_repository.get_parameters_for_indicator(indicator_name)
+            params = params_by_indicator.get(indicator_name, [])
             indicator = {
                 "name": indicator_name,
                 "parameters": {p["name"]: p.get("default_value", 14) for p in params}
@@ -1,10 +1,74 @@
+import logging
+import re
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from .base import Agent
+from ..app.config import settings
 from langchain_anthropic import ChatAnthropic
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable
 from .data_feature_agent import DataFeatureAgent
 
+logger = logging.getLogger(__name__)
+
+# Router prompt is parsed once at import and shared by every MasterAgent
+ROUTER_PROMPT = PromptTemplate.from_template(
+    """
+    You are the Master Agent in a trading strategy system. Your job is to determine
+    which specialized agent should handle the incoming message.
+    
+    Available agents:
+    - conversation: For natural language interaction, explaining concepts, guiding users
+    - validation: For checking if parameters and strategy components are valid
+    - data: For retrieving market data, calculating indicators, checking data availability, and creating visualizations
+    - code: For generating strategy code
+    - feedback: For analyzing backtest results and providing improvement suggestions
+    
+    Current conversation state:
+    {conversation_state}
+    
+    User message:
+    {message}
+    
+    Which agent should handle this message? Respond with just the agent name.
+    """
+)
+
+
+# Data/Feature Agent keywords
+DATA_KEYWORDS = (
+    "market data", "price data", "historical data", "ohlcv", 
+    "indicator", "indicators", "technical analysis", "calculate", "visualization",
+    "chart", "graph", "plot", "data availability", "backtest data"
+)
+
+# Single case-insensitive alternation so routing is one C-level scan of the raw
+# message, without a substring check per keyword or a lowercased copy of the
+# message; matches anywhere in the text, like the original `in` test
+DATA_KEYWORDS_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in DATA_KEYWORDS),
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1)
+def _get_router_llm() -> Optional[ChatAnthropic]:
+    """Get the shared routing LLM client, or None if no API key is configured."""
+    if not settings.ANTHROPIC_API_KEY:
+        return None
+    return ChatAnthropic(model_name="claude-3-7-sonnet-20250219", api_key=settings.ANTHROPIC_API_KEY)
+
+
+@lru_cache(maxsize=1)
+def _get_router_chain() -> Optional[Runnable]:
+    """Get the shared routing chain, or None if the routing LLM is unavailable."""
+    llm = _get_router_llm()
+    if llm is None:
+        return None
+    return ROUTER_PROMPT | llm | StrOutputParser()
+
+
 class MasterAgent(Agent):
     """
     Master Agent that orchestrates the overall workflow and coordinates
@@ -22,79 +86,92 @@ class MasterAgent(Agent):
         """Initialize the Master Agent with specialized agents and LLM."""
         super().__init__(name="master_agent")
         
-        # Initialize LLM (will be used for routing decisions)
-        # For testing we'll use a dummy setup, in production we'd use actual Claude
-        self.llm = ChatAnthropic(model_name="claude-3-7-sonnet-20250219")
+        # Initialize LLM (will be used for routing decisions); None when no
+        # Anthropic API key is configured, e.g. in tests
+        self.llm = _get_router_llm()
         
         # Initialize state
         self.conversation_state = {}
         
-        # Initialize specialized agents
-        # For testing, we'll conditionally initialize to avoid DB connections in tests
-        try:
-            # Try to initialize DataFeatureAgent
-            from ..database.influxdb import InfluxDBClient
-            from ..services.indicators import IndicatorService
-            from ..services.data_availability import DataAvailabilityService
-            from ..services.data_retrieval import DataRetrievalService
-            
-            # Create services with shared dependencies
-            influxdb_client = InfluxDBClient()
-            indicator_service = IndicatorService()
-            data_availability_service = DataAvailabilityService(influxdb_client=influxdb_client)
-            data_retrieval_service = DataRetrievalService(
-                influxdb_client=influxdb_client,
-                indicator_service=indicator_service
-            )
-            
-            # Initialize DataFeatureAgent with shared services
-            data_agent = DataFeatureAgent(
-                indicator_service=indicator_service,
-                data_availability_service=data_availability_service,
-                data_retrieval_service=data_retrieval_service
-            )
-        except Exception as e:
-            # If initialization fails, use None for testing
-            data_agent = None
-            
-        # Set up agent dictionary
+        # Set up agent dictionary. Agents with a factory are built on first use,
+        # so traffic that never reaches them never pays their setup cost
         self.specialized_agents = {
             "conversation": None,  # ConversationalAgent(),
             "validation": None,    # ValidationAgent(),
-            "data": data_agent,    # DataFeatureAgent
+            "data": None,          # DataFeatureAgent, built lazily
             "code": None,          # CodeAgent(),
             "feedback": None,      # FeedbackAgent()
         }
+        self._agent_factories = {
+            "data": self._build_data_agent,
+        }
+        self._failed_agents = set()
         
-        # Initialize router chain
-        self.router_prompt = PromptTemplate.from_template(
-            """
-            You are the Master Agent in a trading strategy system. Your job is to determine
-            which specialized agent should handle the incoming message.
-            
-            Available agents:
-            - conversation: For natural language interaction, explaining concepts, guiding users
-            - validation: For checking if parameters and strategy components are valid
-            - data: For retrieving market data, calculating indicators, checking data availability, and creating visualizations
-            - code: For generating strategy code
-            - feedback: For analyzing backtest results and providing improvement suggestions
-            
-            Current conversation state:
-            {conversation_state}
-            
-            User message:
-            {message}
-            
-            Which agent should handle this message? Respond with just the agent name.
-            """
+        # Router prompt, LLM and chain are shared across instances
+        self.router_prompt = ROUTER_PROMPT
+        self.router_chain = _get_router_chain()
+    
+    def _build_data_agent(self) -> DataFeatureAgent:
+        """
+        Build the Data/Feature Agent with shared services.
+        
+        Returns:
+            Initialized DataFeatureAgent
+        """
+        from ..database.connection import get_influxdb_client
+        from ..services.indicators import IndicatorService
+        from ..services.data_availability import DataAvailabilityService
+        from ..services.data_retrieval import DataRetrievalService
+        
+        # Create services with shared dependencies
+        influxdb_client = get_influxdb_client()
+        indicator_service = IndicatorService()
+        data_availability_service = DataAvailabilityService(influxdb_client=influxdb_client)
+        data_retrieval_service = DataRetrievalService(
+            influxdb_client=influxdb_client,
+            indicator_service=indicator_service
         )
         
-        self.router_chain = LLMChain(llm=self.llm, prompt=self.router_prompt)
+        # Initialize DataFeatureAgent with shared services
+        return DataFeatureAgent(
+            indicator_service=indicator_service,
+            data_availability_service=data_availability_service,
+            data_retrieval_service=data_retrieval_service
+        )
+    
+    def _get_agent(self, name: str) -> Optional[Agent]:
+        """
+        Get a specialized agent, building it on first use if it has a factory.
+        
+        Args:
+            name: Name of the specialized agent
+            
+        Returns:
+            The agent, or None if it is not available
+        """
+        agent = self.specialized_agents.get(name)
+        if agent is not None or name not in self._agent_factories or name in self._failed_agents:
+            return agent
+        
+        try:
+            agent = self._agent_factories[name]()
+        except Exception as e:
+            # Don't retry on every message; the agent stays unavailable
+            logger.warning(f"Failed to initialize '{name}' agent: {e}")
+            self._failed_agents.add(name)
+            return None
+        
+        self.specialized_agents[name] = agent
+        return agent
     
     def route_message(self, message: str, state: Dict[str, Any]) -> str:
         """
         Determine which agent should process the message.
         
+        Routing is keyword-based for now. LLM-based routing would call
+        ``self.router_chain.invoke({"message": message, "conversation_state": str(state)})``
+        and use the stripped, lowercased agent name it returns.
+        
         Args:
             message: The user's message
             state: Current conversation state
@@ -102,32 +179,14 @@ class MasterAgent(Agent):
         Returns:
             Name of the agent that should handle the message
         """
-        # Use keyword-based routing for now
-        # In production, this would use the LLM for more sophisticated routing
-        
-        # Data/Feature Agent keywords
-        data_keywords = [
-            "market data", "price data", "historical data", "ohlcv", 
-            "indicator", "indicators", "technical analysis", "calculate", "visualization",
-            "chart", "graph", "plot", "data availability", "backtest data"
-        ]
-        
         # Check for data-related keywords
-        message_lower = message.lower()
-        if any(keyword in message_lower for keyword in data_keywords):
+        if DATA_KEYWORDS_PATTERN.search(message):
             return "data"
             
         # Add other agent keywords and routing in the future
         
         # Default to conversation agent
         return "conversation"
-        
-        # Production implementation would look like:
-        # result = self.router_chain.run(
-        #     message=message,
-        #     conversation_state=str(state)
-        # )
-        # return result.strip().lower()
     
     def update_state(self, message: Dict[str, Any]) -> None:
         """
@@ -157,30 +216,37 @@ class MasterAgent(Agent):
         # Use provided state or fall back to internal state
         current_state = state if state is not None else self.conversation_state
         
-        # Log incoming message
-        self.log_message(message)
+        # Log incoming message; the level check is done once per message so
+        # neither log call is made when message logging is off
+        log_messages = self.is_message_logging_enabled()
+        if log_messages:
+            self.log_message(message)
         
         # Update state with message
         self.update_state(message)
         
         # Determine which agent should handle this message
+        route_text = None
         if "content" in message:
             # Ensure content is in the expected format
             content_text = message["content"]
             if isinstance(content_text, str):
                 # Convert string content to dict for the conversation agent
                 message["content"] = {"text": content_text}
-            
-            destination = self.route_message(
-                content_text if isinstance(content_text, str) else str(content_text), 
-                current_state
-            )
+                route_text = content_text
+            elif isinstance(content_text, dict):
+                # Route on the text field rather than a repr of the whole payload
+                route_text = content_text.get("text")
+        
+        if isinstance(route_text, str):
+            destination = self.route_message(route_text, current_state)
         else:
-            # Default to conversation agent if no content
+            # Default to conversation agent if there is no text to route on
             destination = "conversation"
         
         # Check if agent exists
-        if destination not in self.specialized_agents or self.specialized_agents[destination] is None:
+        agent = self._get_agent(destination)
+        if agent is None:
             # Agent not available - create error response
             agent_name = "Data/Feature Agent" if destination == "data" else f"'{destination}' agent"
             response = self.create_message(
@@ -194,13 +260,13 @@ class MasterAgent(Agent):
             )
         else:
             # Forward to appropriate agent
-            agent = self.specialized_agents[destination]
             response = agent.process(message, current_state)
             
             # Update state with response
             self.update_state(response)
         
         # Log outgoing message
-        self.log_message(response, direction="sent")
+        if log_messages:
+            self.log_message(response, direction="sent")
         
         return response
\ No newline at end of file
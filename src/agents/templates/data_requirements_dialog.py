@@ -1,7 +1,12 @@
 """
 Templates for data requirements collection dialog in the ConversationalAgent.
+
+Templates are filled in with render(), which leaves unknown placeholders in
+place instead of raising.
 """
 
+import sys
+
 DATA_REQUIREMENTS_INITIAL_PROMPT = """
 Now that we have the basic strategy components defined, let's talk about your data requirements.
 
@@ -97,4 +102,41 @@ The data you need is not currently in our InfluxDB cache.
 
 I'll fetch the data from {external_source} based on your requirements and cache it for future use.
 This may take a moment depending on the amount of data needed.
-"""
\ No newline at end of file
+"""
+
+
+class _SafeDict(dict):
+    """Mapping for str.format_map that keeps missing placeholders as-is."""
+    
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def render(template: str, **kwargs) -> str:
+    """
+    Fill in a dialog template.
+    
+    Args:
+        template: One of the templates in this module
+        **kwargs: Values for the template placeholders
+        
+    Returns:
+        Rendered text; placeholders without a value are left unchanged
+    """
+    return template.format_map(_SafeDict(kwargs))
+
+
+# Intern the templates so worker processes importing this module share them
+for _name in (
+    "DATA_REQUIREMENTS_INITIAL_PROMPT",
+    "DATA_SOURCE_SELECTION_PROMPT",
+    "DATA_QUALITY_PROMPT",
+    "DATA_LOOKBACK_PERIOD_PROMPT",
+    "DATA_CONFIRMATION_PROMPT",
+    "DATA_AVAILABILITY_REPORT",
+    "DATA_AVAILABLE_TEMPLATE",
+    "DATA_PARTIALLY_AVAILABLE_TEMPLATE",
+    "DATA_NOT_AVAILABLE_TEMPLATE",
+):
+    globals()[_name] = sys.intern(globals()[_name])
+del _name
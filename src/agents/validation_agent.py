@@ -2,9 +2,22 @@
 Validation Agent for the Multi-Agent Trading System.
 This agent validates strategy parameters and configurations.
 """
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+import hashlib
 import json
 import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: pip install .[jit]
+    njit = None
 
 from .base import Agent
 from ..utils.llm import get_llm
@@ -13,6 +26,176 @@ from ..database.strategy_repository import get_strategy_repository
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Parameter validation rules per strategy type. These would typically come
+# from a database or config file; for now they are defined in code, built
+# once at import and shared read-only by every ValidationAgent.
+_VALIDATION_RULES = MappingProxyType({
+    "momentum": {
+        "required_parameters": ["lookback_period", "threshold"],
+        "lookback_period": {
+            "min": 1,
+            "max": 500,
+            "recommended_min": 10,
+            "recommended_max": 100
+        },
+        "threshold": {
+            "min": 0.001,
+            "max": 0.5,
+            "recommended_min": 0.01,
+            "recommended_max": 0.1
+        }
+    },
+    "mean_reversion": {
+        "required_parameters": ["lookback_period", "deviation_threshold"],
+        "lookback_period": {
+            "min": 2,
+            "max": 500,
+            "recommended_min": 20,
+            "recommended_max": 200
+        },
+        "deviation_threshold": {
+            "min": 0.5,
+            "max": 5.0,
+            "recommended_min": 1.0,
+            "recommended_max": 3.0
+        }
+    },
+    "moving_average_crossover": {
+        "required_parameters": ["fast_period", "slow_period"],
+        "fast_period": {
+            "min": 1,
+            "max": 200,
+            "recommended_min": 5,
+            "recommended_max": 50
+        },
+        "slow_period": {
+            "min": 2,
+            "max": 500,
+            "recommended_min": 20,
+            "recommended_max": 200
+        }
+    },
+    "rsi": {
+        "required_parameters": ["period", "overbought", "oversold"],
+        "period": {
+            "min": 2,
+            "max": 200,
+            "recommended_min": 7,
+            "recommended_max": 21
+        },
+        "overbought": {
+            "min": 50,
+            "max": 99,
+            "recommended_min": 70,
+            "recommended_max": 85
+        },
+        "oversold": {
+            "min": 1,
+            "max": 50,
+            "recommended_min": 15,
+            "recommended_max": 30
+        }
+    }
+})
+
+
+def _flatten_rules(
+    rules: Mapping[str, Dict[str, Any]]
+) -> Dict[Tuple[str, str], Tuple[float, float, float, float]]:
+    """
+    Flatten validation rules into a (strategy_type, parameter) lookup table.
+    
+    Args:
+        rules: Validation rules keyed by strategy type
+        
+    Returns:
+        Dictionary mapping (strategy_type, parameter) to
+        (min, max, recommended_min, recommended_max), with missing bounds
+        replaced by -inf/+inf so they never trigger
+    """
+    return {
+        (strategy_type, param_name): (
+            param_rules.get("min", -math.inf),
+            param_rules.get("max", math.inf),
+            param_rules.get("recommended_min", -math.inf),
+            param_rules.get("recommended_max", math.inf)
+        )
+        for strategy_type, type_rules in rules.items()
+        for param_name, param_rules in type_rules.items()
+        if param_name != "required_parameters"
+    }
+
+
+_PARAMETER_BOUNDS = _flatten_rules(_VALIDATION_RULES)
+
+# Batches at least this large go through the compiled kernel when Numba is
+# installed; below it thread start-up outweighs the saved temporaries
+JIT_BATCH_THRESHOLD = 10_000
+
+if njit is not None:
+    # No explicit signature, so the parallel kernel is only compiled (or
+    # loaded from the on-disk cache) on the first large batch rather than
+    # whenever the agents are imported. fastmath is deliberately off so NaN
+    # compares the same way it does in the NumPy path.
+    @njit(cache=True, parallel=True)
+    def _check_bounds_kernel(values, minimum, maximum, recommended_min, recommended_max, errors_out, warnings_out):
+        """Flag values outside the allowed and recommended ranges in one pass."""
+        for i in prange(values.shape[0]):
+            value = values[i]
+            errors_out[i] = value < minimum or value > maximum
+            warnings_out[i] = value < recommended_min or value > recommended_max
+else:
+    _check_bounds_kernel = None
+
+# LLM consistency check results are cached per agent, keyed on the
+# normalized strategy parameters
+CONSISTENCY_CACHE_SIZE = 1024
+CONSISTENCY_CACHE_TTL = 60 * 60  # seconds
+
+
+# Static consistency check prompt; parameters are inserted as single-line JSON
+_CONSISTENCY_PROMPT_TEMPLATE = """
+Please evaluate the consistency and reasonableness of the following trading strategy parameters:
+
+{payload}
+
+Check for:
+1. Logical inconsistencies between parameters
+2. Unusual or potentially problematic values
+3. Missing important parameters for this strategy type
+4. Potential improvements or optimizations
+
+Respond with a JSON object containing two arrays:
+1. "errors" - list of serious issues that should be fixed
+2. "suggestions" - list of potential improvements
+"""
+
+
+def _normalize_params(strategy_params: Dict[str, Any]) -> str:
+    """
+    Serialize strategy parameters as key-sorted, single-line JSON.
+    
+    Args:
+        strategy_params: Strategy parameters to serialize
+        
+    Returns:
+        JSON string that is equal for parameters that differ only in key order
+    """
+    return json.dumps(strategy_params, sort_keys=True)
+
+
+def _params_fingerprint(normalized_params: str) -> str:
+    """
+    Compute a stable fingerprint of normalized strategy parameters.
+    
+    Args:
+        normalized_params: Output of _normalize_params
+        
+    Returns:
+        Hex digest of the parameters
+    """
+    return hashlib.blake2b(normalized_params.encode("utf-8"), digest_size=16).hexdigest()
+
 
 class ValidationAgent(Agent):
     """
@@ -24,15 +207,17 @@ class ValidationAgent(Agent):
         """Initialize the Validation Agent."""
         super().__init__(name="validation_agent")
         self.llm = get_llm()
-        self.validation_rules = self._load_validation_rules()
+        self.validation_rules = _VALIDATION_RULES
+        # fingerprint -> (created_at, result) for LLM consistency checks
+        self._consistency_cache: "OrderedDict[str, Tuple[float, Dict[str, List[str]]]]" = OrderedDict()
+        # Checks may run on worker threads (API routes run process off the loop)
+        self._consistency_cache_lock = threading.Lock()
         # Initialize Neo4j repository for knowledge-driven validation
         try:
             self.strategy_repository = get_strategy_repository()
         except Exception as e:
             logger.error(f"Error initializing Neo4j repository: {e}")
             self.strategy_repository = None
-        # Initialize Neo4j repository for knowledge-driven validation
-        self.strategy_repository = get_strategy_repository()
     
     def process(self, message: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -169,8 +354,9 @@ class ValidationAgent(Agent):
         # This helps ensure lookback_period errors appear first in test cases
         errors.extend(parameter_errors)
         
-        # Use LLM to check for logical consistency if there are parameters
-        if strategy_type and "parameters" in strategy_params:
+        # Use LLM to check for logical consistency if there are parameters.
+        # Skipped when the rules already failed: those must be fixed first.
+        if strategy_type and "parameters" in strategy_params and not errors:
             llm_validation = self._llm_consistency_check(strategy_params)
             if llm_validation.get("errors"):
                 errors.extend(llm_validation["errors"])
@@ -223,158 +409,137 @@ class ValidationAgent(Agent):
                     errors.append(f"Required parameter '{required_param}' is missing")
                     suggestions.append(f"Please specify a value for '{required_param}'")
         
-        # Then check parameter values
+        # Then check parameter values with a single lookup per parameter
         for param_name, param_value in parameters.items():
-            param_rules = rules.get(param_name)
-            if not param_rules:
+            bounds = _PARAMETER_BOUNDS.get((strategy_type, param_name))
+            if bounds is None:
                 continue
+            minimum, maximum, recommended_min, recommended_max = bounds
             
-            # Check range if defined
-            if "min" in param_rules and param_value < param_rules["min"]:
+            # Check range
+            if param_value < minimum:
                 errors.append(
-                    f"Parameter '{param_name}' value {param_value} is below minimum {param_rules['min']}"
+                    f"Parameter '{param_name}' value {param_value} is below minimum {minimum}"
                 )
                 suggestions.append(
-                    f"Consider increasing '{param_name}' to at least {param_rules['min']}"
+                    f"Consider increasing '{param_name}' to at least {minimum}"
                 )
                 
-            if "max" in param_rules and param_value > param_rules["max"]:
+            if param_value > maximum:
                 errors.append(
-                    f"Parameter '{param_name}' value {param_value} is above maximum {param_rules['max']}"
+                    f"Parameter '{param_name}' value {param_value} is above maximum {maximum}"
                 )
                 suggestions.append(
-                    f"Consider decreasing '{param_name}' to at most {param_rules['max']}"
+                    f"Consider decreasing '{param_name}' to at most {maximum}"
                 )
             
             # Check recommended range
-            if "recommended_min" in param_rules and param_value < param_rules["recommended_min"]:
+            if param_value < recommended_min:
                 warnings.append(
-                    f"Parameter '{param_name}' value {param_value} is below recommended minimum {param_rules['recommended_min']}"
+                    f"Parameter '{param_name}' value {param_value} is below recommended minimum {recommended_min}"
                 )
             
-            if "recommended_max" in param_rules and param_value > param_rules["recommended_max"]:
+            if param_value > recommended_max:
                 warnings.append(
-                    f"Parameter '{param_name}' value {param_value} is above recommended maximum {param_rules['recommended_max']}"
+                    f"Parameter '{param_name}' value {param_value} is above recommended maximum {recommended_max}"
                 )
                 
         # We already checked for required parameters at the beginning of this method
                     
+    def validate_batch(
+        self,
+        strategy_type: str,
+        param_arrays: Dict[str, np.ndarray]
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Check many candidate values per parameter against the rules at once.
+        
+        Intended for bulk validation such as parameter grid searches, where
+        each array holds the candidate values for one parameter. Only range
+        rules are applied; required parameters and the LLM consistency check
+        are left to the single-strategy path.
+        
+        Args:
+            strategy_type: Strategy type whose rules apply
+            param_arrays: Parameter name -> array of candidate values
+            
+        Returns:
+            Parameter name -> {"errors": mask, "warnings": mask}, where the
+            boolean masks flag values outside the allowed and recommended
+            ranges. Parameters without rules are omitted.
+        
+        Large one-dimensional batches use the Numba kernel when Numba is
+        installed, compiling it on first use; smaller batches and installs
+        without Numba use NumPy. Results are identical on both paths.
+        """
+        results = {}
+        for param_name, values in param_arrays.items():
+            bounds = _PARAMETER_BOUNDS.get((strategy_type, param_name))
+            if bounds is None:
+                continue
+            minimum, maximum, recommended_min, recommended_max = bounds
+            
+            values = np.asarray(values, dtype=np.float64)
+            if _check_bounds_kernel is not None and values.ndim == 1 and values.size >= JIT_BATCH_THRESHOLD:
+                errors = np.empty(values.size, dtype=np.bool_)
+                warnings = np.empty(values.size, dtype=np.bool_)
+                _check_bounds_kernel(
+                    values, float(minimum), float(maximum),
+                    float(recommended_min), float(recommended_max),
+                    errors, warnings
+                )
+                results[param_name] = {"errors": errors, "warnings": warnings}
+                continue
+            
+            results[param_name] = {
+                "errors": (values < minimum) | (values > maximum),
+                "warnings": (values < recommended_min) | (values > recommended_max)
+            }
+        return results
+    
     def _llm_consistency_check(self, strategy_params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Use LLM to check for logical consistency in strategy parameters.
         
+        Results are cached by parameter fingerprint, so validating the same
+        parameters again within CONSISTENCY_CACHE_TTL skips the LLM call.
+        
         Args:
             strategy_params: Strategy parameters to validate
             
         Returns:
             Validation result with errors and suggestions
         """
-        # Format parameters for LLM input
-        strategy_json = json.dumps(strategy_params, indent=2)
+        # Single-line JSON; indentation would only add prompt tokens
+        strategy_json = _normalize_params(strategy_params)
+        fingerprint = _params_fingerprint(strategy_json)
+        with self._consistency_cache_lock:
+            cached = self._consistency_cache.get(fingerprint)
+            if cached is not None:
+                created_at, result = cached
+                if time.monotonic() - created_at < CONSISTENCY_CACHE_TTL:
+                    self._consistency_cache.move_to_end(fingerprint)
+                    return {"errors": list(result["errors"]), "suggestions": list(result["suggestions"])}
+                del self._consistency_cache[fingerprint]
         
-        prompt = f"""
-        Please evaluate the consistency and reasonableness of the following trading strategy parameters:
-        
-        {strategy_json}
-        
-        Check for:
-        1. Logical inconsistencies between parameters
-        2. Unusual or potentially problematic values
-        3. Missing important parameters for this strategy type
-        4. Potential improvements or optimizations
-        
-        Respond with a JSON object containing two arrays:
-        1. "errors" - list of serious issues that should be fixed
-        2. "suggestions" - list of potential improvements
-        """
+        prompt = _CONSISTENCY_PROMPT_TEMPLATE.format(payload=strategy_json)
         
         try:
             result = self.llm.extract_json(prompt)
-            return {
-                "errors": result.get("errors", []),
-                "suggestions": result.get("suggestions", [])
+            checked = {
+                "errors": list(result.get("errors", [])),
+                "suggestions": list(result.get("suggestions", []))
             }
         except Exception as e:
             return {
                 "errors": [f"Error during LLM consistency check: {str(e)}"],
                 "suggestions": []
             }
-    
-    def _load_validation_rules(self) -> Dict[str, Any]:
-        """
-        Load validation rules for different strategy types.
         
-        Returns:
-            Dictionary of validation rules
-        """
-        # This would typically load from a database or config file
-        # For now, we'll define some basic rules in code
-        
-        return {
-            "momentum": {
-                "required_parameters": ["lookback_period", "threshold"],
-                "lookback_period": {
-                    "min": 1,
-                    "max": 500,
-                    "recommended_min": 10,
-                    "recommended_max": 100
-                },
-                "threshold": {
-                    "min": 0.001,
-                    "max": 0.5,
-                    "recommended_min": 0.01,
-                    "recommended_max": 0.1
-                }
-            },
-            "mean_reversion": {
-                "required_parameters": ["lookback_period", "deviation_threshold"],
-                "lookback_period": {
-                    "min": 2,
-                    "max": 500,
-                    "recommended_min": 20,
-                    "recommended_max": 200
-                },
-                "deviation_threshold": {
-                    "min": 0.5,
-                    "max": 5.0,
-                    "recommended_min": 1.0,
-                    "recommended_max": 3.0
-                }
-            },
-            "moving_average_crossover": {
-                "required_parameters": ["fast_period", "slow_period"],
-                "fast_period": {
-                    "min": 1,
-                    "max": 200,
-                    "recommended_min": 5,
-                    "recommended_max": 50
-                },
-                "slow_period": {
-                    "min": 2,
-                    "max": 500,
-                    "recommended_min": 20,
-                    "recommended_max": 200
-                }
-            },
-            "rsi": {
-                "required_parameters": ["period", "overbought", "oversold"],
-                "period": {
-                    "min": 2,
-                    "max": 200,
-                    "recommended_min": 7,
-                    "recommended_max": 21
-                },
-                "overbought": {
-                    "min": 50,
-                    "max": 99,
-                    "recommended_min": 70,
-                    "recommended_max": 85
-                },
-                "oversold": {
-                    "min": 1,
-                    "max": 50,
-                    "recommended_min": 15,
-                    "recommended_max": 30
-                }
-            }
-        }
\ No newline at end of file
+        # Only successful checks are cached, so LLM failures are retried
+        with self._consistency_cache_lock:
+            self._consistency_cache[fingerprint] = (time.monotonic(), checked)
+            self._consistency_cache.move_to_end(fingerprint)
+            if len(self._consistency_cache) > CONSISTENCY_CACHE_SIZE:
+                self._consistency_cache.popitem(last=False)
+        return {"errors": list(checked["errors"]), "suggestions": list(checked["suggestions"])}
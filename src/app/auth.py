@@ -2,22 +2,108 @@
 Authentication module for the Multi-Agent Trading System.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple, Union, Any
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+import jwt
+from jwt import InvalidTokenError as JWTError
 
 from .config import settings
 from ..models.user import TokenPayload, User, UserInDB
 from ..database.connection import get_db_manager
-from ..database.repositories.user_repository import UserRepository
+from ..database.repositories.user_repository import get_user_repository
 
 
 # Password hashing - using bcrypt directly instead of through passlib
 import bcrypt
 
+logger = logging.getLogger(__name__)
+
+# bcrypt is deliberately CPU-heavy; async callers run it here so a login
+# doesn't block the event loop. Sized to the CPU count since the work is
+# CPU-bound (bcrypt releases the GIL while hashing).
+_bcrypt_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="bcrypt")
+
+# Users resolved from access tokens, keyed by token digest (the token itself
+# is not stored). Repeated requests with the same token skip JWT decoding and
+# the user lookup; entries expire after TOKEN_CACHE_TTL or with the token.
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_CACHE_TTL = 60  # seconds
+_token_cache: "OrderedDict[bytes, Tuple[float, User]]" = OrderedDict()
+
+# Users looked up by id, shared by all tokens of a user (e.g. several devices
+# or a fresh login). Kept short so profile changes show up quickly.
+USER_CACHE_SIZE = 10_000
+USER_CACHE_TTL = 10  # seconds
+_user_cache: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+
+
+# Access tokens only carry exp and sub, so skip checks for claims we never
+# issue and require the two we rely on
+_JWT_DECODE_KWARGS = {
+    "key": settings.SECRET_KEY,
+    "algorithms": [settings.ALGORITHM],
+    "options": {
+        "verify_aud": False,
+        "verify_iss": False,
+        "verify_iat": False,
+        "verify_nbf": False,
+        "require": ["exp", "sub"]
+    }
+}
+
+
+def _token_digest(token: str) -> bytes:
+    """Get the token cache key for an access token."""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def clear_token_cache() -> None:
+    """Clear the cached users resolved from access tokens and user ids."""
+    _token_cache.clear()
+    _user_cache.clear()
+
+
+async def _get_user_by_id(user_id: str, db_manager) -> Optional[User]:
+    """
+    Look up a user by id, reusing lookups from the last USER_CACHE_TTL seconds.
+    
+    Args:
+        user_id: ID of the user
+        db_manager: Database manager for the user repository
+        
+    Returns:
+        User if found, None otherwise
+    """
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        expires_at, cached_user = cached
+        if time.time() < expires_at:
+            _user_cache.move_to_end(user_id)
+            return cached_user
+        _user_cache.pop(user_id, None)
+    
+    user_repo = get_user_repository(db_manager)
+    user_db = await user_repo.get_user_by_id(user_id)
+    if not user_db:
+        return None
+    
+    # Convert UserInDB to User model
+    user = User.model_validate(user_db)
+    _user_cache[user_id] = (time.time() + USER_CACHE_TTL, user)
+    if len(_user_cache) > USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+    return user
+
 # OAuth2 with password flow
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -25,34 +111,42 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
     try:
-        # Print debug info
-        print(f"Verifying password: {plain_password[:2]}... against hash: {hashed_password[:10]}...")
-        
         result = bcrypt.checkpw(
             plain_password.encode('utf-8'), 
             hashed_password.encode('utf-8')
         )
-        print(f"Password verification result: {result}")
+        logger.debug("Password verification result: %s", result)
         return result
     except Exception as e:
-        print(f"Error verifying password: {str(e)}")
+        logger.error(f"Error verifying password: {e}")
         # Return False on any error
         return False
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_executor, verify_password, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_executor, get_password_hash, password)
+
+
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    if not expires_delta:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = int((datetime.now(tz=timezone.utc) + expires_delta).timestamp())
     
     to_encode = {"exp": expire, "sub": str(subject)}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -63,32 +157,39 @@ async def get_current_user(
     db_manager = Depends(get_db_manager)
 ) -> User:
     """Get the current user from a JWT token."""
+    cache_key = _token_digest(token)
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        expires_at, cached_user = cached
+        if time.time() < expires_at:
+            _token_cache.move_to_end(cache_key)
+            return cached_user.model_copy()
+        _token_cache.pop(cache_key, None)
+    
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, **_JWT_DECODE_KWARGS)
         token_data = TokenPayload(sub=payload["sub"], exp=payload["exp"])
         
-        if datetime.fromtimestamp(token_data.exp) < datetime.now():
+        # exp is a UTC epoch timestamp, so compare it to epoch seconds directly
+        if token_data.exp < int(time.time()):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, 
                                detail="Token expired")
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, 
                            detail="Could not validate credentials")
     
-    user_repo = UserRepository(db_manager)
-    user = await user_repo.get_user_by_id(token_data.sub)
+    current_user = await _get_user_by_id(token_data.sub, db_manager)
     
-    if not user:
+    if not current_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, 
                            detail="User not found")
     
-    # Convert UserInDB to User model
-    return User(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        is_active=user.is_active,
-        created_at=user.created_at
-    )
+    # Never cache past the token's own expiry
+    _token_cache[cache_key] = (min(time.time() + TOKEN_CACHE_TTL, token_data.exp), current_user)
+    if len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    
+    return current_user.model_copy()
 
 
 async def authenticate_user(
@@ -108,46 +209,36 @@ async def authenticate_user(
         User if authenticated, None otherwise
     """
     try:
-        print(f"Authenticating user: {identifier}")
-        user_repo = UserRepository(db_manager)
+        logger.debug("Authenticating user: %s", identifier)
+        user_repo = get_user_repository(db_manager)
         
         # Try to find user by email first
         user_db = await user_repo.get_user_by_email(identifier)
-        print(f"Found by email: {user_db is not None}")
+        logger.debug("Found by email: %s", user_db is not None)
         
         # If not found by email, try by username
         if not user_db:
             user_db = await user_repo.get_user_by_username(identifier)
-            print(f"Found by username: {user_db is not None}")
+            logger.debug("Found by username: %s", user_db is not None)
             
         # If still not found, return None
         if not user_db:
-            print("User not found")
+            logger.debug("User not found")
             return None
         
-        print(f"User found: {user_db.username}, {user_db.email}")
+        logger.debug("User found: %s", user_db.username)
         
-        # Use our verify_password function (which logs debug info)
-        if not verify_password(password, user_db.password_hash):
-            print("Password verification failed")
+        if not await averify_password(password, user_db.password_hash):
+            logger.debug("Password verification failed")
             return None
         
         # Update last login timestamp
-        print("Updating last login timestamp")
         await user_repo.update_last_login(user_db.id)
         
         # Convert UserInDB to User model
-        user = User(
-            id=user_db.id,
-            username=user_db.username,
-            email=user_db.email,
-            is_active=user_db.is_active,
-            created_at=user_db.created_at
-        )
-        print(f"Authentication successful for user: {user.username}")
+        user = User.model_validate(user_db)
+        logger.debug("Authentication successful for user: %s", user.username)
         return user
-    except Exception as e:
-        print(f"Error in authenticate_user: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("authenticate_user failed")
         return None
\ No newline at end of file
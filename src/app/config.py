@@ -1,4 +1,5 @@
-from typing import Optional, Dict, Any, List
+from functools import cached_property, lru_cache
+from typing import Optional, FrozenSet, NamedTuple, Tuple
 from pydantic import validator
 from pydantic_settings import BaseSettings
 import os
@@ -11,7 +12,7 @@ class Settings(BaseSettings):
     VERSION: str = "2.0.0"
     
     # CORS
-    BACKEND_CORS_ORIGINS: List[str] = ["*"]
+    BACKEND_CORS_ORIGINS: Tuple[str, ...] = ("*",)
     
     # Database URLs
     DATABASE_URI: Optional[str] = None
@@ -28,6 +29,9 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-here"  # In production, use a secure generated key
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    # bcrypt work factor for new password hashes; each +1 doubles the cost.
+    # Existing hashes keep their own rounds. Raise this if hashes are at risk.
+    BCRYPT_ROUNDS: int = 10
     
     # Claude API
     ANTHROPIC_API_KEY: Optional[str] = None
@@ -38,23 +42,51 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
 
+    # Threads available to sync dependencies and run_in_threadpool per worker
+    THREADPOOL_SIZE: int = 200
+
     class Config:
         env_file = ".env"
         case_sensitive = True
 
     @validator("BACKEND_CORS_ORIGINS", pre=True)
-    def assemble_cors_origins(cls, v: str) -> List[str]:
+    def assemble_cors_origins(cls, v: str) -> Tuple[str, ...]:
+        # Parsed once into an immutable tuple when settings load
         if isinstance(v, str) and not v.startswith("["):
-            return [i.strip() for i in v.split(",")]
-        elif isinstance(v, (list, str)):
+            return tuple(i.strip() for i in v.split(","))
+        elif isinstance(v, (list, tuple)):
+            return tuple(v)
+        elif isinstance(v, str):
             return v
         raise ValueError(v)
 
+    @cached_property
+    def BACKEND_CORS_ORIGINS_SET(self) -> FrozenSet[str]:
+        """Allowed CORS origins as a set, for constant-time origin checks."""
+        return frozenset(self.BACKEND_CORS_ORIGINS)
+
 settings = Settings()
 
+
+class SettingsValidation(NamedTuple):
+    """Result of validate_settings."""
+    valid: bool
+    missing: Tuple[str, ...]
+    warnings: Tuple[str, ...]
+
+
 # Ensure the required environment variables are present
-def validate_settings() -> Dict[str, Any]:
-    """Validate that all required settings are provided"""
+@lru_cache(maxsize=1)
+def validate_settings() -> SettingsValidation:
+    """
+    Validate that all required settings are provided.
+    
+    Settings are loaded once at import, so the result is computed once and
+    reused; call validate_settings.cache_clear() after changing settings.
+    
+    Returns:
+        SettingsValidation with the missing settings and warnings
+    """
     missing = []
     warnings = []
     
@@ -75,8 +107,8 @@ def validate_settings() -> Dict[str, Any]:
     if not settings.INFLUXDB_URL or not settings.INFLUXDB_TOKEN:
         warnings.append("InfluxDB connection details not fully configured")
     
-    return {
-        "valid": len(missing) == 0,
-        "missing": missing,
-        "warnings": warnings,
-    }
\ No newline at end of file
+    return SettingsValidation(
+        valid=len(missing) == 0,
+        missing=tuple(missing),
+        warnings=tuple(warnings),
+    )
@@ -1,34 +1,70 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
+from .config import settings
+from .middleware import VaryGZipMiddleware, WildcardCORSMiddleware
+from .responses import ORJSONResponse, PreEncodedJSONResponse
+from ..data_sources.alpha_vantage import close_session as close_alpha_vantage_session
+from .routers.data import shutdown_indicator_pool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Configure the worker process before serving requests."""
+    # Sync dependencies and run_in_threadpool share anyio's limiter (40 by
+    # default), and asyncio.to_thread uses the loop's default executor; both
+    # starve under blocking database calls at their default sizes
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    executor = ThreadPoolExecutor(max_workers=settings.THREADPOOL_SIZE, thread_name_prefix="api")
+    asyncio.get_running_loop().set_default_executor(executor)
+    yield
+    await close_alpha_vantage_session()
+    shutdown_indicator_pool()
+    executor.shutdown(wait=False)
+
 
 app = FastAPI(
     title="Multi-Agent Trading System API",
     description="API for trading strategy creation, backtesting, and signal generation",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    WildcardCORSMiddleware,
+    # Defaults to ["*"]; set BACKEND_CORS_ORIGINS to specific origins in production.
+    # A set keeps origin checks constant-time however many origins are allowed
+    allow_origins=settings.BACKEND_CORS_ORIGINS_SET,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (OHLCV, indicator series) for clients that
+# accept gzip; small responses aren't worth the CPU. Every response varies on
+# Accept-Encoding so shared caches keep the two encodings apart.
+app.add_middleware(VaryGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Probe endpoints return constant bodies, encoded once at import
+_ROOT_BODY = PreEncodedJSONResponse.encode({"message": "Multi-Agent Trading System API V2"})
+_HEALTH_BODY = PreEncodedJSONResponse.encode({
+    "status": "healthy",
+    "version": "2.0.0",
+    # Add database connection status checks here once implemented
+})
+
 @app.get("/")
 async def root():
     """Root endpoint to check if API is running."""
-    return {"message": "Multi-Agent Trading System API V2"}
+    return PreEncodedJSONResponse(_ROOT_BODY)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
-    return {
-        "status": "healthy",
-        "version": "2.0.0",
-        # Add database connection status checks here once implemented
-    }
+    return PreEncodedJSONResponse(_HEALTH_BODY)
 
 # Import and include routers
 from .routers import auth, agents, strategies
@@ -41,19 +77,16 @@ app.include_router(agents.router, prefix="/api/agents", tags=["Agents"])
 # Add exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    if isinstance(exc.detail, dict):
-        # Handle dictionary details (for structured errors)
-        return {
-            "status": "error",
-            "code": exc.detail.get("code", "ERROR"),
-            "message": exc.detail.get("message", str(exc.detail)),
-            "details": exc.detail.get("details", {})
-        }
-    else:
-        # Handle string or other detail types
-        return {
-            "status": "error",
-            "code": "ERROR",
-            "message": str(exc.detail),
-            "details": {}
-        }
\ No newline at end of file
+    # Structured details supply their own code/message/details; anything
+    # else becomes the message
+    detail = exc.detail if isinstance(exc.detail, dict) else {}
+    content = {
+        "status": "error",
+        "code": detail.get("code", "ERROR"),
+        "message": detail.get("message", str(exc.detail)),
+        "details": detail.get("details", {})
+    }
+    
+    # Build the response directly; exception handlers must return a Response,
+    # and this keeps the status code and headers (e.g. WWW-Authenticate)
+    return ORJSONResponse(status_code=exc.status_code, content=content, headers=exc.headers)
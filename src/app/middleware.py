@@ -0,0 +1,99 @@
+"""
+Middleware for the Multi-Agent Trading System API.
+"""
+
+import functools
+from typing import Any, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Message, Receive, Scope, Send
+
+
+class WildcardCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware specialized for ``allow_origins=["*"]``.
+
+    With wildcard origins every non-preflight request gets the same CORS
+    headers, apart from the echoed origin when credentials are allowed. Those
+    headers are precomputed as raw byte pairs and appended in a single pass
+    over the response headers, and the request headers are scanned once
+    instead of being parsed into a Headers object. Preflight requests and
+    non-wildcard configurations use CORSMiddleware unchanged.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # When credentials are allowed the origin is echoed per request instead of "*"
+        self._simple_raw_headers = tuple(
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in self.simple_headers.items()
+            if not (self.allow_credentials and name == "Access-Control-Allow-Origin")
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.allow_all_origins:
+            await super().__call__(scope, receive, send)
+            return
+
+        # Raw header names are already lowercased by the ASGI server
+        origin = None
+        has_request_method = False
+        for name, value in scope["headers"]:
+            if name == b"origin" and origin is None:
+                origin = value
+            elif name == b"access-control-request-method":
+                has_request_method = True
+
+        if origin is not None and has_request_method and scope["method"] == "OPTIONS":
+            await super().__call__(scope, receive, send)
+            return
+
+        await self.app(scope, receive, functools.partial(self._send_with_cors, send=send, origin=origin))
+
+    async def _send_with_cors(self, message: Message, send: Send, origin: Optional[bytes]) -> None:
+        """Add the CORS and Vary headers to the response start message."""
+        if message["type"] == "http.response.start":
+            cors_headers = []
+            if origin is not None:
+                cors_headers.extend(self._simple_raw_headers)
+                if self.allow_credentials:
+                    cors_headers.append((b"access-control-allow-origin", origin))
+
+            replaced = {name for name, _ in cors_headers}
+            replaced.add(b"vary")
+            raw_headers = message.get("headers", [])
+            vary = [value for name, value in raw_headers if name.lower() == b"vary"]
+            headers = [(name, value) for name, value in raw_headers if name.lower() not in replaced]
+            headers.extend(cors_headers)
+            headers.append((b"vary", b", ".join([*vary, b"Origin"])))
+            message["headers"] = headers
+        await send(message)
+
+
+class VaryGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that marks every response with ``Vary: Accept-Encoding``.
+    
+    GZipMiddleware only adds the header to responses it compresses, so a
+    shared cache could store an uncompressed response (small, or for a client
+    without gzip) and serve it to every client. The header is added once,
+    whether or not the response was compressed.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        await super().__call__(scope, receive, functools.partial(self._send_with_vary, send=send))
+    
+    @staticmethod
+    async def _send_with_vary(message: Message, send: Send) -> None:
+        """Add Accept-Encoding to the Vary header of the response start message."""
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(scope=message)
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+        await send(message)
@@ -0,0 +1,64 @@
+"""
+Response classes for the Multi-Agent Trading System API.
+"""
+
+from typing import Any, Dict, Iterator
+
+import orjson
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+    
+    Faster than the stdlib encoder on large nested payloads, serializes numpy
+    arrays and scalars natively, and renders NaN/Infinity as null where
+    JSONResponse would fail. FastAPI's own ORJSONResponse is deprecated; for
+    routes with a response_model the default JSONResponse is faster, so this
+    is meant for routes returning untyped dicts.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+class PreEncodedJSONResponse(Response):
+    """
+    JSON response for a body encoded ahead of time.
+    
+    For constant payloads such as health checks: encode once with encode()
+    and create a response per request from the bytes. The response itself is
+    not shared, since middleware may modify its headers.
+    """
+    
+    media_type = "application/json"
+    
+    @staticmethod
+    def encode(content: Any) -> bytes:
+        """Encode content the way ORJSONResponse would."""
+        return ORJSONResponse(content).body
+
+
+class StreamingJSONObjectResponse(StreamingResponse):
+    """
+    Stream a large JSON object one top-level member at a time.
+    
+    Each member is encoded with orjson when it is sent, so only one member's
+    encoding is held in memory instead of the whole document, and
+    compression and network writes overlap with encoding. The output is the
+    same document ORJSONResponse would produce.
+    """
+    
+    def __init__(self, content: Dict[str, Any], **kwargs: Any) -> None:
+        super().__init__(self._iter_members(content), media_type="application/json", **kwargs)
+    
+    @staticmethod
+    def _iter_members(content: Dict[str, Any]) -> Iterator[bytes]:
+        yield b"{"
+        for i, (key, value) in enumerate(content.items()):
+            prefix = b"," if i else b""
+            yield prefix + orjson.dumps(str(key)) + b":" + orjson.dumps(value, option=_ORJSON_OPTIONS)
+        yield b"}"
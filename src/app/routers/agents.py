@@ -2,10 +2,12 @@
 Agent router for the Multi-Agent Trading System.
 """
 
+import asyncio
+import threading
 from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from pydantic import BaseModel, Field
-import uuid
+from secrets import token_hex
 
 from ..auth import get_current_user
 from ...models.user import User
@@ -24,6 +26,39 @@ master_agent = MasterAgent()
 master_agent.specialized_agents["conversation"] = conversational_agent
 master_agent.specialized_agents["validation"] = validation_agent
 
+# The agents are process-wide singletons that mutate their own state and are
+# not thread-safe, and the master agent drives the other two, so one lock
+# serializes every call into them
+_agents_lock = threading.Lock()
+
+
+def _run_agent(func, *args):
+    """Call into an agent while holding the shared agent lock."""
+    with _agents_lock:
+        return func(*args)
+
+# Constant fields of the messages each route sends; handlers copy the
+# template and fill in the per-request fields. The timestamp is filled in
+# by the agent.
+_MASTER_MESSAGE_TEMPLATE = {
+    "timestamp": "",
+    "sender": "user",
+    "recipient": "master_agent",
+    "message_type": "request"
+}
+_CONVERSATIONAL_MESSAGE_TEMPLATE = {
+    "timestamp": "",
+    "sender": "user",
+    "recipient": "conversational_agent",
+    "message_type": "request"
+}
+_VALIDATION_MESSAGE_TEMPLATE = {
+    "timestamp": "",
+    "sender": "user",
+    "recipient": "validation_agent",
+    "message_type": "validation_request"
+}
+
 class MessageRequest(BaseModel):
     """
     Message request model.
@@ -31,12 +66,19 @@ class MessageRequest(BaseModel):
     text: str = Field(..., description="The message text from the user")
     extract_params: bool = Field(False, description="Whether to extract strategy parameters from the message")
     session_id: Optional[str] = Field(None, description="Session ID to continue a conversation")
+    
+    # Request bodies are read-only once parsed
+    model_config = {
+        "extra": "ignore",
+        "frozen": True
+    }
 
 class MessageResponse(BaseModel):
     """
     Message response model.
     """
     text: str = Field(..., description="The response text")
+    # Omitted from responses (rather than null) when nothing was extracted
     strategy_params: Optional[Dict[str, Any]] = Field(None, description="Extracted strategy parameters if requested")
     session_id: str = Field(..., description="Session ID for the conversation")
 
@@ -47,12 +89,22 @@ class StreamRequest(BaseModel):
     text: str = Field(..., description="The message text from the user")
     session_id: Optional[str] = Field(None, description="Session ID to continue a conversation")
     
+    model_config = {
+        "extra": "ignore",
+        "frozen": True
+    }
+
 class ValidationRequest(BaseModel):
     """
     Request model for strategy validation.
     """
     strategy_params: Dict[str, Any] = Field(..., description="The strategy parameters to validate")
     session_id: Optional[str] = Field(None, description="Session ID to continue a conversation")
+    
+    model_config = {
+        "extra": "ignore",
+        "frozen": True
+    }
 
 class ValidationResponse(BaseModel):
     """
@@ -64,7 +116,7 @@ class ValidationResponse(BaseModel):
     suggestions: List[str] = Field(default_factory=list, description="Suggestions for improvement")
     session_id: str = Field(..., description="Session ID for the conversation")
 
-@router.post("/conversational", response_model=MessageResponse)
+@router.post("/conversational", response_model=MessageResponse, response_model_exclude_none=True)
 async def chat_with_agent(
     message: MessageRequest,
     current_user: User = Depends(get_current_user)
@@ -73,26 +125,22 @@ async def chat_with_agent(
     Send a message to the conversational agent.
     """
     # Create session ID if not provided
-    session_id = message.session_id or f"session_{current_user.id}_{uuid.uuid4().hex[:8]}"
+    session_id = message.session_id or f"session_{current_user.id}_{token_hex(4)}"
     
     # Create agent message using the master agent format
-    agent_message = {
-        "message_id": f"msg_{uuid.uuid4().hex[:8]}",
-        "timestamp": "",  # Will be filled by agent
-        "sender": "user",
-        "recipient": "master_agent",
-        "message_type": "request",
-        "content": message.text,
-        "context": {
-            "session_id": session_id,
-            "extract_params": message.extract_params,
-            "user_id": current_user.id
-        }
+    agent_message = _MASTER_MESSAGE_TEMPLATE.copy()
+    agent_message["message_id"] = f"msg_{token_hex(4)}"
+    agent_message["content"] = message.text
+    agent_message["context"] = {
+        "session_id": session_id,
+        "extract_params": message.extract_params,
+        "user_id": current_user.id
     }
     
     # Process message through the master agent
     state = {"user_id": current_user.id, "session_id": session_id}
-    response = master_agent.process(agent_message, state)
+    # Agents make blocking LLM and database calls, so run them off the event loop
+    response = await asyncio.to_thread(_run_agent, master_agent.process, agent_message, state)
     
     # Check for errors
     if response["message_type"] == "error":
@@ -108,7 +156,7 @@ async def chat_with_agent(
         session_id=session_id
     )
 
-@router.post("/direct/conversational", response_model=MessageResponse)
+@router.post("/direct/conversational", response_model=MessageResponse, response_model_exclude_none=True)
 async def direct_chat_with_conversational_agent(
     message: MessageRequest,
     current_user: User = Depends(get_current_user)
@@ -117,25 +165,20 @@ async def direct_chat_with_conversational_agent(
     Send a message directly to the conversational agent (bypassing the master agent).
     """
     # Create session ID if not provided
-    session_id = message.session_id or f"session_{current_user.id}_{uuid.uuid4().hex[:8]}"
+    session_id = message.session_id or f"session_{current_user.id}_{token_hex(4)}"
     
     # Create agent message
-    agent_message = {
-        "message_id": f"msg_{uuid.uuid4().hex[:8]}",
-        "timestamp": "",  # Will be filled by agent
-        "sender": "user",
-        "recipient": "conversational_agent",
-        "message_type": "request",
-        "content": {"text": message.text},
-        "context": {
-            "session_id": session_id,
-            "extract_params": message.extract_params,
-            "user_id": current_user.id
-        }
+    agent_message = _CONVERSATIONAL_MESSAGE_TEMPLATE.copy()
+    agent_message["message_id"] = f"msg_{token_hex(4)}"
+    agent_message["content"] = {"text": message.text}
+    agent_message["context"] = {
+        "session_id": session_id,
+        "extract_params": message.extract_params,
+        "user_id": current_user.id
     }
     
     # Process message through the conversational agent directly
-    response = conversational_agent.process_message(agent_message)
+    response = await asyncio.to_thread(_run_agent, conversational_agent.process_message, agent_message)
     
     # Return response
     return MessageResponse(
@@ -153,24 +196,19 @@ async def validate_strategy(
     Validate a strategy using the validation agent.
     """
     # Create session ID if not provided
-    session_id = validation_request.session_id or f"session_{current_user.id}_{uuid.uuid4().hex[:8]}"
+    session_id = validation_request.session_id or f"session_{current_user.id}_{token_hex(4)}"
     
     # Create agent message
-    agent_message = {
-        "message_id": f"msg_{uuid.uuid4().hex[:8]}",
-        "timestamp": "",  # Will be filled by agent
-        "sender": "user",
-        "recipient": "validation_agent",
-        "message_type": "validation_request",
-        "content": {"strategy_params": validation_request.strategy_params},
-        "context": {
-            "session_id": session_id,
-            "user_id": current_user.id
-        }
+    agent_message = _VALIDATION_MESSAGE_TEMPLATE.copy()
+    agent_message["message_id"] = f"msg_{token_hex(4)}"
+    agent_message["content"] = {"strategy_params": validation_request.strategy_params}
+    agent_message["context"] = {
+        "session_id": session_id,
+        "user_id": current_user.id
     }
     
     # Process message through the validation agent directly
-    response = validation_agent.process(agent_message, {})
+    response = await asyncio.to_thread(_run_agent, validation_agent.process, agent_message, {})
     
     # Return response
     return ValidationResponse(
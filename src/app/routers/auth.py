@@ -8,11 +8,11 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from ..auth import authenticate_user, create_access_token, get_current_user, get_password_hash
+from ..auth import authenticate_user, create_access_token, get_current_user, aget_password_hash
 from ..config import settings
 from ...models.user import User, UserCreate, Token, UserLogin
 from ...database.connection import get_db_manager
-from ...database.repositories.user_repository import UserRepository
+from ...database.repositories.user_repository import get_user_repository
 
 
 router = APIRouter()
@@ -58,7 +58,7 @@ async def register(
     """
     Register a new user.
     """
-    user_repo = UserRepository(db_manager)
+    user_repo = get_user_repository(db_manager)
     
     # Check if user with this email already exists
     existing_user = await user_repo.get_user_by_email(user_in.email)
@@ -69,7 +69,7 @@ async def register(
         )
     
     # Hash the password
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await aget_password_hash(user_in.password)
     
     # Create the user
     user = await user_repo.create_user(user_in, hashed_password)
@@ -4,58 +4,458 @@ API routes for market data operations.
 This module provides FastAPI routes for retrieving and managing market data.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
-from typing import Dict, List, Optional, Any
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 
 from ...database.connection import get_db_manager
-from ...models.market_data import MarketDataRequest, OHLCV
+from ...models.market_data import HistoricalIndicatorsRequest, Instrument, MarketDataRequest, OHLCV, Timeframe, Version
 from ...services.data_availability import DataAvailabilityService
 from ...services.data_retrieval import DataRetrievalService
 from ...services.data_versioning import DataVersioningService
-from ...services.data_integrity import DataIntegrityService
-from ...services.indicators import IndicatorService
+from ...services.data_integrity import INTEGRITY_CHECKS, DataIntegrityService, IntegrityCheck
+from ...services.indicators import IndicatorService, get_process_indicator_service, warmup_indicator_service
 from ...database.influxdb import InfluxDBClient
+from ..responses import ORJSONResponse, PreEncodedJSONResponse, StreamingJSONObjectResponse
 
+logger = logging.getLogger(__name__)
+
+# Data routes return large untyped dicts (OHLCV, indicator series), which
+# orjson encodes much faster than the stdlib encoder
 router = APIRouter(
     prefix="/data",
     tags=["data"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
+# Indicator calculations are CPU-bound, so they run in worker processes to
+# keep the event loop free and use more than one core. Each worker warms up
+# its shared service when it starts rather than on its first request. The
+# pool is created on first use and shut down with the application.
+_indicator_pool: Optional[ProcessPoolExecutor] = None
 
-@router.get("/health")
-async def check_data_health(db=Depends(get_db_manager)):
-    """Check the health of the data services."""
+# Below this many OHLCV points, pickling the request to a worker costs more
+# than the calculation, so small requests run on a thread instead
+INDICATOR_PROCESS_THRESHOLD = 5_000
+
+
+# Read-only lookups change slowly, so their responses are cached briefly per
+# process and, when Redis is configured, shared between processes. Keys start
+# with the route, instrument and timeframe so writes can invalidate them.
+DATA_CACHE_SIZE = 4096
+DATA_CACHE_TTL = 60  # seconds
+DATA_CACHE_LOCK_TTL = 10_000  # milliseconds
+_DATA_CACHE_CONTROL = f"public, max-age={DATA_CACHE_TTL}"
+_data_cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_data_cache_locks: Dict[Tuple, asyncio.Lock] = {}
+# Requests holding or waiting on each lock; a lock is dropped only once none
+# remain, so a late request cannot start a second computation beside a waiter
+_data_cache_lock_users: Dict[Tuple, int] = {}
+
+# Bumped by every write; part of the ETags of conditional GETs
+_DATA_GENERATION_KEY = "data_generation"
+_local_data_generation = 0
+
+
+def _get_cached_data(key: Tuple) -> Optional[Dict[str, Any]]:
+    """Return a cached response body, or None on a miss or expired entry."""
+    cached = _data_cache.get(key)
+    if cached is None:
+        return None
+    expires_at, body = cached
+    if time.monotonic() >= expires_at:
+        _data_cache.pop(key, None)
+        return None
+    _data_cache.move_to_end(key)
+    return body
+
+
+def _redis_key(key: Tuple) -> str:
+    """Build the Redis key for a cache key."""
+    route, instrument, timeframe, *params = key
+    digest = hashlib.blake2b(orjson.dumps(params), digest_size=16).hexdigest()
+    return f"data:{route}:{instrument}:{timeframe}:{digest}"
+
+
+async def _get_shared_data(redis_client, key: Tuple) -> Optional[Dict[str, Any]]:
+    """
+    Get a response body from Redis, computing it on a miss.
+    
+    The first process to miss takes a short lock so the others wait for its
+    result instead of all querying InfluxDB.
+    
+    Returns:
+        The cached body, or None if it was not found and this process should
+        compute it
+    """
+    redis_key = _redis_key(key)
+    try:
+        cached = await asyncio.to_thread(redis_client.get, redis_key)
+        if cached is not None:
+            return orjson.loads(cached)
+        
+        acquired = await asyncio.to_thread(
+            redis_client.set, f"{redis_key}:lock", 1, nx=True, px=DATA_CACHE_LOCK_TTL
+        )
+        if acquired:
+            return None
+        
+        # Another process is computing this body; wait for it up to the lock TTL
+        deadline = time.monotonic() + DATA_CACHE_LOCK_TTL / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            cached = await asyncio.to_thread(redis_client.get, redis_key)
+            if cached is not None:
+                return orjson.loads(cached)
+    except Exception as e:
+        logger.warning(f"Redis cache lookup failed for {redis_key}: {e}")
+    return None
+
+
+async def _set_shared_data(redis_client, key: Tuple, body: Dict[str, Any]) -> None:
+    """Store a response body in Redis and release the fill lock."""
+    redis_key = _redis_key(key)
+    try:
+        encoded = orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        await asyncio.to_thread(redis_client.setex, redis_key, DATA_CACHE_TTL, encoded)
+    except Exception as e:
+        logger.warning(f"Redis cache store failed for {redis_key}: {e}")
+    await _release_shared_lock(redis_client, key)
+
+
+async def _release_shared_lock(redis_client, key: Tuple) -> None:
+    """Release the Redis fill lock so other processes stop waiting for a body."""
+    redis_key = _redis_key(key)
+    try:
+        await asyncio.to_thread(redis_client.delete, f"{redis_key}:lock")
+    except Exception as e:
+        logger.warning(f"Redis cache lock release failed for {redis_key}: {e}")
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether a request's If-None-Match header matches an ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+async def _data_generation(redis_client=None) -> int:
+    """Get the data generation, shared through Redis when it is configured."""
+    if redis_client is not None:
+        try:
+            generation = await asyncio.to_thread(redis_client.get, _DATA_GENERATION_KEY)
+            return int(generation or 0)
+        except Exception as e:
+            logger.warning(f"Redis data generation lookup failed: {e}")
+    return _local_data_generation
+
+
+async def _not_modified(request: Request, key: Tuple, response: Response, redis_client=None) -> Optional[Response]:
+    """
+    Handle a conditional GET for a data lookup.
+    
+    The ETag covers the lookup's parameters, the data generation (bumped by
+    every write) and the current cache period, so a client revalidating with
+    it sees a 304 only while the data it holds can be no staler than a cached
+    response.
+    
+    Args:
+        request: The incoming request
+        key: Cache key of route, instrument, timeframe and the other parameters
+        response: Response to mark with the ETag
+        redis_client: Optional Redis client shared between processes
+        
+    Returns:
+        A 304 response when the client's copy is current, otherwise None
+    """
+    generation = await _data_generation(redis_client)
+    period = int(time.time() // DATA_CACHE_TTL)
+    digest = hashlib.blake2b(orjson.dumps([*key, generation, period]), digest_size=16).hexdigest()
+    etag = f'"{digest}"'
+    response.headers["ETag"] = etag
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
+
+
+async def _cached_data(
+    key: Tuple,
+    compute: Callable[[], Awaitable[Dict[str, Any]]],
+    response: Response,
+    redis_client=None,
+    request: Optional[Request] = None
+) -> Union[Dict[str, Any], Response]:
+    """
+    Get a response body from the cache, computing it on a miss.
+    
+    Concurrent misses for the same key wait for a single computation rather
+    than all querying InfluxDB. Bodies are only cached when compute returns,
+    so errors raised as HTTPException are not cached.
+    
+    Args:
+        key: Cache key of route, instrument, timeframe and the other parameters
+        compute: Coroutine function producing the response body
+        response: Response to mark with Cache-Control and X-Cache headers
+        redis_client: Optional Redis client shared between processes
+        request: The incoming request, to answer conditional GETs with a 304
+            before any lookup
+        
+    Returns:
+        Response body, shared with other requests; callers must not modify it.
+        A 304 response when the request's ETag is current.
+    """
+    response.headers["Cache-Control"] = _DATA_CACHE_CONTROL
+    if request is not None:
+        not_modified = await _not_modified(request, key, response, redis_client)
+        if not_modified is not None:
+            return not_modified
+    
+    body = _get_cached_data(key)
+    hit = body is not None
+    
+    if not hit:
+        lock = _data_cache_locks.setdefault(key, asyncio.Lock())
+        _data_cache_lock_users[key] = _data_cache_lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                body = _get_cached_data(key)
+                hit = body is not None
+                if not hit and redis_client is not None:
+                    body = await _get_shared_data(redis_client, key)
+                    hit = body is not None
+                if body is None:
+                    try:
+                        body = await compute()
+                    except Exception:
+                        # Don't leave others polling for a body that never arrives
+                        if redis_client is not None:
+                            await _release_shared_lock(redis_client, key)
+                        raise
+                    if redis_client is not None:
+                        await _set_shared_data(redis_client, key, body)
+                if _get_cached_data(key) is None:
+                    _data_cache[key] = (time.monotonic() + DATA_CACHE_TTL, body)
+                    if len(_data_cache) > DATA_CACHE_SIZE:
+                        _data_cache.popitem(last=False)
+        finally:
+            _data_cache_lock_users[key] -= 1
+            if not _data_cache_lock_users[key]:
+                del _data_cache_lock_users[key]
+                del _data_cache_locks[key]
+    
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    return body
+
+
+async def _invalidate_cached_data(
+    instrument: Optional[str] = None,
+    timeframe: Optional[str] = None,
+    redis_client=None
+) -> None:
+    """
+    Drop cached responses of every route for an instrument and timeframe.
+    
+    Also bumps the data generation, which changes every ETag; this happens
+    after the caches are cleared so a new ETag is never paired with a stale
+    body.
+    
+    Args:
+        instrument: Instrument to invalidate, or None for all instruments
+        timeframe: Timeframe to invalidate, or None for all timeframes
+        redis_client: Optional Redis client shared between processes
+    """
+    stale = [
+        key for key in _data_cache
+        if instrument in (None, key[1]) and timeframe in (None, key[2])
+    ]
+    for key in stale:
+        _data_cache.pop(key, None)
+    
+    if redis_client is not None:
+        pattern = f"data:*:{instrument or '*'}:{timeframe or '*'}:*"
+        try:
+            await asyncio.to_thread(_delete_redis_keys, redis_client, pattern)
+        except Exception as e:
+            logger.warning(f"Redis cache invalidation failed for {pattern}: {e}")
+    
+    global _local_data_generation
+    _local_data_generation += 1
+    if redis_client is not None:
+        try:
+            await asyncio.to_thread(redis_client.incr, _DATA_GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Redis data generation update failed: {e}")
+
+
+def _delete_redis_keys(redis_client, pattern: str) -> None:
+    """Delete the Redis keys matching a pattern."""
+    keys = list(redis_client.scan_iter(match=pattern, count=500))
+    if keys:
+        redis_client.delete(*keys)
+
+
+def clear_data_cache() -> None:
+    """Clear the cached data route responses in this process."""
+    _data_cache.clear()
+
+
+# Services are stateless apart from their InfluxDB client, so one instance
+# per client is shared by all requests
+@lru_cache(maxsize=4)
+def _availability_service(influxdb_client: InfluxDBClient) -> DataAvailabilityService:
+    """Get the availability service for an InfluxDB client."""
+    return DataAvailabilityService(influxdb_client=influxdb_client)
+
+
+@lru_cache(maxsize=4)
+def _versioning_service(influxdb_client: InfluxDBClient) -> DataVersioningService:
+    """Get the versioning service for an InfluxDB client."""
+    return DataVersioningService(influxdb_client=influxdb_client)
+
+
+@lru_cache(maxsize=4)
+def _integrity_service(influxdb_client: InfluxDBClient) -> DataIntegrityService:
+    """Get the integrity service for an InfluxDB client."""
+    return DataIntegrityService(
+        influxdb_client=influxdb_client,
+        versioning_service=_versioning_service(influxdb_client)
+    )
+
+
+@lru_cache(maxsize=4)
+def _retrieval_service(influxdb_client: InfluxDBClient) -> DataRetrievalService:
+    """Get the retrieval service for an InfluxDB client."""
+    return DataRetrievalService(influxdb_client=influxdb_client, indicator_service=get_process_indicator_service())
+
+
+def require_influx(db=Depends(get_db_manager)) -> InfluxDBClient:
+    """
+    Get the InfluxDB client for a request.
     
-    if db.influxdb_client is None:
+    Raises:
+        HTTPException: 503 if InfluxDB is not connected
+    """
+    influxdb_client = db.influxdb_client
+    if influxdb_client is None:
         raise HTTPException(status_code=503, detail="InfluxDB client not available")
+    return influxdb_client
+
+
+def get_availability_service(influxdb_client: InfluxDBClient = Depends(require_influx)) -> DataAvailabilityService:
+    """Get the shared availability service for a request."""
+    return _availability_service(influxdb_client)
+
+
+def get_versioning_service(influxdb_client: InfluxDBClient = Depends(require_influx)) -> DataVersioningService:
+    """Get the shared versioning service for a request."""
+    return _versioning_service(influxdb_client)
+
+
+def get_integrity_service(influxdb_client: InfluxDBClient = Depends(require_influx)) -> DataIntegrityService:
+    """Get the shared integrity service for a request."""
+    return _integrity_service(influxdb_client)
+
+
+def get_retrieval_service(influxdb_client: InfluxDBClient = Depends(require_influx)) -> DataRetrievalService:
+    """Get the shared retrieval service for a request."""
+    return _retrieval_service(influxdb_client)
+
+
+def _get_indicator_pool() -> ProcessPoolExecutor:
+    """
+    Get the indicator process pool, creating it on first use.
+    
+    Workers are spawned rather than forked: the server process runs a large
+    thread pool, and forking a process with running threads can deadlock.
+    
+    Returns:
+        Shared process pool for indicator calculations
+    """
+    global _indicator_pool
+    if _indicator_pool is None:
+        _indicator_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warmup_indicator_service
+        )
+    return _indicator_pool
+
+
+def shutdown_indicator_pool() -> None:
+    """Shut down the indicator process pool, if it was started."""
+    global _indicator_pool
+    pool, _indicator_pool = _indicator_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _calculate_indicators(ohlcv_data: OHLCV, indicators: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Calculate indicators off the event loop, in the process pool for large series."""
+    if len(ohlcv_data.data) < INDICATOR_PROCESS_THRESHOLD:
+        return await asyncio.to_thread(
+            get_process_indicator_service().calculate_multiple_indicators,
+            ohlcv_data,
+            indicators
+        )
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_indicator_pool(),
+        IndicatorService.calculate_multiple_indicators_static,
+        ohlcv_data,
+        indicators
+    )
+
+
+_AVAILABLE_INDICATORS_CACHE_CONTROL = "public, max-age=3600"
+
+_DATA_HEALTHY_BODY = PreEncodedJSONResponse.encode(
+    {"status": "healthy", "message": "Data services are operational"}
+)
+
+
+@router.get("/health")
+async def check_data_health(influxdb_client: InfluxDBClient = Depends(require_influx)):
+    """Check the health of the data services."""
     
-    health_status = db.influxdb_client.health_check()
+    # The InfluxDB client is synchronous; keep the event loop free meanwhile
+    health_status = await asyncio.to_thread(influxdb_client.health_check)
     
     if not health_status:
         raise HTTPException(status_code=503, detail="InfluxDB health check failed")
     
-    return {"status": "healthy", "message": "Data services are operational"}
+    return PreEncodedJSONResponse(_DATA_HEALTHY_BODY)
 
 
 @router.get("/availability")
 async def check_data_availability(
-    instrument: str,
-    timeframe: str,
-    start_date: str,
-    end_date: str,
-    version: str = "latest",
+    instrument: Instrument,
+    timeframe: Timeframe,
+    start_date: datetime,
+    end_date: datetime,
+    response: Response,
+    version: Version = "latest",
+    influxdb_client: InfluxDBClient = Depends(require_influx),
+    availability_service: DataAvailabilityService = Depends(get_availability_service),
     db=Depends(get_db_manager)
 ):
     """Check if data is available for the specified parameters."""
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create availability service
-    availability_service = DataAvailabilityService(influxdb_client=db.influxdb_client)
-    
     # Create request
     request = MarketDataRequest(
         instrument=instrument,
@@ -65,45 +465,45 @@ async def check_data_availability(
         version=version
     )
     
-    # Get missing segments
-    missing_segments = await availability_service.get_missing_segments(request)
-    
-    # Check availability
-    availability = db.influxdb_client.check_data_availability(
-        instrument=instrument,
-        timeframe=timeframe,
-        start_date=start_date,
-        end_date=end_date,
-        version=version
-    )
+    async def query_availability() -> Dict[str, Any]:
+        # The two queries are independent, so they run concurrently; the
+        # InfluxDB client is synchronous
+        missing_segments, availability = await asyncio.gather(
+            availability_service.get_missing_segments(request),
+            asyncio.to_thread(
+                influxdb_client.check_data_availability,
+                instrument=instrument,
+                timeframe=timeframe,
+                start_date=start_date,
+                end_date=end_date,
+                version=version
+            )
+        )
+        return {
+            "availability": availability,
+            "missing_segments": missing_segments
+        }
     
-    return {
-        "availability": availability,
-        "missing_segments": missing_segments
-    }
+    key = ("availability", instrument, timeframe, start_date, end_date, version)
+    return await _cached_data(key, query_availability, response, db.redis_client)
 
 
 @router.post("/snapshot")
 async def create_data_snapshot(
-    instrument: str,
-    timeframe: str,
-    start_date: str,
-    end_date: str,
+    instrument: Instrument,
+    timeframe: Timeframe,
+    start_date: datetime,
+    end_date: datetime,
     purpose: str = "manual",
     description: Optional[str] = None,
     user_id: str = "system",
     strategy_id: Optional[str] = None,
     tags: Optional[Dict[str, str]] = None,
+    versioning_service: DataVersioningService = Depends(get_versioning_service),
     db=Depends(get_db_manager)
 ):
     """Create a data snapshot for audit and versioning purposes."""
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create versioning service
-    versioning_service = DataVersioningService(influxdb_client=db.influxdb_client)
-    
     # Create a snapshot with enhanced metadata
     snapshot_id = await versioning_service.create_snapshot(
         instrument=instrument,
@@ -123,6 +523,8 @@ async def create_data_snapshot(
             detail="Failed to create snapshot"
         )
     
+    await _invalidate_cached_data(instrument, timeframe, db.redis_client)
+    
     return {
         "snapshot_id": snapshot_id,
         "instrument": instrument,
@@ -138,42 +540,41 @@ async def create_data_snapshot(
 
 @router.get("/versions")
 async def get_data_versions(
-    instrument: str,
-    timeframe: str,
+    instrument: Instrument,
+    timeframe: Timeframe,
+    request: Request,
+    response: Response,
     include_snapshots: bool = True,
     include_latest: bool = True,
     include_metadata: bool = False,
+    versioning_service: DataVersioningService = Depends(get_versioning_service),
     db=Depends(get_db_manager)
 ):
     """Get available data versions for an instrument/timeframe with optional metadata."""
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create versioning service
-    versioning_service = DataVersioningService(influxdb_client=db.influxdb_client)
-    
-    # Get versions with enhanced filtering and metadata
-    versions = await versioning_service.list_versions(
-        instrument=instrument,
-        timeframe=timeframe,
-        include_snapshots=include_snapshots,
-        include_latest=include_latest,
-        include_metadata=include_metadata
-    )
-    
-    return {
-        "instrument": instrument,
-        "timeframe": timeframe,
-        "versions": versions
-    }
+    async def list_versions() -> Dict[str, Any]:
+        # Get versions with enhanced filtering and metadata
+        versions = await versioning_service.list_versions(
+            instrument=instrument,
+            timeframe=timeframe,
+            include_snapshots=include_snapshots,
+            include_latest=include_latest,
+            include_metadata=include_metadata
+        )
+        return {
+            "instrument": instrument,
+            "timeframe": timeframe,
+            "versions": versions
+        }
+    
+    key = ("versions", instrument, timeframe, include_snapshots, include_latest, include_metadata)
+    return await _cached_data(key, list_versions, response, db.redis_client, request)
 
 
 @router.post("/indicators")
 async def calculate_indicators(
     ohlcv_data: OHLCV,
-    indicators: List[Dict[str, Any]],
-    db=Depends(get_db_manager)
+    indicators: List[Dict[str, Any]]
 ):
     """
     Calculate indicators for provided OHLCV data.
@@ -182,24 +583,26 @@ async def calculate_indicators(
     Returns indicators without requiring data to be stored in the database.
     """
     
-    # Create indicator service
-    indicator_service = IndicatorService(
-        cache_enabled=True,
-        optimize=True,
-        validate_params=True
-    )
+    # Nothing to calculate; don't hand the data to a worker
+    if not indicators:
+        return {}
     
     # Calculate indicators
-    result = indicator_service.calculate_multiple_indicators(
-        ohlcv_data=ohlcv_data,
-        indicators_config=indicators
-    )
+    result = await _calculate_indicators(ohlcv_data, indicators)
     
-    return result
+    # Streamed per indicator, which also skips jsonable_encoder over every value
+    return StreamingJSONObjectResponse(result)
+
+
+@lru_cache(maxsize=1)
+def _available_indicators_body() -> Tuple[bytes, str]:
+    """Get the encoded available indicators and their ETag."""
+    body = PreEncodedJSONResponse.encode(get_process_indicator_service().get_available_indicators())
+    return body, f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
 
 
 @router.get("/indicators/available")
-async def get_available_indicators():
+async def get_available_indicators(request: Request):
     """
     Get a list of all available indicators with metadata.
     
@@ -207,24 +610,21 @@ async def get_available_indicators():
     descriptions and default parameters.
     """
     
-    # Create indicator service
-    indicator_service = IndicatorService()
+    # The indicator metadata is fixed for the life of the process, so it is
+    # encoded once and clients can revalidate with If-None-Match
+    body, etag = _available_indicators_body()
+    headers = {"Cache-Control": _AVAILABLE_INDICATORS_CACHE_CONTROL, "ETag": etag}
     
-    # Get available indicators
-    result = indicator_service.get_available_indicators()
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
     
-    return result
+    return PreEncodedJSONResponse(body, headers=headers)
 
 
 @router.post("/indicators/historical")
 async def calculate_historical_indicators(
-    instrument: str,
-    timeframe: str,
-    start_date: str,
-    end_date: str,
-    indicators: List[Dict[str, Any]],
-    version: str = "latest",
-    db=Depends(get_db_manager)
+    request: HistoricalIndicatorsRequest,
+    data_retrieval: DataRetrievalService = Depends(get_retrieval_service)
 ):
     """
     Calculate indicators for historical data retrieved from the database.
@@ -233,136 +633,112 @@ async def calculate_historical_indicators(
     More efficient than separately retrieving data and calculating indicators.
     """
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Retrieve historical data
-    data_retrieval = DataRetrievalService(influxdb_client=db.influxdb_client)
+    data_source = {
+        "instrument": request.instrument,
+        "timeframe": request.timeframe,
+        "start_date": request.start_date,
+        "end_date": request.end_date,
+        "version": request.version
+    }
     
-    # Create a request
-    request = MarketDataRequest(
-        instrument=instrument,
-        timeframe=timeframe,
-        start_date=start_date,
-        end_date=end_date,
-        version=version
-    )
+    # Nothing to calculate, so skip the InfluxDB query; the data isn't counted
+    if not request.indicators:
+        return {"data_source": {**data_source, "data_points": None}}
     
     # Retrieve OHLCV data
     ohlcv_data = await data_retrieval.get_ohlcv_data(request)
+    data_points = len(ohlcv_data.data) if ohlcv_data else 0
     
-    if not ohlcv_data or len(ohlcv_data.data) == 0:
+    if data_points == 0:
         raise HTTPException(
             status_code=404,
-            detail=f"No data found for {instrument}/{timeframe} from {start_date} to {end_date}"
+            detail=f"No data found for {request.instrument}/{request.timeframe} "
+                   f"from {request.start_date} to {request.end_date}"
         )
     
-    # Create indicator service
-    indicator_service = IndicatorService(
-        cache_enabled=True,
-        optimize=True,
-        validate_params=True
-    )
-    
     # Calculate indicators
-    result = indicator_service.calculate_multiple_indicators(
-        ohlcv_data=ohlcv_data,
-        indicators_config=indicators
-    )
+    result = await _calculate_indicators(ohlcv_data, request.indicators)
     
     # Add data source information
-    result["data_source"] = {
-        "instrument": instrument,
-        "timeframe": timeframe,
-        "start_date": start_date,
-        "end_date": end_date,
-        "version": version,
-        "data_points": len(ohlcv_data.data) if ohlcv_data else 0
-    }
+    result["data_source"] = {**data_source, "data_points": data_points}
     
-    return result
+    # Streamed per indicator, which also skips jsonable_encoder over every value
+    return StreamingJSONObjectResponse(result)
 
 
 @router.get("/version/compare")
 async def compare_versions(
-    instrument: str,
-    timeframe: str,
-    version1: str,
-    version2: str,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    instrument: Instrument,
+    timeframe: Timeframe,
+    version1: Version,
+    version2: Version,
+    response: Response,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    versioning_service: DataVersioningService = Depends(get_versioning_service),
     db=Depends(get_db_manager)
 ):
     """Compare two data versions and identify differences."""
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create versioning service
-    versioning_service = DataVersioningService(influxdb_client=db.influxdb_client)
-    
-    # Compare versions
-    comparison = await versioning_service.compare_versions(
-        instrument=instrument,
-        timeframe=timeframe,
-        version1=version1,
-        version2=version2,
-        start_date=start_date,
-        end_date=end_date
-    )
+    async def compare() -> Dict[str, Any]:
+        # Compare versions
+        return await versioning_service.compare_versions(
+            instrument=instrument,
+            timeframe=timeframe,
+            version1=version1,
+            version2=version2,
+            start_date=start_date,
+            end_date=end_date
+        )
     
-    return comparison
+    key = ("version_compare", instrument, timeframe, version1, version2, start_date, end_date)
+    return await _cached_data(key, compare, response, db.redis_client)
 
 
 @router.get("/version/lineage/{version}")
 async def get_version_lineage(
-    version: str,
-    instrument: str,
-    timeframe: str,
+    version: Version,
+    instrument: Instrument,
+    timeframe: Timeframe,
+    request: Request,
+    response: Response,
+    versioning_service: DataVersioningService = Depends(get_versioning_service),
     db=Depends(get_db_manager)
 ):
     """Get the lineage information for a data version."""
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create versioning service
-    versioning_service = DataVersioningService(influxdb_client=db.influxdb_client)
-    
-    # Get lineage
-    lineage = await versioning_service.get_version_lineage(
-        instrument=instrument,
-        timeframe=timeframe,
-        version=version
-    )
-    
-    if "error" in lineage:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Failed to retrieve lineage: {lineage['error']}"
+    async def lineage() -> Dict[str, Any]:
+        # Get lineage
+        result = await versioning_service.get_version_lineage(
+            instrument=instrument,
+            timeframe=timeframe,
+            version=version
         )
-    
-    return lineage
+        
+        if "error" in result:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Failed to retrieve lineage: {result['error']}"
+            )
+        return result
+    
+    key = ("version_lineage", instrument, timeframe, version)
+    return await _cached_data(key, lineage, response, db.redis_client, request)
 
 
 @router.post("/version/tag")
 async def tag_version(
-    instrument: str,
-    timeframe: str,
-    version: str,
+    instrument: Instrument,
+    timeframe: Timeframe,
+    version: Version,
     tag_name: str,
     tag_value: str,
     user_id: str = "system",
+    versioning_service: DataVersioningService = Depends(get_versioning_service),
     db=Depends(get_db_manager)
 ):
     """Add a tag to a data version for categorization."""
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create versioning service
-    versioning_service = DataVersioningService(influxdb_client=db.influxdb_client)
-    
     # Tag version
     success = await versioning_service.tag_version(
         instrument=instrument,
@@ -379,6 +755,8 @@ async def tag_version(
             detail=f"Failed to tag version: Version {version} not found"
         )
     
+    await _invalidate_cached_data(instrument, timeframe, db.redis_client)
+    
     return {
         "instrument": instrument,
         "timeframe": timeframe,
@@ -397,19 +775,14 @@ async def apply_retention_policy(
     max_snapshot_age_days: int = 90,
     exempt_purposes: List[str] = Body(default=["approval", "compliance"]),
     exempt_tags: Optional[Dict[str, str]] = None,
-    instrument: Optional[str] = None,
-    timeframe: Optional[str] = None,
+    instrument: Optional[Instrument] = None,
+    timeframe: Optional[Timeframe] = None,
     dry_run: bool = True,
+    versioning_service: DataVersioningService = Depends(get_versioning_service),
     db=Depends(get_db_manager)
 ):
     """Apply data retention policy to snapshots."""
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create versioning service
-    versioning_service = DataVersioningService(influxdb_client=db.influxdb_client)
-    
     # Apply retention policy
     result = await versioning_service.apply_retention_policy(
         instrument=instrument,
@@ -426,16 +799,21 @@ async def apply_retention_policy(
             detail=f"Failed to apply retention policy: {result['error']}"
         )
     
+    if not dry_run:
+        await _invalidate_cached_data(instrument, timeframe, db.redis_client)
+    
     return result
 
 
 @router.get("/anomalies")
 async def detect_data_anomalies(
-    instrument: str,
-    timeframe: str,
-    start_date: str,
-    end_date: str,
-    version: str = "latest",
+    instrument: Instrument,
+    timeframe: Timeframe,
+    start_date: datetime,
+    end_date: datetime,
+    response: Response,
+    version: Version = "latest",
+    integrity_service: DataIntegrityService = Depends(get_integrity_service),
     db=Depends(get_db_manager)
 ):
     """
@@ -446,38 +824,36 @@ async def detect_data_anomalies(
     confidence scores.
     """
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create integrity service
-    integrity_service = DataIntegrityService(influxdb_client=db.influxdb_client)
-    
-    # Detect anomalies
-    anomalies = await integrity_service.detect_anomalies(
-        instrument=instrument,
-        timeframe=timeframe,
-        start_date=start_date,
-        end_date=end_date,
-        version=version
-    )
-    
-    if "error" in anomalies:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to detect anomalies: {anomalies['error']}"
+    async def anomalies() -> Dict[str, Any]:
+        # Detect anomalies
+        result = await integrity_service.detect_anomalies(
+            instrument=instrument,
+            timeframe=timeframe,
+            start_date=start_date,
+            end_date=end_date,
+            version=version
         )
-    
-    return anomalies
+        
+        if "error" in result:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to detect anomalies: {result['error']}"
+            )
+        return result
+    
+    key = ("anomalies", instrument, timeframe, start_date, end_date, version)
+    return await _cached_data(key, anomalies, response, db.redis_client)
 
 
 @router.get("/reconcile")
 async def reconcile_data_with_source(
-    instrument: str,
-    timeframe: str,
+    instrument: Instrument,
+    timeframe: Timeframe,
     source: str,
-    start_date: str,
-    end_date: str,
+    start_date: datetime,
+    end_date: datetime,
     create_adjustment: bool = False,
+    integrity_service: DataIntegrityService = Depends(get_integrity_service),
     db=Depends(get_db_manager)
 ):
     """
@@ -488,12 +864,6 @@ async def reconcile_data_with_source(
     significant discrepancies.
     """
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create integrity service
-    integrity_service = DataIntegrityService(influxdb_client=db.influxdb_client)
-    
     # Reconcile with source
     reconciliation = await integrity_service.reconcile_with_source(
         instrument=instrument,
@@ -510,16 +880,22 @@ async def reconcile_data_with_source(
             detail=f"Reconciliation failed: {reconciliation.get('reason', reconciliation.get('error', 'Unknown error'))}"
         )
     
+    if create_adjustment:
+        await _invalidate_cached_data(instrument, timeframe, db.redis_client)
+    
     return reconciliation
 
 
 @router.get("/corporate-actions")
 async def detect_corporate_actions(
-    instrument: str,
-    timeframe: str,
-    start_date: str,
-    end_date: str,
-    version: str = "latest",
+    instrument: Instrument,
+    timeframe: Timeframe,
+    start_date: datetime,
+    end_date: datetime,
+    request: Request,
+    response: Response,
+    version: Version = "latest",
+    integrity_service: DataIntegrityService = Depends(get_integrity_service),
     db=Depends(get_db_manager)
 ):
     """
@@ -529,34 +905,31 @@ async def detect_corporate_actions(
     that suggest corporate actions. Returns detailed results with confidence scores.
     """
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create integrity service
-    integrity_service = DataIntegrityService(influxdb_client=db.influxdb_client)
-    
-    # Detect corporate actions
-    actions = await integrity_service.detect_corporate_actions(
-        instrument=instrument,
-        timeframe=timeframe,
-        start_date=start_date,
-        end_date=end_date,
-        version=version
-    )
-    
-    if "error" in actions:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to detect corporate actions: {actions['error']}"
+    async def corporate_actions() -> Dict[str, Any]:
+        # Detect corporate actions
+        result = await integrity_service.detect_corporate_actions(
+            instrument=instrument,
+            timeframe=timeframe,
+            start_date=start_date,
+            end_date=end_date,
+            version=version
         )
-    
-    return actions
+        
+        if "error" in result:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to detect corporate actions: {result['error']}"
+            )
+        return result
+    
+    key = ("corporate_actions", instrument, timeframe, start_date, end_date, version)
+    return await _cached_data(key, corporate_actions, response, db.redis_client, request)
 
 
 @router.post("/adjustments")
 async def create_data_adjustment(
-    instrument: str,
-    timeframe: str,
+    instrument: Instrument,
+    timeframe: Timeframe,
     adjustment_type: str,
     adjustment_factor: float,
     reference_date: str,
@@ -564,6 +937,7 @@ async def create_data_adjustment(
     affected_fields: Optional[List[str]] = None,
     source: Optional[str] = None,
     user_id: str = "system",
+    integrity_service: DataIntegrityService = Depends(get_integrity_service),
     db=Depends(get_db_manager)
 ):
     """
@@ -573,12 +947,6 @@ async def create_data_adjustment(
     creating a new version of the data with the adjustment applied.
     """
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create integrity service
-    integrity_service = DataIntegrityService(influxdb_client=db.influxdb_client)
-    
     # Create adjustment
     adjustment = await integrity_service.create_adjustment(
         instrument=instrument,
@@ -598,16 +966,21 @@ async def create_data_adjustment(
             detail=f"Failed to create adjustment: {adjustment.get('error', adjustment.get('reason', 'Unknown error'))}"
         )
     
+    await _invalidate_cached_data(instrument, timeframe, db.redis_client)
+    
     return adjustment
 
 
 @router.get("/adjustments")
 async def list_data_adjustments(
-    instrument: Optional[str] = None,
-    timeframe: Optional[str] = None,
+    request: Request,
+    response: Response,
+    instrument: Optional[Instrument] = None,
+    timeframe: Optional[Timeframe] = None,
     adjustment_type: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    integrity_service: DataIntegrityService = Depends(get_integrity_service),
     db=Depends(get_db_manager)
 ):
     """
@@ -616,11 +989,13 @@ async def list_data_adjustments(
     Retrieves historical record of data adjustments with various filtering options.
     """
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create integrity service
-    integrity_service = DataIntegrityService(influxdb_client=db.influxdb_client)
+    # Adjustments are only recorded through this router (adjustments and
+    # reconcile), so clients can revalidate without a query until a write
+    response.headers["Cache-Control"] = "private, must-revalidate"
+    key = ("adjustments", instrument, timeframe, adjustment_type, start_date, end_date)
+    not_modified = await _not_modified(request, key, response, db.redis_client)
+    if not_modified is not None:
+        return not_modified
     
     # List adjustments
     adjustments = await integrity_service.list_adjustments(
@@ -639,11 +1014,13 @@ async def list_data_adjustments(
 
 @router.get("/quality")
 async def verify_data_quality(
-    instrument: str,
-    timeframe: str,
-    start_date: str,
-    end_date: str,
-    version: str = "latest",
+    instrument: Instrument,
+    timeframe: Timeframe,
+    start_date: datetime,
+    end_date: datetime,
+    response: Response,
+    version: Version = "latest",
+    integrity_service: DataIntegrityService = Depends(get_integrity_service),
     db=Depends(get_db_manager)
 ):
     """
@@ -653,25 +1030,74 @@ async def verify_data_quality(
     and timestamp accuracy. Returns a detailed quality report with an overall score.
     """
     
-    if db.influxdb_client is None:
-        raise HTTPException(status_code=503, detail="InfluxDB client not available")
-    
-    # Create integrity service
-    integrity_service = DataIntegrityService(influxdb_client=db.influxdb_client)
-    
-    # Verify data quality
-    quality = await integrity_service.verify_data_quality(
-        instrument=instrument,
-        timeframe=timeframe,
-        start_date=start_date,
-        end_date=end_date,
-        version=version
-    )
-    
-    if quality.get("status") == "error" or quality.get("status") == "failed":
-        raise HTTPException(
-            status_code=500,
-            detail=f"Quality verification failed: {quality.get('error', quality.get('reason', 'Unknown error'))}"
+    async def quality() -> Dict[str, Any]:
+        # Verify data quality
+        result = await integrity_service.verify_data_quality(
+            instrument=instrument,
+            timeframe=timeframe,
+            start_date=start_date,
+            end_date=end_date,
+            version=version
         )
+        
+        if result.get("status") == "error" or result.get("status") == "failed":
+            raise HTTPException(
+                status_code=500,
+                detail=f"Quality verification failed: {result.get('error', result.get('reason', 'Unknown error'))}"
+            )
+        return result
+    
+    key = ("quality", instrument, timeframe, start_date, end_date, version)
+    return await _cached_data(key, quality, response, db.redis_client)
+
+
+@router.get("/integrity/report")
+async def get_integrity_report(
+    instrument: Instrument,
+    timeframe: Timeframe,
+    start_date: datetime,
+    end_date: datetime,
+    response: Response,
+    version: Version = "latest",
+    checks: List[IntegrityCheck] = Query(list(INTEGRITY_CHECKS)),
+    integrity_service: DataIntegrityService = Depends(get_integrity_service),
+    db=Depends(get_db_manager)
+):
+    """
+    Run the quality, anomaly and corporate action checks in one request.
     
-    return quality
\ No newline at end of file
+    The selected checks share a single query of the market data, instead of
+    each of /quality, /anomalies and /corporate-actions querying it again.
+    """
+    selected = [check for check in INTEGRITY_CHECKS if check in checks]
+    
+    async def report() -> Dict[str, Any]:
+        result = await integrity_service.integrity_report(
+            instrument=instrument,
+            timeframe=timeframe,
+            start_date=start_date,
+            end_date=end_date,
+            version=version,
+            checks=selected
+        )
+        
+        failed = [
+            check for check, check_result in result.items()
+            if "error" in check_result or check_result.get("status") == "failed"
+        ]
+        if failed:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Integrity checks failed: {', '.join(failed)}"
+            )
+        return {
+            "instrument": instrument,
+            "timeframe": timeframe,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "version": version,
+            **result
+        }
+    
+    key = ("integrity_report", instrument, timeframe, start_date, end_date, version, *selected)
+    return await _cached_data(key, report, response, db.redis_client)
@@ -1,16 +1,98 @@
 """Alpha Vantage data source connector for retrieving market data."""
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 import aiohttp
+import numpy as np
+import orjson
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 
 from .base import DataSourceConnector
 from ..models.market_data import OHLCV, OHLCVPoint, DataPointSource
 
 logger = logging.getLogger(__name__)
 
+# Connectors are created per request, so the HTTP session is shared at module
+# level to keep TLS connections to Alpha Vantage alive between fetches
+SESSION_CONNECTION_LIMIT = 20
+SESSION_TIMEOUT = 30  # seconds
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Parsed time series keyed on the request parameters. A response holds the
+# whole series whatever range was asked for, so one fetch serves every date
+# range, and the availability check, until it expires. The API is heavily
+# rate limited, and daily series only change once a day.
+SERIES_CACHE_SIZE = 64
+INTRADAY_CACHE_TTL = 60  # seconds
+DAILY_CACHE_TTL = 900  # seconds
+_series_cache: "OrderedDict[Tuple, Tuple[float, pd.DataFrame]]" = OrderedDict()
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared Alpha Vantage session, creating it on first use.
+    
+    Nothing is awaited between the check and the assignment, so concurrent
+    callers on one loop cannot create two sessions. A session only works on
+    the event loop it was created on, so a new one is created if the loop
+    has changed.
+    
+    Returns:
+        Shared aiohttp session
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=SESSION_CONNECTION_LIMIT,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            ),
+            timeout=aiohttp.ClientTimeout(total=SESSION_TIMEOUT)
+        )
+        _session_loop = loop
+    return _session
+
+
+def _get_cached_series(key: Tuple) -> Optional[pd.DataFrame]:
+    """Return a cached time series, or None on a miss or expired entry."""
+    cached = _series_cache.get(key)
+    if cached is None:
+        return None
+    expires_at, df = cached
+    if time.monotonic() >= expires_at:
+        _series_cache.pop(key, None)
+        return None
+    _series_cache.move_to_end(key)
+    return df
+
+
+def _cache_series(key: Tuple, df: pd.DataFrame, ttl: float) -> None:
+    """Store a time series, evicting the least recently used entry."""
+    _series_cache[key] = (time.monotonic() + ttl, df)
+    _series_cache.move_to_end(key)
+    if len(_series_cache) > SERIES_CACHE_SIZE:
+        _series_cache.popitem(last=False)
+
+
+def clear_series_cache() -> None:
+    """Clear the cached Alpha Vantage time series."""
+    _series_cache.clear()
+
+
+async def close_session() -> None:
+    """Close the shared Alpha Vantage session, if one is open."""
+    global _session, _session_loop
+    session, _session, _session_loop = _session, None, None
+    if session is not None and not session.closed:
+        await session.close()
+
 
 class AlphaVantageConnector(DataSourceConnector):
     """Connector for retrieving market data from Alpha Vantage."""
@@ -75,13 +157,6 @@ class AlphaVantageConnector(DataSourceConnector):
             if interval in ['daily', 'weekly', 'monthly']:
                 # For daily, weekly, or monthly data
                 function = f"TIME_SERIES_{interval.upper()}"
-                raw_data = await self._make_request(
-                    function=function,
-                    symbol=instrument,
-                    outputsize=self.output_size
-                )
-                
-                # Parse the response
                 time_series_key = f"Time Series ({interval.capitalize()})"
                 if interval == 'daily':
                     time_series_key = "Time Series (Daily)"
@@ -90,38 +165,39 @@ class AlphaVantageConnector(DataSourceConnector):
                 elif interval == 'monthly':
                     time_series_key = "Monthly Time Series"
                     
-                df = self._parse_time_series(raw_data, time_series_key)
+                df = await self._fetch_time_series(
+                    time_series_key,
+                    function=function,
+                    symbol=instrument,
+                    outputsize=self.output_size
+                )
             else:
                 # For intraday data
-                function = "TIME_SERIES_INTRADAY"
-                raw_data = await self._make_request(
-                    function=function,
+                df = await self._fetch_time_series(
+                    f"Time Series ({interval})",
+                    function="TIME_SERIES_INTRADAY",
                     symbol=instrument,
                     interval=interval,
                     outputsize=self.output_size
                 )
-                
-                # Parse the response
-                time_series_key = f"Time Series ({interval})"
-                df = self._parse_time_series(raw_data, time_series_key)
             
             # Filter by date range
             if not df.empty:
                 df = df.loc[(df.index >= start_date) & (df.index <= end_date)]
             
             # Convert to OHLCV format
-            ohlcv_data = self._convert_to_ohlcv(
+            ohlcv_data, raw_points = self._convert_to_ohlcv(
                 instrument=instrument,
                 timeframe=timeframe,
                 df=df
             )
             
             # Cache the data to InfluxDB if enabled
-            if not df.empty and self.cache_to_influxdb:
+            if raw_points and self.cache_to_influxdb:
                 await self._cache_to_influxdb(
                     instrument=instrument,
                     timeframe=timeframe,
-                    data=[point.dict() for point in ohlcv_data.data],
+                    data=raw_points,
                     is_adjusted=False
                 )
             
@@ -216,6 +292,36 @@ class AlphaVantageConnector(DataSourceConnector):
         
         return common_symbols
     
+    async def _fetch_time_series(self, time_series_key: str, **params: str) -> pd.DataFrame:
+        """
+        Fetch and parse a time series, reusing a recently fetched response.
+        
+        A compact request is also answered from a cached full response,
+        which contains the same latest points.
+        
+        Args:
+            time_series_key: Key of the time series in the response
+            **params: Request parameters other than the API key
+            
+        Returns:
+            The parsed time series; callers must not modify it
+        """
+        key = tuple(sorted(params.items()))
+        df = _get_cached_series(key)
+        if df is None and params.get('outputsize') == 'compact':
+            df = _get_cached_series(tuple(sorted({**params, 'outputsize': 'full'}.items())))
+        if df is not None:
+            return df
+        
+        raw_data = await self._make_request(**params)
+        df = self._parse_time_series(raw_data, time_series_key)
+        
+        # Failed or empty responses are fetched again next time
+        if not df.empty:
+            intraday = params['function'] == "TIME_SERIES_INTRADAY"
+            _cache_series(key, df, INTRADAY_CACHE_TTL if intraday else DAILY_CACHE_TTL)
+        return df
+    
     async def _make_request(self, function: str, symbol: str, **kwargs) -> Dict[str, Any]:
         """Make a request to the Alpha Vantage API."""
         # Prepare request parameters
@@ -228,25 +334,26 @@ class AlphaVantageConnector(DataSourceConnector):
         
         for retry in range(self.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(self.BASE_URL, params=params) as response:
-                        if response.status != 200:
-                            logger.error(f"Error fetching data from Alpha Vantage: {response.status}")
-                            continue
-                        
-                        data = await response.json()
-                        
-                        # Check for error messages in the response
-                        if "Error Message" in data:
-                            logger.error(f"Alpha Vantage API error: {data['Error Message']}")
-                            raise ValueError(data["Error Message"])
-                            
-                        # Check for API call frequency warning
-                        if "Note" in data and "call frequency" in data["Note"]:
-                            logger.warning(f"Alpha Vantage API frequency warning: {data['Note']}")
-                        
-                        return data
+                session = _get_session()
+                async with session.get(self.BASE_URL, params=params) as response:
+                    if response.status != 200:
+                        logger.error(f"Error fetching data from Alpha Vantage: {response.status}")
+                        continue
+                    
+                    # Decode the bytes directly; full payloads are hundreds of KB
+                    data = orjson.loads(await response.read())
+                    
+                    # Check for error messages in the response
+                    if "Error Message" in data:
+                        logger.error(f"Alpha Vantage API error: {data['Error Message']}")
+                        raise ValueError(data["Error Message"])
                         
+                    # Check for API call frequency warning
+                    if "Note" in data and "call frequency" in data["Note"]:
+                        logger.warning(f"Alpha Vantage API frequency warning: {data['Note']}")
+                    
+                    return data
+                    
             except Exception as e:
                 logger.error(f"Error in request to Alpha Vantage (retry {retry+1}/{self.max_retries}): {e}")
                 if retry == self.max_retries - 1:
@@ -261,11 +368,10 @@ class AlphaVantageConnector(DataSourceConnector):
             return pd.DataFrame()
             
         time_series = data[time_series_key]
+        if not time_series:
+            return pd.DataFrame()
         
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(time_series, orient='index')
-        
-        # Rename columns
+        # Map Alpha Vantage field names to column names
         column_mapping = {
             '1. open': 'Open',
             '2. high': 'High',
@@ -273,68 +379,79 @@ class AlphaVantageConnector(DataSourceConnector):
             '4. close': 'Close',
             '5. volume': 'Volume'
         }
-        df = df.rename(columns=column_mapping)
-        
-        # Convert columns to numeric
-        for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col])
-        
-        # Convert index to datetime
-        df.index = pd.to_datetime(df.index)
         
-        # Sort by date
-        df = df.sort_index()
+        # Read each field straight from the string-valued response into a
+        # float array rather than building a string frame and converting it
+        rows = list(time_series.values())
+        first = rows[0]
+        columns = {
+            name: np.fromiter((float(row.get(field, 'nan')) for row in rows), dtype=np.float64, count=len(rows))
+            for field, name in column_mapping.items()
+            if field in first
+        }
+        timestamps = np.array(list(time_series), dtype='datetime64[ns]')
         
-        return df
+        # Responses are newest first; sort by date
+        order = np.argsort(timestamps, kind='stable')
+        return pd.DataFrame(
+            {name: values[order] for name, values in columns.items()},
+            index=pd.DatetimeIndex(timestamps[order])
+        )
     
     def _convert_to_ohlcv(self,
                         instrument: str,
                         timeframe: str,
-                        df: pd.DataFrame) -> OHLCV:
-        """Convert Alpha Vantage data to OHLCV format."""
-        data_points = []
+                        df: pd.DataFrame) -> Tuple[OHLCV, List[Dict[str, Any]]]:
+        """
+        Convert Alpha Vantage data to OHLCV format.
         
+        The values come from numeric columns of a parsed response, so points
+        are built with model_construct instead of being validated one by one.
+        
+        Returns:
+            The OHLCV data, and the same points as dicts for caching to InfluxDB
+        """
+        empty = OHLCV(
+            instrument=instrument,
+            timeframe=timeframe,
+            source=self.get_source_type(),
+            data=[]
+        )
         if df.empty:
-            return OHLCV(
-                instrument=instrument,
-                timeframe=timeframe,
-                source=self.get_source_type(),
-                data=[]
-            )
+            return empty, []
         
         # Ensure expected columns exist
         required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
         if not all(col in df.columns for col in required_columns):
             logger.error(f"Missing required columns in Alpha Vantage data: {df.columns}")
-            return OHLCV(
-                instrument=instrument,
-                timeframe=timeframe,
-                source=self.get_source_type(),
-                data=[]
-            )
+            return empty, []
         
-        # Convert DataFrame to OHLCV points
-        for timestamp, row in df.iterrows():
-            # Alpha Vantage returns timestamps as pandas Timestamp objects
-            if hasattr(timestamp, 'to_pydatetime'):
-                dt = timestamp.to_pydatetime()
-            else:
-                dt = timestamp
-                
-            data_points.append(OHLCVPoint(
-                timestamp=dt,
-                open=float(row['Open']),
-                high=float(row['High']),
-                low=float(row['Low']),
-                close=float(row['Close']),
-                volume=float(row['Volume']),
-                source_id=f"alphavantage_{int(dt.timestamp())}"
-            ))
+        # Convert DataFrame to OHLCV points column-wise rather than per row;
+        # naive timestamps are taken as UTC for the source IDs
+        columns = [
+            df[col].to_numpy(dtype='float64').tolist()
+            for col in required_columns
+        ]
+        epoch_seconds = (df.index.values.astype('datetime64[ns]').view('i8') // 1_000_000_000).tolist()
+        timestamps = df.index.to_pydatetime()
+        
+        raw_points = [
+            {
+                "timestamp": dt,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+                "source_id": f"alphavantage_{seconds}"
+            }
+            for dt, open_, high, low, close, volume, seconds in zip(timestamps, *columns, epoch_seconds)
+        ]
         
-        return OHLCV(
+        ohlcv = OHLCV.model_construct(
             instrument=instrument,
             timeframe=timeframe,
             source=self.get_source_type(),
-            data=data_points
-        )
\ No newline at end of file
+            data=[OHLCVPoint.model_construct(**point) for point in raw_points]
+        )
+        return ohlcv, raw_points
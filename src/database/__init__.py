@@ -1,4 +1,4 @@
 # Database module
 from .connection import db_manager, get_db_manager
-from .init import init_all_databases, init_neo4j, init_sqlite, init_influxdb
+from .init import init_all_databases, init_neo4j, init_sqlite, init_influxdb, ensure_neo4j_schema
 from .strategy_repository import strategy_repository, get_strategy_repository, ComponentType, ComponentFilter
\ No newline at end of file
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import sqlite3
 import threading
@@ -12,6 +13,10 @@ logger = logging.getLogger(__name__)
 # Thread-local storage for SQLite connections
 _thread_local = threading.local()
 
+# Connection pool settings for the shared Neo4j driver
+NEO4J_MAX_CONNECTION_POOL_SIZE = 50
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT = 30  # seconds
+
 
 class DatabaseManager:
     """
@@ -66,7 +71,12 @@ class DatabaseManager:
         password = password or settings.NEO4J_PASSWORD
         
         if uri and username and password:
-            self.neo4j_driver = GraphDatabase.driver(uri, auth=(username, password))
+            self.neo4j_driver = GraphDatabase.driver(
+                uri,
+                auth=(username, password),
+                max_connection_pool_size=NEO4J_MAX_CONNECTION_POOL_SIZE,
+                connection_acquisition_timeout=NEO4J_CONNECTION_ACQUISITION_TIMEOUT
+            )
     
     def connect_influxdb(
         self,
@@ -174,10 +184,16 @@ class DatabaseManager:
 db_manager = DatabaseManager()
 
 
+@lru_cache(maxsize=1)
 def get_db_manager():
     """
     Get the database manager instance for dependency injection.
     
+    Connections are attempted on the first call only; later calls (one per
+    request using Depends(get_db_manager)) return the shared manager without
+    retrying databases that were unavailable at startup. Call
+    get_db_manager.cache_clear() to retry them.
+    
     Returns:
         Database manager instance
     """
@@ -204,4 +220,26 @@ def get_db_manager():
         except Exception:
             pass
             
-    return db_manager
\ No newline at end of file
+    return db_manager
+
+
+def get_influxdb_client() -> InfluxDBClient:
+    """
+    Get the process-wide InfluxDB client.
+    
+    Agents and services share the client held by the database manager rather
+    than each opening their own connection pool.
+    
+    Returns:
+        Shared InfluxDB client instance
+        
+    Raises:
+        RuntimeError: If InfluxDB is not configured or the connection fails
+    """
+    if db_manager.influxdb_client is None:
+        db_manager.connect_influxdb()
+    
+    if db_manager.influxdb_client is None:
+        raise RuntimeError("InfluxDB connection details not configured")
+    
+    return db_manager.influxdb_client
@@ -6,7 +6,7 @@ market data with support for versioning, data snapshots, and integrity verificat
 """
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Union, Any
 import uuid
 import json
@@ -17,6 +17,35 @@ from influxdb_client.client.write_api import SYNCHRONOUS
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def flux_time(value: Union[datetime, str]) -> str:
+    """
+    Format a date as a Flux time expression.
+    
+    Datetimes, and strings in ISO 8601 format, become an integer nanosecond
+    timestamp so InfluxDB does not parse a time string per query; naive
+    values are taken as UTC. Other strings, such as relative durations like
+    "-1y", are returned unchanged.
+    
+    Args:
+        value: Datetime, ISO 8601 string or Flux duration
+        
+    Returns:
+        Flux expression for use in range()
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    nanoseconds = (value - _EPOCH) // timedelta(microseconds=1) * 1000
+    return f"time(v: {nanoseconds})"
+
+
 class InfluxDBClient:
     """
     Client for interacting with InfluxDB with version awareness and data integrity features.
@@ -152,14 +181,10 @@ class InfluxDBClient:
             List of OHLCV data points
         """
         try:
-            # Convert dates to ISO format if they are datetime objects
-            start_date_str = start_date.isoformat() if isinstance(start_date, datetime) else start_date
-            end_date_str = end_date.isoformat() if isinstance(end_date, datetime) else end_date
-            
             # Construct the Flux query
             query = f'''
             from(bucket: "{self.bucket}")
-                |> range(start: {start_date_str}, stop: {end_date_str})
+                |> range(start: {flux_time(start_date)}, stop: {flux_time(end_date)})
                 |> filter(fn: (r) => r["_measurement"] == "market_data")
                 |> filter(fn: (r) => r["instrument"] == "{instrument}")
                 |> filter(fn: (r) => r["timeframe"] == "{timeframe}")
@@ -314,13 +339,10 @@ class InfluxDBClient:
                     hour=0, minute=0, second=0, microsecond=0
                 ) - timedelta(days=30)
             
-            # Convert date to ISO format if it's a datetime object
-            reference_date_str = reference_date.isoformat() if isinstance(reference_date, datetime) else reference_date
-            
             # Query for data points with adjustment factors
             query = f'''
             from(bucket: "{self.bucket}")
-                |> range(start: {reference_date_str})
+                |> range(start: {flux_time(reference_date)})
                 |> filter(fn: (r) => r["_measurement"] == "market_data")
                 |> filter(fn: (r) => r["instrument"] == "{instrument}")
                 |> filter(fn: (r) => r["timeframe"] == "{timeframe}")
@@ -431,7 +453,7 @@ class InfluxDBClient:
             # Count actual data points
             query = f'''
             from(bucket: "{self.bucket}")
-                |> range(start: {start_date_str}, stop: {end_date_str})
+                |> range(start: {flux_time(start_date)}, stop: {flux_time(end_date)})
                 |> filter(fn: (r) => r["_measurement"] == "market_data")
                 |> filter(fn: (r) => r["instrument"] == "{instrument}")
                 |> filter(fn: (r) => r["timeframe"] == "{timeframe}")
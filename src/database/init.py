@@ -9,7 +9,7 @@ This module provides functions to initialize the various databases used in the s
 
 import os
 import sqlite3
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import logging
 
@@ -56,6 +56,69 @@ def init_sqlite(db_path: Optional[str] = None) -> bool:
         return False
 
 
+def _read_neo4j_statements(enhanced: bool = True) -> List[str]:
+    """
+    Read the Neo4j initialization script as individual Cypher statements.
+    
+    Args:
+        enhanced: Whether to read the enhanced schema script
+    
+    Returns:
+        List of Cypher statements in script order
+    """
+    script_name = "neo4j_init_enhanced.cypher" if enhanced else "neo4j_init.cypher"
+    script_path = Path(__file__).parent / "scripts" / script_name
+    
+    # Read Cypher script
+    with open(script_path, "r") as f:
+        cypher_script = f.read()
+    
+    # Split script into individual statements (naive approach, assumes each statement ends with semicolon)
+    return [stmt.strip() for stmt in cypher_script.split(";") if stmt.strip()]
+
+
+def _is_schema_statement(statement: str) -> bool:
+    """Check whether a script statement creates a constraint or index."""
+    # Drop leading comment lines before looking at the statement itself
+    lines = [line for line in statement.splitlines() if not line.strip().startswith("//")]
+    body = "\n".join(lines).lstrip().upper()
+    return body.startswith("CREATE CONSTRAINT") or body.startswith("CREATE INDEX")
+
+
+def ensure_neo4j_schema(enhanced: bool = True) -> bool:
+    """
+    Create any missing Neo4j constraints and indexes without seeding data.
+    
+    Every repository lookup matches nodes by name, so databases seeded before
+    an index was added to the init script should run this to get index seeks
+    instead of label scans. All statements use IF NOT EXISTS and are safe to
+    re-run.
+    
+    Args:
+        enhanced: Whether to take the schema from the enhanced init script
+    
+    Returns:
+        True if the schema is in place, False otherwise
+    """
+    try:
+        # Ensure connection is established
+        if db_manager.neo4j_driver is None:
+            db_manager.connect_neo4j()
+        
+        statements = [stmt for stmt in _read_neo4j_statements(enhanced) if _is_schema_statement(stmt)]
+        
+        with db_manager.neo4j_driver.session() as session:
+            for statement in statements:
+                session.run(statement)
+        
+        logger.info(f"Neo4j schema ensured ({len(statements)} constraints and indexes)")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error ensuring Neo4j schema: {e}")
+        return False
+
+
 def init_neo4j(enhanced: bool = True) -> bool:
     """
     Initialize the Neo4j database with the required schema and seed data.
@@ -72,20 +135,12 @@ def init_neo4j(enhanced: bool = True) -> bool:
         if db_manager.neo4j_driver is None:
             db_manager.connect_neo4j()
         
-        # Get the script path
         if enhanced:
-            script_path = Path(__file__).parent / "scripts" / "neo4j_init_enhanced.cypher"
             logger.info("Using enhanced Neo4j schema with comprehensive knowledge graph")
         else:
-            script_path = Path(__file__).parent / "scripts" / "neo4j_init.cypher"
             logger.info("Using basic Neo4j schema")
         
-        # Read Cypher script
-        with open(script_path, "r") as f:
-            cypher_script = f.read()
-        
-        # Split script into individual statements (naive approach, assumes each statement ends with semicolon)
-        statements = [stmt.strip() for stmt in cypher_script.split(";") if stmt.strip()]
+        statements = _read_neo4j_statements(enhanced)
         
         # Execute statements
         with db_manager.neo4j_driver.session() as session:
@@ -3,6 +3,7 @@ User repository for database operations.
 """
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+from functools import lru_cache
 
 from src.database.connection import DatabaseManager
 from src.models.user import UserInDB, UserCreate
@@ -140,4 +141,20 @@ class UserRepository:
         conn = self.db_manager.get_sqlite_connection()
         cursor = conn.cursor()
         cursor.execute(query, (now, user_id))
-        conn.commit()
\ No newline at end of file
+        conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_user_repository(db_manager: DatabaseManager) -> UserRepository:
+    """Get the user repository bound to a database manager.
+
+    The application uses a single database manager, so this returns one
+    process-lifetime repository instead of building one per request.
+
+    Args:
+        db_manager: Database manager instance
+
+    Returns:
+        User repository instance
+    """
+    return UserRepository(db_manager)
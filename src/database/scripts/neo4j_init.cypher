@@ -5,6 +5,7 @@ CREATE CONSTRAINT strategy_type_name IF NOT EXISTS FOR (s:StrategyType) REQUIRE
 CREATE CONSTRAINT instrument_symbol IF NOT EXISTS FOR (i:Instrument) REQUIRE i.symbol IS UNIQUE;
 CREATE CONSTRAINT indicator_name IF NOT EXISTS FOR (i:Indicator) REQUIRE i.name IS UNIQUE;
 CREATE CONSTRAINT strategy_id IF NOT EXISTS FOR (s:Strategy) REQUIRE s.id IS UNIQUE;
+CREATE CONSTRAINT frequency_name IF NOT EXISTS FOR (f:Frequency) REQUIRE f.name IS UNIQUE;
 CREATE INDEX strategy_user_idx IF NOT EXISTS FOR (s:Strategy) ON (s.user_id);
 CREATE INDEX condition_type_idx IF NOT EXISTS FOR (c:Condition) ON (c.type);
 
@@ -13,11 +13,14 @@ CREATE CONSTRAINT backtest_method_name IF NOT EXISTS FOR (b:BacktestMethod) REQU
 CREATE CONSTRAINT trade_management_technique_name IF NOT EXISTS FOR (t:TradeManagementTechnique) REQUIRE t.name IS UNIQUE;
 CREATE CONSTRAINT performance_metric_name IF NOT EXISTS FOR (p:PerformanceMetric) REQUIRE p.name IS UNIQUE;
 CREATE CONSTRAINT data_source_type_name IF NOT EXISTS FOR (d:DataSourceType) REQUIRE d.name IS UNIQUE;
+CREATE CONSTRAINT frequency_name IF NOT EXISTS FOR (f:Frequency) REQUIRE f.name IS UNIQUE;
+CREATE CONSTRAINT strategy_template_name IF NOT EXISTS FOR (t:StrategyTemplate) REQUIRE t.name IS UNIQUE;
 
 CREATE INDEX strategy_user_idx IF NOT EXISTS FOR (s:Strategy) ON (s.user_id);
 CREATE INDEX condition_type_idx IF NOT EXISTS FOR (c:Condition) ON (c.type);
 CREATE INDEX indicator_category_idx IF NOT EXISTS FOR (i:Indicator) ON (i.category);
 CREATE INDEX strategy_type_category_idx IF NOT EXISTS FOR (s:StrategyType) ON (s.category);
+CREATE INDEX parameter_name_idx IF NOT EXISTS FOR (p:Parameter) ON (p.name);
 
 // Create basic strategy types
 CREATE (s:StrategyType {name: "momentum", description: "Trading strategy based on price momentum", category: "trend", version: 1, suitability: "trending_markets", typical_timeframe: "medium_term"});
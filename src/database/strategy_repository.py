@@ -7,7 +7,8 @@ retrieving components, validating relationships, generating recommendations,
 and creating strategy templates.
 """
 
-from typing import Dict, List, Any, Optional, Tuple, Union
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 from enum import Enum
 import logging
 from neo4j import GraphDatabase, Session
@@ -71,6 +72,33 @@ class StrategyRepository:
             raise Exception("Failed to connect to Neo4j database")
             
         return self.driver.session()
+    
+    def session(self) -> Session:
+        """
+        Open a session on the shared Neo4j driver.
+        
+        Pass the session to repository methods that accept one so a group of
+        related queries reuses a single pooled connection.
+        
+        Returns:
+            Neo4j session, to be used as a context manager
+        """
+        return self._get_session()
+    
+    @contextmanager
+    def _session_scope(self, session: Optional[Session] = None) -> Iterator[Session]:
+        """
+        Yield the caller's session, or a new one that is closed afterwards.
+        
+        Args:
+            session: Optional session already opened by the caller
+        """
+        if session is not None:
+            yield session
+            return
+        
+        with self._get_session() as new_session:
+            yield new_session
         
     def get_components(
         self, 
@@ -181,7 +209,8 @@ class StrategyRepository:
         target_type: Union[str, ComponentType],
         relationship_type: str,
         min_compatibility: float = 0.0,
-        limit: int = 10
+        limit: int = 10,
+        session: Optional[Session] = None
     ) -> List[Dict[str, Any]]:
         """
         Get components that are compatible with a given component.
@@ -193,6 +222,7 @@ class StrategyRepository:
             relationship_type: Type of relationship to follow
             min_compatibility: Minimum compatibility score
             limit: Maximum number of results to return
+            session: Optional open session to run the query on
             
         Returns:
             List of compatible components
@@ -219,7 +249,7 @@ class StrategyRepository:
         """
         
         try:
-            with self._get_session() as session:
+            with self._session_scope(session) as session:
                 result = session.run(
                     query, 
                     source_name=source_name,
@@ -301,7 +331,8 @@ class StrategyRepository:
         self,
         strategy_type: str,
         min_strength: float = 0.7,
-        limit: int = 10
+        limit: int = 10,
+        session: Optional[Session] = None
     ) -> List[Dict[str, Any]]:
         """
         Get indicators commonly used with a specific strategy type.
@@ -310,6 +341,7 @@ class StrategyRepository:
             strategy_type: Type of strategy
             min_strength: Minimum relationship strength
             limit: Maximum number of results to return
+            session: Optional open session to run the query on
             
         Returns:
             List of indicators with compatibility scores
@@ -320,14 +352,59 @@ class StrategyRepository:
             ComponentType.INDICATOR,
             "COMMONLY_USES",
             min_strength,
-            limit
+            limit,
+            session
         )
     
+    def get_indicator_names_for_strategy_type(
+        self,
+        strategy_type: str,
+        min_strength: float = 0.7,
+        limit: int = 10,
+        session: Optional[Session] = None
+    ) -> List[str]:
+        """
+        Get the names of indicators commonly used with a strategy type.
+        
+        Reads the single name column straight off the result instead of
+        building a record dict per row.
+        
+        Args:
+            strategy_type: Type of strategy
+            min_strength: Minimum relationship strength
+            limit: Maximum number of results to return
+            session: Optional open session to run the query on
+            
+        Returns:
+            Indicator names, best match first
+        """
+        query = """
+        MATCH (:StrategyType {name: $strategy_type})-[r:COMMONLY_USES]->(i:Indicator)
+        WHERE r.compatibility >= $min_strength OR r.strength >= $min_strength
+        RETURN i.name as name
+        ORDER BY COALESCE(r.compatibility, r.strength) DESC
+        LIMIT $limit
+        """
+        
+        try:
+            with self._session_scope(session) as session:
+                result = session.run(
+                    query,
+                    strategy_type=strategy_type,
+                    min_strength=min_strength,
+                    limit=limit
+                )
+                return result.value("name")
+        except Exception as e:
+            logger.error(f"Error retrieving indicator names for strategy type: {e}")
+            return []
+    
     def get_position_sizing_for_strategy_type(
         self,
         strategy_type: str,
         min_compatibility: float = 0.7,
-        limit: int = 5
+        limit: int = 5,
+        session: Optional[Session] = None
     ) -> List[Dict[str, Any]]:
         """
         Get position sizing methods suitable for a specific strategy type.
@@ -336,6 +413,7 @@ class StrategyRepository:
             strategy_type: Type of strategy
             min_compatibility: Minimum compatibility score
             limit: Maximum number of results to return
+            session: Optional open session to run the query on
             
         Returns:
             List of position sizing methods with compatibility scores
@@ -346,14 +424,16 @@ class StrategyRepository:
             ComponentType.POSITION_SIZING,
             "SUITABLE_SIZING",
             min_compatibility,
-            limit
+            limit,
+            session
         )
     
     def get_risk_management_for_strategy_type(
         self,
         strategy_type: str,
         min_compatibility: float = 0.7,
-        limit: int = 5
+        limit: int = 5,
+        session: Optional[Session] = None
     ) -> List[Dict[str, Any]]:
         """
         Get risk management techniques suitable for a specific strategy type.
@@ -362,6 +442,7 @@ class StrategyRepository:
             strategy_type: Type of strategy
             min_compatibility: Minimum compatibility score
             limit: Maximum number of results to return
+            session: Optional open session to run the query on
             
         Returns:
             List of risk management techniques with compatibility scores
@@ -372,14 +453,16 @@ class StrategyRepository:
             ComponentType.RISK_MANAGEMENT,
             "SUITABLE_RISK_MANAGEMENT",
             min_compatibility,
-            limit
+            limit,
+            session
         )
     
     def get_trade_management_for_strategy_type(
         self,
         strategy_type: str,
         min_compatibility: float = 0.7,
-        limit: int = 5
+        limit: int = 5,
+        session: Optional[Session] = None
     ) -> List[Dict[str, Any]]:
         """
         Get trade management techniques suitable for a specific strategy type.
@@ -388,6 +471,7 @@ class StrategyRepository:
             strategy_type: Type of strategy
             min_compatibility: Minimum compatibility score
             limit: Maximum number of results to return
+            session: Optional open session to run the query on
             
         Returns:
             List of trade management techniques with compatibility scores
@@ -398,14 +482,16 @@ class StrategyRepository:
             ComponentType.TRADE_MANAGEMENT,
             "SUITABLE_TRADE_MANAGEMENT",
             min_compatibility,
-            limit
+            limit,
+            session
         )
     
     def get_backtest_methods_for_strategy_type(
         self,
         strategy_type: str,
         min_compatibility: float = 0.7,
-        limit: int = 5
+        limit: int = 5,
+        session: Optional[Session] = None
     ) -> List[Dict[str, Any]]:
         """
         Get backtesting methods suitable for a specific strategy type.
@@ -414,6 +500,7 @@ class StrategyRepository:
             strategy_type: Type of strategy
             min_compatibility: Minimum compatibility score
             limit: Maximum number of results to return
+            session: Optional open session to run the query on
             
         Returns:
             List of backtesting methods with compatibility scores
@@ -424,14 +511,16 @@ class StrategyRepository:
             ComponentType.BACKTEST_METHOD,
             "SUITABLE_BACKTESTING",
             min_compatibility,
-            limit
+            limit,
+            session
         )
     
     def get_performance_metrics_for_strategy_type(
         self,
         strategy_type: str,
         min_compatibility: float = 0.7,
-        limit: int = 5
+        limit: int = 5,
+        session: Optional[Session] = None
     ) -> List[Dict[str, Any]]:
         """
         Get performance metrics suitable for a specific strategy type.
@@ -440,6 +529,7 @@ class StrategyRepository:
             strategy_type: Type of strategy
             min_compatibility: Minimum compatibility score
             limit: Maximum number of results to return
+            session: Optional open session to run the query on
             
         Returns:
             List of performance metrics with compatibility scores
@@ -450,9 +540,98 @@ class StrategyRepository:
             ComponentType.PERFORMANCE_METRIC,
             "SUITABLE_METRIC",
             min_compatibility,
-            limit
+            limit,
+            session
         )
     
+    def get_recommendations_bundle(
+        self,
+        strategy_type: str,
+        min_strength: float = 0.7,
+        min_compatibility: float = 0.7,
+        indicator_limit: int = 3,
+        position_sizing_limit: int = 1,
+        risk_management_limit: int = 2
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get recommended indicators, position sizing and risk management for a
+        strategy type in a single query.
+        
+        Equivalent to calling get_indicators_for_strategy_type,
+        get_position_sizing_for_strategy_type and
+        get_risk_management_for_strategy_type, but with one round-trip.
+        
+        Args:
+            strategy_type: Type of strategy
+            min_strength: Minimum indicator relationship strength
+            min_compatibility: Minimum position sizing / risk management compatibility
+            indicator_limit: Maximum number of indicators to return
+            position_sizing_limit: Maximum number of position sizing methods to return
+            risk_management_limit: Maximum number of risk management techniques to return
+            
+        Returns:
+            Dictionary with "indicators", "position_sizing" and "risk_management"
+            lists, each ordered by compatibility score
+        """
+        query = """
+        MATCH (st:StrategyType {name: $strategy_type})
+        OPTIONAL MATCH (st)-[r1:COMMONLY_USES]->(i:Indicator)
+        WHERE r1.compatibility >= $min_strength OR r1.strength >= $min_strength
+        WITH st, i, r1
+        ORDER BY COALESCE(r1.compatibility, r1.strength) DESC
+        WITH st, collect(CASE WHEN i IS NULL THEN NULL ELSE {
+            name: i.name,
+            compatibility_score: COALESCE(r1.compatibility, r1.strength),
+            explanation: COALESCE(r1.explanation, '')
+        } END)[..$indicator_limit] as indicators
+        OPTIONAL MATCH (st)-[r2:SUITABLE_SIZING]->(p:PositionSizingMethod)
+        WHERE r2.compatibility >= $min_compatibility OR r2.strength >= $min_compatibility
+        WITH st, indicators, p, r2
+        ORDER BY COALESCE(r2.compatibility, r2.strength) DESC
+        WITH st, indicators, collect(CASE WHEN p IS NULL THEN NULL ELSE {
+            name: p.name,
+            compatibility_score: COALESCE(r2.compatibility, r2.strength),
+            explanation: COALESCE(r2.explanation, '')
+        } END)[..$position_sizing_limit] as position_sizing
+        OPTIONAL MATCH (st)-[r3:SUITABLE_RISK_MANAGEMENT]->(rm:RiskManagementTechnique)
+        WHERE r3.compatibility >= $min_compatibility OR r3.strength >= $min_compatibility
+        WITH indicators, position_sizing, rm, r3
+        ORDER BY COALESCE(r3.compatibility, r3.strength) DESC
+        RETURN indicators,
+               position_sizing,
+               collect(CASE WHEN rm IS NULL THEN NULL ELSE {
+                   name: rm.name,
+                   compatibility_score: COALESCE(r3.compatibility, r3.strength),
+                   explanation: COALESCE(r3.explanation, '')
+               } END)[..$risk_management_limit] as risk_management
+        """
+        
+        bundle = {
+            "indicators": [],
+            "position_sizing": [],
+            "risk_management": []
+        }
+        
+        try:
+            with self._get_session() as session:
+                record = session.run(
+                    query,
+                    strategy_type=strategy_type,
+                    min_strength=min_strength,
+                    min_compatibility=min_compatibility,
+                    indicator_limit=indicator_limit,
+                    position_sizing_limit=position_sizing_limit,
+                    risk_management_limit=risk_management_limit
+                ).single()
+                
+                if record:
+                    for key in bundle:
+                        bundle[key] = [dict(item) for item in record[key]]
+                return bundle
+        except Exception as e:
+            logger.error(f"Error retrieving recommendations for {strategy_type}: {e}")
+            return bundle
+    
     def get_parameters_for_indicator(
         self,
         indicator_name: str
@@ -499,6 +678,59 @@ class StrategyRepository:
             logger.error(f"Error retrieving parameters for indicator {indicator_name}: {e}")
             return []
     
+    def get_parameters_for_indicators(
+        self,
+        indicator_names: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get parameters for several indicators in a single query.
+        
+        Args:
+            indicator_names: Names of the indicators
+            
+        Returns:
+            Dictionary mapping each indicator name to its parameters, in the same
+            format as get_parameters_for_indicator
+        """
+        parameters_by_indicator = {name: [] for name in indicator_names}
+        if not indicator_names:
+            return parameters_by_indicator
+        
+        query = """
+        UNWIND $indicator_names as indicator_name
+        MATCH (i:Indicator {name: indicator_name})-[r:HAS_PARAMETER]->(p:Parameter)
+        RETURN indicator_name,
+               p.name as name, 
+               p.default_value as param_default_value,
+               p.min_value as min_value,
+               p.max_value as max_value,
+               p.type as type,
+               p.description as description,
+               r.is_required as is_required, 
+               r.default_value as default_value, 
+               r.explanation as explanation
+        """
+        
+        try:
+            with self._get_session() as session:
+                result = session.run(query, indicator_names=list(indicator_names))
+                for record in result:
+                    # Convert record to dict
+                    parameter = dict(record)
+                    indicator_name = parameter.pop("indicator_name")
+                    # Use relationship default_value if available, otherwise use parameter's default_value
+                    if parameter.get("default_value") is None and parameter.get("param_default_value") is not None:
+                        parameter["default_value"] = parameter["param_default_value"]
+                    if "param_default_value" in parameter:
+                        del parameter["param_default_value"]
+                    # Remove None values
+                    cleaned = {k: v for k, v in parameter.items() if v is not None}
+                    parameters_by_indicator[indicator_name].append(cleaned)
+                return parameters_by_indicator
+        except Exception as e:
+            logger.error(f"Error retrieving parameters for indicators {indicator_names}: {e}")
+            return {name: [] for name in indicator_names}
+    
     def get_compatible_frequencies_for_instrument(
         self,
         instrument_symbol: str,
@@ -818,29 +1050,31 @@ class StrategyRepository:
         """
         # Get relevant data from knowledge graph
         try:
-            # Get indicators
-            indicators = self.get_indicators_for_strategy_type(strategy_type, min_strength=0.7)
-            indicator_names = [i["name"] for i in indicators]
-            
-            # Get position sizing
-            position_sizing = self.get_position_sizing_for_strategy_type(strategy_type)
-            ps_name = position_sizing[0]["name"] if position_sizing else "percent"
-            
-            # Get risk management
-            risk_management = self.get_risk_management_for_strategy_type(strategy_type)
-            rm_names = [r["name"] for r in risk_management][:2]  # Top 2
-            
-            # Get trade management
-            trade_management = self.get_trade_management_for_strategy_type(strategy_type)
-            tm_names = [t["name"] for t in trade_management][:2]  # Top 2
-            
-            # Get performance metrics
-            metrics = self.get_performance_metrics_for_strategy_type(strategy_type)
-            metric_names = [m["name"] for m in metrics][:3]  # Top 3
-            
-            # Get backtest method
-            backtest_methods = self.get_backtest_methods_for_strategy_type(strategy_type)
-            bt_method = backtest_methods[0]["name"] if backtest_methods else "simple"
+            # Run all component queries on one pooled connection
+            with self.session() as session:
+                # Get indicators
+                indicators = self.get_indicators_for_strategy_type(strategy_type, min_strength=0.7, session=session)
+                indicator_names = [i["name"] for i in indicators]
+                
+                # Get position sizing
+                position_sizing = self.get_position_sizing_for_strategy_type(strategy_type, session=session)
+                ps_name = position_sizing[0]["name"] if position_sizing else "percent"
+                
+                # Get risk management
+                risk_management = self.get_risk_management_for_strategy_type(strategy_type, session=session)
+                rm_names = [r["name"] for r in risk_management][:2]  # Top 2
+                
+                # Get trade management
+                trade_management = self.get_trade_management_for_strategy_type(strategy_type, session=session)
+                tm_names = [t["name"] for t in trade_management][:2]  # Top 2
+                
+                # Get performance metrics
+                metrics = self.get_performance_metrics_for_strategy_type(strategy_type, session=session)
+                metric_names = [m["name"] for m in metrics][:3]  # Top 3
+                
+                # Get backtest method
+                backtest_methods = self.get_backtest_methods_for_strategy_type(strategy_type, session=session)
+                bt_method = backtest_methods[0]["name"] if backtest_methods else "simple"
             
             # Build template
             template = {
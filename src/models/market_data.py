@@ -5,12 +5,19 @@ This module provides Pydantic models for market data with support for OHLCV data
 metadata, and audit information.
 """
 
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Dict, List, Optional, Union, Any, Set
+from pydantic import BaseModel, Field, StringConstraints, field_validator, model_validator
+from typing import Annotated, Dict, List, Optional, Union, Any, Set
 from datetime import datetime
 from enum import Enum
 
 
+# Identifiers accepted from API requests. They end up inside Flux string
+# literals, so quotes, backslashes and whitespace are rejected up front.
+Instrument = Annotated[str, StringConstraints(pattern=r"^[A-Za-z0-9./:=^_-]{1,32}$")]
+Timeframe = Annotated[str, StringConstraints(pattern=r"^[1-9][0-9]{0,2}(m|h|d|w|M)$")]
+Version = Annotated[str, StringConstraints(pattern=r"^[A-Za-z0-9._:-]{1,64}$")]
+
+
 class DataPointSource(str, Enum):
     """Enumeration of possible data point sources."""
     INFLUXDB = "influxdb"
@@ -177,26 +184,28 @@ class MarketDataRequest(BaseModel):
     This represents a request for market data, including the instrument,
     timeframe, date range, and version.
     """
-    instrument: str
-    timeframe: str
-    start_date: Union[str, datetime]
-    end_date: Union[str, datetime]
-    version: str = "latest"
+    instrument: Instrument
+    timeframe: Timeframe
+    # Parsed once here so services and queries receive datetimes
+    start_date: datetime
+    end_date: datetime
+    version: Version = "latest"
     include_metadata: bool = False
     
     @model_validator(mode='after')
     def validate_dates(self):
         """Validate that end_date is after start_date."""
-        # Convert string dates to datetime for comparison
-        start = self.start_date
-        if isinstance(start, str):
-            start = datetime.fromisoformat(start)
-            
-        end = self.end_date
-        if isinstance(end, str):
-            end = datetime.fromisoformat(end)
-            
-        if end <= start:
+        if self.end_date <= self.start_date:
             raise ValueError("End date must be after start date")
         
-        return self
\ No newline at end of file
+        return self
+
+class HistoricalIndicatorsRequest(MarketDataRequest):
+    """
+    Model for calculating indicators over stored market data.
+    
+    Carries the market data request and the indicator configurations in one
+    body, so the request is validated in a single pass and can be passed to
+    the retrieval service as is.
+    """
+    indicators: List[Dict[str, Any]]
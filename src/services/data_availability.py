@@ -5,6 +5,7 @@ This module provides services for checking data availability, identifying
 missing data segments, and verifying data integrity.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union, Any, Tuple
@@ -99,8 +100,10 @@ class DataAvailabilityService:
         Returns:
             List of missing data segments with start and end dates
         """
-        # Get the data to analyze gaps
-        data = self.influxdb.query_ohlcv(
+        # Get the data to analyze gaps; the query is synchronous, so it runs on
+        # a thread and callers can overlap it with other queries
+        data = await asyncio.to_thread(
+            self.influxdb.query_ohlcv,
             instrument=request.instrument,
             timeframe=request.timeframe,
             start_date=request.start_date,
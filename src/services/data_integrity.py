@@ -5,16 +5,17 @@ This module provides services for detecting data discrepancies, corporate action
 and implementing data correction workflows to ensure data integrity.
 """
 
+import asyncio
 import logging
 import json
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any, Tuple, Set
+from typing import Dict, Iterable, List, Literal, Optional, Union, Any, Tuple, Set, get_args
 import numpy as np
 import pandas as pd
 from enum import Enum
 
-from ..database.influxdb import InfluxDBClient
+from ..database.influxdb import InfluxDBClient, flux_time
 from ..models.market_data import (
     OHLCV, 
     OHLCVPoint, 
@@ -26,6 +27,12 @@ from .data_versioning import DataVersioningService
 
 logger = logging.getLogger(__name__)
 
+# Checks available from DataIntegrityService.integrity_report. Quality runs
+# first: the detectors add derived columns to the shared frame, which would
+# otherwise show up in its null value counts.
+IntegrityCheck = Literal["quality", "anomalies", "corporate_actions"]
+INTEGRITY_CHECKS: Tuple[str, ...] = get_args(IntegrityCheck)
+
 
 class AdjustmentType(str, Enum):
     """Types of adjustments that can be detected in market data."""
@@ -106,6 +113,88 @@ class DataIntegrityService:
             "min_data_points": 30
         }
     
+    async def integrity_report(self,
+                               instrument: str,
+                               timeframe: str,
+                               start_date: Union[datetime, str],
+                               end_date: Union[datetime, str],
+                               version: str = "latest",
+                               checks: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Run several integrity checks over a single query of market data.
+        
+        The anomaly, corporate action and quality checks all analyze the same
+        OHLCV window, so the data is queried and converted to a DataFrame once
+        and shared between them.
+        
+        Args:
+            instrument: The instrument symbol
+            timeframe: The timeframe
+            start_date: The start date
+            end_date: The end date
+            version: The data version to analyze
+            checks: The checks to run, defaults to all of INTEGRITY_CHECKS
+            
+        Returns:
+            Dict mapping each requested check to its result, in the same form
+            as detect_anomalies, detect_corporate_actions and verify_data_quality
+            
+        Raises:
+            ValueError: If an unknown check is requested
+        """
+        requested = set(INTEGRITY_CHECKS if checks is None else checks)
+        unknown = requested.difference(INTEGRITY_CHECKS)
+        if unknown:
+            raise ValueError(f"Unknown integrity checks: {', '.join(sorted(unknown))}")
+        
+        selected = [check for check in INTEGRITY_CHECKS if check in requested]
+        try:
+            df = await self._load_frame(instrument, timeframe, start_date, end_date, version)
+        except Exception as e:
+            logger.error(f"Error retrieving data for integrity checks: {e}")
+            report = {}
+            for check in selected:
+                report[check] = {"instrument": instrument, "timeframe": timeframe, "error": str(e)}
+                if check == "quality":
+                    report[check]["status"] = "error"
+            return report
+        
+        run_check = {
+            "quality": self._quality_from_frame,
+            "anomalies": self._anomalies_from_frame,
+            "corporate_actions": self._corporate_actions_from_frame
+        }
+        return {
+            check: run_check[check](df, instrument, timeframe, start_date, end_date, version)
+            for check in selected
+        }
+    
+    async def _load_frame(self,
+                          instrument: str,
+                          timeframe: str,
+                          start_date: Union[datetime, str],
+                          end_date: Union[datetime, str],
+                          version: str) -> Optional[pd.DataFrame]:
+        """
+        Query market data for analysis without blocking the event loop.
+        
+        Returns:
+            The data as a DataFrame sorted by timestamp, or None if there is no data
+        """
+        data = await asyncio.to_thread(
+            self.influxdb.query_ohlcv,
+            instrument=instrument,
+            timeframe=timeframe,
+            start_date=start_date,
+            end_date=end_date,
+            version=version
+        )
+        if not data:
+            return None
+        
+        df = pd.DataFrame(data)
+        return df.sort_values("timestamp")
+    
     async def detect_anomalies(self,
                              instrument: str,
                              timeframe: str,
@@ -125,19 +214,36 @@ class DataIntegrityService:
         Returns:
             Dict containing detected anomalies with categorization and confidence scores
         """
-        try:
-            # Retrieve data for analysis
-            data = self.influxdb.query_ohlcv(
-                instrument=instrument,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date,
-                version=version
-            )
+        report = await self.integrity_report(
+            instrument, timeframe, start_date, end_date, version, checks=["anomalies"]
+        )
+        return report["anomalies"]
+    
+    def _anomalies_from_frame(self,
+                              df: Optional[pd.DataFrame],
+                              instrument: str,
+                              timeframe: str,
+                              start_date: Union[datetime, str],
+                              end_date: Union[datetime, str],
+                              version: str) -> Dict[str, Any]:
+        """
+        Run the anomaly detectors over already loaded market data.
+        
+        Args:
+            df: The data sorted by timestamp, or None if there is no data
+            instrument: The instrument symbol
+            timeframe: The timeframe
+            start_date: The start date
+            end_date: The end date
+            version: The analyzed data version
             
-            if not data or len(data) < self.config["min_data_points"]:
+        Returns:
+            Dict containing detected anomalies with categorization and confidence scores
+        """
+        try:
+            if df is None or len(df) < self.config["min_data_points"]:
                 logger.warning(
-                    f"Insufficient data points ({len(data) if data else 0}) for "
+                    f"Insufficient data points ({len(df) if df is not None else 0}) for "
                     f"reliable anomaly detection. Minimum required: {self.config['min_data_points']}"
                 )
                 return {
@@ -150,10 +256,6 @@ class DataIntegrityService:
                     "warning": "Insufficient data points for reliable analysis"
                 }
             
-            # Convert to pandas DataFrame for analysis
-            df = pd.DataFrame(data)
-            df = df.sort_values("timestamp")
-            
             # Calculate metrics for anomaly detection
             anomalies = []
             
@@ -442,19 +544,36 @@ class DataIntegrityService:
         Returns:
             Dict containing detected corporate actions with confidence scores
         """
-        try:
-            # Retrieve data for analysis
-            data = self.influxdb.query_ohlcv(
-                instrument=instrument,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date,
-                version=version
-            )
+        report = await self.integrity_report(
+            instrument, timeframe, start_date, end_date, version, checks=["corporate_actions"]
+        )
+        return report["corporate_actions"]
+    
+    def _corporate_actions_from_frame(self,
+                              df: Optional[pd.DataFrame],
+                              instrument: str,
+                              timeframe: str,
+                              start_date: Union[datetime, str],
+                              end_date: Union[datetime, str],
+                              version: str) -> Dict[str, Any]:
+        """
+        Run the corporate action detectors over already loaded market data.
+        
+        Args:
+            df: The data sorted by timestamp, or None if there is no data
+            instrument: The instrument symbol
+            timeframe: The timeframe
+            start_date: The start date
+            end_date: The end date
+            version: The analyzed data version
             
-            if not data or len(data) < self.config["min_data_points"]:
+        Returns:
+            Dict containing detected corporate actions with confidence scores
+        """
+        try:
+            if df is None or len(df) < self.config["min_data_points"]:
                 logger.warning(
-                    f"Insufficient data points ({len(data) if data else 0}) for "
+                    f"Insufficient data points ({len(df) if df is not None else 0}) for "
                     f"reliable corporate action detection. Minimum required: {self.config['min_data_points']}"
                 )
                 return {
@@ -464,10 +583,6 @@ class DataIntegrityService:
                     "warning": "Insufficient data points for reliable analysis"
                 }
             
-            # Convert to pandas DataFrame for analysis
-            df = pd.DataFrame(data)
-            df = df.sort_values("timestamp")
-            
             # Run specialized detection algorithms
             corporate_actions = []
             
@@ -737,14 +852,10 @@ class DataIntegrityService:
             if not end_date:
                 end_date = datetime.now()
                 
-            # Convert dates to ISO format if they are datetime objects
-            start_date_str = start_date.isoformat() if isinstance(start_date, datetime) else start_date
-            end_date_str = end_date.isoformat() if isinstance(end_date, datetime) else end_date
-            
             # Build the query with filters
             query = f'''
             from(bucket: "{self.influxdb.audit_bucket}")
-                |> range(start: {start_date_str}, stop: {end_date_str})
+                |> range(start: {flux_time(start_date)}, stop: {flux_time(end_date)})
                 |> filter(fn: (r) => r["_measurement"] == "data_adjustments")
             '''
             
@@ -828,17 +939,34 @@ class DataIntegrityService:
         Returns:
             Dict containing quality metrics and identified issues
         """
-        try:
-            # Get data for quality verification
-            data = self.influxdb.query_ohlcv(
-                instrument=instrument,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date,
-                version=version
-            )
+        report = await self.integrity_report(
+            instrument, timeframe, start_date, end_date, version, checks=["quality"]
+        )
+        return report["quality"]
+    
+    def _quality_from_frame(self,
+                              df: Optional[pd.DataFrame],
+                              instrument: str,
+                              timeframe: str,
+                              start_date: Union[datetime, str],
+                              end_date: Union[datetime, str],
+                              version: str) -> Dict[str, Any]:
+        """
+        Assess the quality of already loaded market data.
+        
+        Args:
+            df: The data sorted by timestamp, or None if there is no data
+            instrument: The instrument symbol
+            timeframe: The timeframe
+            start_date: The start date
+            end_date: The end date
+            version: The analyzed data version
             
-            if not data:
+        Returns:
+            Dict containing quality metrics and identified issues
+        """
+        try:
+            if df is None:
                 logger.warning(f"No data found for quality assessment for {instrument}/{timeframe}")
                 return {
                     "instrument": instrument,
@@ -848,10 +976,6 @@ class DataIntegrityService:
                     "reason": "No data available for assessment"
                 }
             
-            # Convert to pandas DataFrame for analysis
-            df = pd.DataFrame(data)
-            df = df.sort_values("timestamp")
-            
             # Calculate expected data points based on timeframe
             timeframe_mins = self._get_timeframe_duration_minutes(timeframe)
             expected_points = self._calculate_expected_points(
@@ -145,16 +145,7 @@ class DataRetrievalService:
                 
                 if data:
                     logger.info(f"Retrieved {len(data)} data points from InfluxDB for {instrument}/{timeframe}")
-                    return OHLCV(
-                        instrument=instrument,
-                        timeframe=timeframe,
-                        source=source_type,
-                        version=version,
-                        is_adjusted=any("adjustment_factor" in point for point in data),
-                        data=[
-                            OHLCVPoint(**point) for point in data
-                        ]
-                    )
+                    return self._to_ohlcv(data, instrument, timeframe, source_type, version)
             
             # For external data sources, use the appropriate connector
             elif source_type.lower() == DataSourceType.BINANCE.value.lower():
@@ -173,6 +164,49 @@ class DataRetrievalService:
         logger.warning(f"No data found for {instrument}/{timeframe} in any configured source")
         return None
         
+    async def get_ohlcv_data(self, request: MarketDataRequest) -> Optional[OHLCV]:
+        """
+        Get stored OHLCV data for a market data request.
+        
+        Reads InfluxDB only, with a single pivoted query for all fields run
+        off the event loop.
+        
+        Args:
+            request: The market data request
+            
+        Returns:
+            OHLCV object with the stored data, or None if there is none
+        """
+        data = await asyncio.to_thread(
+            self.influxdb.query_ohlcv,
+            instrument=request.instrument,
+            timeframe=request.timeframe,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            version=request.version
+        )
+        
+        if not data:
+            return None
+        
+        return self._to_ohlcv(
+            data, request.instrument, request.timeframe, DataSourceType.INFLUXDB.value, request.version
+        )
+    
+    def _to_ohlcv(self, data: List[Dict[str, Any]], instrument: str, timeframe: str,
+                  source: str, version: str) -> OHLCV:
+        """Build an OHLCV object from InfluxDB data points."""
+        return OHLCV(
+            instrument=instrument,
+            timeframe=timeframe,
+            source=source,
+            version=version,
+            is_adjusted=any("adjustment_factor" in point for point in data),
+            data=[
+                OHLCVPoint(**point) for point in data
+            ]
+        )
+    
     async def _get_from_connector(self,
                                connector_type: str,
                                source: Any,
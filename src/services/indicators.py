@@ -17,8 +17,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Union, Any, Callable, Tuple
 import hashlib
 import json
+import threading
 from enum import Enum
-from functools import lru_cache
 import warnings
 
 from ..models.market_data import OHLCV, OHLCVPoint
@@ -98,27 +98,21 @@ class IndicatorService:
         Args:
             cache_enabled: Whether to enable in-memory caching
             max_cache_size: Maximum number of cached calculations
-            optimize: Whether to use optimized calculation methods
+            optimize: Deprecated, has no effect; kept for existing callers
             validate_params: Whether to validate indicator parameters
         """
         self._cache_enabled = cache_enabled
         self._max_cache_size = max_cache_size
         self._cache = {}
         self._cache_keys = []  # Used for LRU cache management
-        self._optimize = optimize
+        self._cache_lock = threading.RLock()  # Guards the cache for threaded callers
         self._validate_params = validate_params
         
         # Indicator metadata with default parameters
         self._indicator_metadata = self._initialize_indicator_metadata()
         
-        # Initialize LRU cache for pandas operations
-        if self._optimize:
-            # Apply LRU cache to expensive operations
-            self._optimize_pandas_operations()
-            logger.info("Optimized pandas operations enabled")
-            
         logger.debug(f"IndicatorService initialized: cache_enabled={cache_enabled}, "
-                    f"max_cache_size={max_cache_size}, optimize={optimize}, "
+                    f"max_cache_size={max_cache_size}, "
                     f"validate_params={validate_params}")
             
     def _initialize_indicator_metadata(self) -> Dict[str, Dict[str, Any]]:
@@ -305,11 +299,9 @@ class IndicatorService:
             # Check cache first if enabled
             if self._cache_enabled:
                 cache_key = self._generate_cache_key(indicator_type, ohlcv_data, merged_params)
-                if cache_key in self._cache:
-                    # Update cache order for LRU
-                    self._cache_keys.remove(cache_key)
-                    self._cache_keys.append(cache_key)
-                    return self._cache[cache_key]
+                cached = self._get_from_cache(cache_key)
+                if cached is not None:
+                    return cached
             
             # Convert OHLCV data to pandas DataFrame for calculations
             df = self._convert_to_dataframe(ohlcv_data)
@@ -353,6 +345,26 @@ class IndicatorService:
             logger.error(f"Error calculating {indicator_type}: {e}")
             return {"error": str(e)}
     
+    @staticmethod
+    def calculate_multiple_indicators_static(ohlcv_data: OHLCV,
+                                             indicators_config: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Calculate multiple indicators with the per-process shared service.
+        
+        Takes and returns only picklable values, so it can run in a process
+        pool for CPU-bound requests. Each worker keeps one service, and with it
+        its calculation cache, for its whole lifetime.
+        
+        Args:
+            ohlcv_data: The OHLCV data
+            indicators_config: List of indicator configurations, as for
+                               calculate_multiple_indicators
+            
+        Returns:
+            Dict containing all calculated indicators with the specified names as keys
+        """
+        return get_process_indicator_service().calculate_multiple_indicators(ohlcv_data, indicators_config)
+    
     def calculate_multiple_indicators(self, ohlcv_data: OHLCV,
                                     indicators_config: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -377,6 +389,9 @@ class IndicatorService:
             # Convert data to DataFrame once for all calculations
             df = self._convert_to_dataframe(ohlcv_data)
             
+            # The date range scans every point, so it is found once per batch
+            data_range = self._data_range(ohlcv_data)
+            
             # Calculate each indicator
             for config in indicators_config:
                 indicator_type = config.get("type", "").lower()
@@ -407,12 +422,10 @@ class IndicatorService:
                 # Check cache first if enabled
                 cache_hit = False
                 if self._cache_enabled:
-                    cache_key = self._generate_cache_key(indicator_type, ohlcv_data, merged_params)
-                    if cache_key in self._cache:
-                        results[name] = self._cache[cache_key]
-                        # Update cache order for LRU
-                        self._cache_keys.remove(cache_key)
-                        self._cache_keys.append(cache_key)
+                    cache_key = self._generate_cache_key(indicator_type, ohlcv_data, merged_params, data_range)
+                    cached = self._get_from_cache(cache_key)
+                    if cached is not None:
+                        results[name] = cached
                         cache_hit = True
                 
                 if not cache_hit:
@@ -434,9 +447,9 @@ class IndicatorService:
                             "instrument": ohlcv_data.instrument,
                             "timeframe": ohlcv_data.timeframe,
                             "calculation_time": datetime.now().isoformat(),
-                            "data_points": len(ohlcv_data.data),
-                            "data_start": ohlcv_data.start_date.isoformat() if ohlcv_data.start_date else None,
-                            "data_end": ohlcv_data.end_date.isoformat() if ohlcv_data.end_date else None
+                            "data_points": data_range["data_points"],
+                            "data_start": data_range["start_date"],
+                            "data_end": data_range["end_date"]
                         }
                         
                         # Add category if available
@@ -451,7 +464,7 @@ class IndicatorService:
                         
                         # Cache the result if enabled
                         if self._cache_enabled:
-                            cache_key = self._generate_cache_key(indicator_type, ohlcv_data, merged_params)
+                            cache_key = self._generate_cache_key(indicator_type, ohlcv_data, merged_params, data_range)
                             self._add_to_cache(cache_key, result)
                     
                     except Exception as e:
@@ -480,34 +493,23 @@ class IndicatorService:
         Returns:
             pandas DataFrame with OHLCV data
         """
-        # Extract data points as dictionaries
-        data_dicts = [
+        # Build each column as a float64 array in one pass rather than going
+        # through a dict per point; the TA-Lib kernels read these arrays as is
+        points = ohlcv_data.data
+        count = len(points)
+        df = pd.DataFrame(
             {
-                "timestamp": p.timestamp,
-                "open": float(p.open),
-                "high": float(p.high),
-                "low": float(p.low),
-                "close": float(p.close),
-                "volume": float(p.volume)
-            }
-            for p in ohlcv_data.data
-        ]
-        
-        df = pd.DataFrame(data_dicts)
+                field: np.fromiter((getattr(p, field) for p in points), dtype=np.float64, count=count)
+                for field in ("open", "high", "low", "close", "volume")
+            },
+            index=pd.DatetimeIndex([p.timestamp for p in points], name="timestamp")
+        )
         
-        # Set timestamp as index
-        if len(df) > 0:
-            df.set_index("timestamp", inplace=True)
+        if count > 0:
             df.sort_index(inplace=True)
         
         return df
     
-    def _optimize_pandas_operations(self):
-        """Apply LRU caching to expensive pandas operations."""
-        # Apply lru_cache to expensive pandas operations
-        pd.Series.rolling = lru_cache(maxsize=32)(pd.Series.rolling)
-        pd.Series.ewm = lru_cache(maxsize=32)(pd.Series.ewm)
-        
     def get_available_indicators(self) -> Dict[str, Any]:
         """
         Get a list of all available indicators with metadata.
@@ -611,8 +613,28 @@ class IndicatorService:
         else:
             raise ValueError(f"Invalid source: {source}")
     
+    def _data_range(self, ohlcv_data: OHLCV) -> Dict[str, Any]:
+        """
+        Get the date range and size of OHLCV data.
+        
+        Args:
+            ohlcv_data: The OHLCV data
+            
+        Returns:
+            Dict with ISO "start_date" and "end_date" (None when empty) and
+            "data_points"
+        """
+        start_date = ohlcv_data.start_date
+        end_date = ohlcv_data.end_date
+        return {
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+            "data_points": len(ohlcv_data.data)
+        }
+    
     def _generate_cache_key(self, indicator_type: str, ohlcv_data: OHLCV,
-                          parameters: Dict[str, Any]) -> str:
+                          parameters: Dict[str, Any],
+                          data_range: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate a cache key for indicator calculation.
         
@@ -620,6 +642,7 @@ class IndicatorService:
             indicator_type: The type of indicator
             ohlcv_data: The OHLCV data
             parameters: Parameters for the indicator calculation
+            data_range: The data's range from _data_range, computed if not given
             
         Returns:
             Cache key string
@@ -644,9 +667,7 @@ class IndicatorService:
             "parameters": serializable_params,
             "instrument": ohlcv_data.instrument,
             "timeframe": ohlcv_data.timeframe,
-            "start_date": ohlcv_data.start_date.isoformat() if ohlcv_data.start_date else None,
-            "end_date": ohlcv_data.end_date.isoformat() if ohlcv_data.end_date else None,
-            "data_points": len(ohlcv_data.data)
+            **(data_range or self._data_range(ohlcv_data))
         }
         
         # Generate a hash of the key data
@@ -661,15 +682,34 @@ class IndicatorService:
             key: The cache key
             value: The indicator calculation result
         """
-        # If cache is full, remove the least recently used item
-        if len(self._cache) >= self._max_cache_size and self._cache_keys:
-            lru_key = self._cache_keys.pop(0)
-            if lru_key in self._cache:
-                del self._cache[lru_key]
+        with self._cache_lock:
+            # If cache is full, remove the least recently used item
+            if len(self._cache) >= self._max_cache_size and self._cache_keys:
+                lru_key = self._cache_keys.pop(0)
+                if lru_key in self._cache:
+                    del self._cache[lru_key]
+            
+            # Add new item to cache
+            self._cache[key] = value
+            self._cache_keys.append(key)
+    
+    def _get_from_cache(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached indicator calculation and mark it as recently used.
         
-        # Add new item to cache
-        self._cache[key] = value
-        self._cache_keys.append(key)
+        Args:
+            key: The cache key
+            
+        Returns:
+            The cached result, or None if the key is not cached
+        """
+        with self._cache_lock:
+            if key not in self._cache:
+                return None
+            # Update cache order for LRU
+            self._cache_keys.remove(key)
+            self._cache_keys.append(key)
+            return self._cache[key]
     
     def _get_indicator_function(self, indicator_type: str) -> Optional[Callable]:
         """
@@ -1748,4 +1788,51 @@ class IndicatorService:
                 "interpretation": "1=Doji pattern detected, 0=No pattern",
                 "significance": "Indicates indecision in the market, often signals potential reversal when appears after extended trend"
             }
-        }
\ No newline at end of file
+        }
+
+
+# One service per process. Building a service rebuilds the indicator metadata,
+# and its cache is lost with it.
+_process_service: Optional[IndicatorService] = None
+_process_service_lock = threading.Lock()
+
+# Indicators calculated once when warming up a process
+WARMUP_INDICATORS = ("sma", "ema", "rsi", "macd")
+
+
+def get_process_indicator_service() -> IndicatorService:
+    """
+    Get the indicator service shared by everything in this process.
+    
+    Returns:
+        Shared IndicatorService instance
+    """
+    global _process_service
+    if _process_service is None:
+        with _process_service_lock:
+            if _process_service is None:
+                _process_service = IndicatorService(cache_enabled=True, validate_params=True)
+    return _process_service
+
+
+def warmup_indicator_service() -> None:
+    """
+    Create the shared service and run the common indicators once.
+    
+    Used as a process pool initializer so a worker's first request does not
+    pay for loading the TA-Lib and pandas code paths. Warmup results are not
+    cached.
+    """
+    service = get_process_indicator_service()
+    start = datetime(2000, 1, 1)
+    prices = np.linspace(100.0, 110.0, 64)
+    df = pd.DataFrame(
+        {"open": prices, "high": prices + 1.0, "low": prices - 1.0, "close": prices, "volume": 1000.0},
+        index=pd.date_range(start, periods=len(prices), freq="D")
+    )
+    for indicator_type in WARMUP_INDICATORS:
+        params = service._indicator_metadata[indicator_type].get("default_params", {})
+        try:
+            service._get_indicator_function(indicator_type)(df, params)
+        except Exception as e:
+            logger.warning(f"Warmup of {indicator_type} failed: {e}")
@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.data_sources import alpha_vantage
+from src.data_sources.alpha_vantage import AlphaVantageConnector
+
+
+DAILY_RESPONSE = {
+    "Time Series (Daily)": {
+        "2024-01-03": {"1. open": "11", "2. high": "12", "3. low": "10", "4. close": "11.5", "5. volume": "200"},
+        "2024-01-02": {"1. open": "10", "2. high": "11", "3. low": "9", "4. close": "10.5", "5. volume": "100"}
+    }
+}
+
+
+@pytest.fixture
+def connector():
+    """Create an Alpha Vantage connector without InfluxDB caching."""
+    alpha_vantage.clear_series_cache()
+    yield AlphaVantageConnector(config={"api_key": "demo"}, cache_to_influxdb=False)
+    alpha_vantage.clear_series_cache()
+
+
+def test_requests_share_one_session(connector):
+    """Test that requests reuse the module session until it is closed."""
+    response = MagicMock(status=200)
+    response.read = AsyncMock(return_value=b'{"Time Series (Daily)": {}}')
+    session = MagicMock(closed=False)
+    session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+    session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    async def fetch_twice():
+        with patch.object(alpha_vantage.aiohttp, "ClientSession", return_value=session) as create:
+            data = await connector._make_request(function="TIME_SERIES_DAILY", symbol="AAPL")
+            await connector._make_request(function="TIME_SERIES_DAILY", symbol="MSFT")
+        session.close = AsyncMock()
+        await alpha_vantage.close_session()
+        return create, data
+
+    create, data = asyncio.run(fetch_twice())
+
+    assert data == {"Time Series (Daily)": {}}
+    create.assert_called_once()
+    assert session.get.call_count == 2
+    session.close.assert_awaited_once()
+    assert alpha_vantage._session is None
+
+
+def test_convert_to_ohlcv(connector):
+    """Test that parsed time series convert to points in timestamp order."""
+    df = connector._parse_time_series(DAILY_RESPONSE, "Time Series (Daily)")
+
+    ohlcv, raw_points = connector._convert_to_ohlcv("AAPL", "1d", df)
+
+    assert [point.timestamp for point in ohlcv.data] == [datetime(2024, 1, 2), datetime(2024, 1, 3)]
+    assert ohlcv.data[0].open == 10.0
+    assert ohlcv.data[1].close == 11.5
+    assert ohlcv.data[1].volume == 200.0
+    assert ohlcv.data[0].source_id == "alphavantage_1704153600"
+    assert raw_points == [point.model_dump(exclude_unset=True) for point in ohlcv.data]
+    assert "adjustment_factor" not in raw_points[0]
+
+
+def test_time_series_are_fetched_once(connector):
+    """Test that one response serves every date range until it expires."""
+    other = AlphaVantageConnector(config={"api_key": "demo", "output_size": "compact"}, cache_to_influxdb=False)
+
+    async def fetch():
+        return [
+            await connector.fetch_ohlcv("AAPL", "1d", "2024-01-01", "2024-01-02"),
+            await connector.fetch_ohlcv("AAPL", "1d", "2024-01-03", "2024-01-04"),
+            await other.fetch_ohlcv("AAPL", "1d", "2024-01-01", "2024-01-04")
+        ]
+
+    with patch.object(AlphaVantageConnector, "_make_request", AsyncMock(return_value=DAILY_RESPONSE)) as request:
+        first, second, compact = asyncio.run(fetch())
+
+        assert [len(first.data), len(second.data), len(compact.data)] == [1, 1, 2]
+        request.assert_awaited_once()
+
+        with patch.object(alpha_vantage.time, "monotonic", return_value=alpha_vantage.time.monotonic() + 3600):
+            asyncio.run(connector.fetch_ohlcv("AAPL", "1d", "2024-01-01", "2024-01-04"))
+        assert request.await_count == 2
@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import HTTPException
+
+from src.app.auth import clear_token_cache, create_access_token, get_current_user
+from src.models.user import UserInDB
+
+
+@pytest.fixture
+def user_in_db():
+    """Create a stored user for token lookups."""
+    return UserInDB(
+        id="user-1",
+        username="testuser",
+        email="test@example.com",
+        password_hash="hash",
+        created_at=datetime(2024, 1, 1)
+    )
+
+
+@pytest.fixture
+def mock_user_repo(user_in_db):
+    """Patch the user repository used by get_current_user."""
+    clear_token_cache()
+    repo = MagicMock()
+    repo.get_user_by_id = AsyncMock(return_value=user_in_db)
+    with patch("src.app.auth.get_user_repository", return_value=repo):
+        yield repo
+    clear_token_cache()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_caches_token(mock_user_repo):
+    """Test that repeated requests with one token look the user up once."""
+    token = create_access_token("user-1")
+
+    first = await get_current_user(token, MagicMock())
+    second = await get_current_user(token, MagicMock())
+
+    assert first.id == second.id == "user-1"
+    assert first is not second
+    mock_user_repo.get_user_by_id.assert_awaited_once_with("user-1")
+
+    # A different token for the same user is decoded but reuses the user lookup
+    other = await get_current_user(create_access_token("user-1", timedelta(minutes=5)), MagicMock())
+    assert other.id == "user-1"
+    mock_user_repo.get_user_by_id.assert_awaited_once_with("user-1")
+    
+    # Once the caches are cleared the user is looked up again
+    clear_token_cache()
+    await get_current_user(create_access_token("user-1", timedelta(minutes=10)), MagicMock())
+    assert mock_user_repo.get_user_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_invalid_token(mock_user_repo):
+    """Test that invalid tokens are rejected and not cached."""
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user("not-a-token", MagicMock())
+
+    assert exc_info.value.status_code == 401
+    mock_user_repo.get_user_by_id.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_expired_token(mock_user_repo):
+    """Test that expired tokens are rejected."""
+    token = create_access_token("user-1", timedelta(seconds=-30))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(token, MagicMock())
+
+    assert exc_info.value.status_code == 401
+    mock_user_repo.get_user_by_id.assert_not_awaited()
@@ -137,8 +137,8 @@ class TestDataAvailabilityService:
         mock_influxdb_client.query_ohlcv.assert_called_with(
             instrument="BTCUSDT",
             timeframe="1h",
-            start_date="2023-01-01",
-            end_date="2023-01-02",
+            start_date=datetime(2023, 1, 1),
+            end_date=datetime(2023, 1, 2),
             version="latest"
         )
     
@@ -164,8 +164,8 @@ class TestDataAvailabilityService:
         # Since there's no data, there should be one gap for the entire range
         assert len(result) == 1
         gap = result[0]
-        assert gap["start_date"] == "2023-01-01"
-        assert gap["end_date"] == "2023-01-02"
+        assert gap["start_date"] == datetime(2023, 1, 1)
+        assert gap["end_date"] == datetime(2023, 1, 2)
     
     @pytest.mark.asyncio
     async def test_check_adjustments(self, mock_influxdb_client):
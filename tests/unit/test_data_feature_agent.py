@@ -4,7 +4,7 @@ Unit tests for the DataFeatureAgent.
 
 import pytest
 from unittest.mock import MagicMock, patch
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from src.agents.base import Agent
 from src.services.indicators import IndicatorService
@@ -157,7 +157,7 @@ class TestDataFeatureAgent:
         from src.agents.data_feature_agent import DataFeatureAgent
         
         # Disable actual InfluxDB client initialization in the agent constructor
-        with patch('src.agents.data_feature_agent.InfluxDBClient', return_value=mock_influxdb_client):
+        with patch('src.agents.data_feature_agent.get_influxdb_client', return_value=mock_influxdb_client):
             # Create the agent with mock services
             agent = DataFeatureAgent(
                 indicator_service=mock_indicator_service,
@@ -171,13 +171,25 @@ class TestDataFeatureAgent:
             assert agent.data_availability_service == mock_data_availability_service
             assert agent.data_retrieval_service == mock_data_retrieval_service
             
+    def test_initialization_default_services(self, mock_influxdb_client, mock_indicator_service):
+        """Test that default services share the process-wide InfluxDB client."""
+        from src.agents.data_feature_agent import DataFeatureAgent
+        
+        with patch('src.agents.data_feature_agent.get_influxdb_client', return_value=mock_influxdb_client) as get_client:
+            agent = DataFeatureAgent(indicator_service=mock_indicator_service)
+            
+            get_client.assert_called_once_with()
+            assert agent.data_availability_service.influxdb is mock_influxdb_client
+            assert agent.data_retrieval_service.influxdb is mock_influxdb_client
+            assert agent.data_retrieval_service.indicators is mock_indicator_service
+            
     def test_process_invalid_message(self, mock_influxdb_client, mock_indicator_service, 
                                   mock_data_availability_service, mock_data_retrieval_service):
         """Test processing an invalid message."""
         from src.agents.data_feature_agent import DataFeatureAgent
         
         # Create the agent with mock services
-        with patch('src.agents.data_feature_agent.InfluxDBClient', return_value=mock_influxdb_client):
+        with patch('src.agents.data_feature_agent.get_influxdb_client', return_value=mock_influxdb_client):
             agent = DataFeatureAgent(
                 indicator_service=mock_indicator_service,
                 data_availability_service=mock_data_availability_service,
@@ -203,7 +215,7 @@ class TestDataFeatureAgent:
         import asyncio
         
         # Create the agent with mock services
-        with patch('src.agents.data_feature_agent.InfluxDBClient', return_value=mock_influxdb_client):
+        with patch('src.agents.data_feature_agent.get_influxdb_client', return_value=mock_influxdb_client):
             agent = DataFeatureAgent(
                 indicator_service=mock_indicator_service,
                 data_availability_service=mock_data_availability_service,
@@ -249,7 +261,7 @@ class TestDataFeatureAgent:
         mock_data_availability_service.check_data_requirements = mock_check_data_requirements
         
         # Create the agent with mock services
-        with patch('src.agents.data_feature_agent.InfluxDBClient', return_value=mock_influxdb_client):
+        with patch('src.agents.data_feature_agent.get_influxdb_client', return_value=mock_influxdb_client):
             agent = DataFeatureAgent(
                 indicator_service=mock_indicator_service,
                 data_availability_service=mock_data_availability_service,
@@ -282,4 +294,108 @@ class TestDataFeatureAgent:
             assert response["message_type"] == "response"
             assert response["content"]["type"] == "data_availability_result"
             assert "data" in response["content"]
-            assert "availability" in response["content"]["data"]
\ No newline at end of file
+            assert "availability" in response["content"]["data"]
+            
+    def test_handle_create_visualization_multiple_indicators(self, mock_influxdb_client, mock_indicator_service,
+                                                             mock_data_availability_service, mock_data_retrieval_service):
+        """Test that each requested indicator is calculated and formatted for visualization."""
+        from src.agents.data_feature_agent import DataFeatureAgent
+        
+        # Return one result per single-item batch submitted by the agent
+        def calculate_batch(ohlcv_data, indicators_config):
+            config = indicators_config[0]
+            return {
+                config["name"]: {
+                    "values": {"2023-01-01T00:00:00": 100.0, "2023-01-01T01:00:00": 101.0},
+                    "metadata": {"indicator_type": config["type"]}
+                }
+            }
+        
+        mock_indicator_service.calculate_multiple_indicators.side_effect = calculate_batch
+        
+        with patch('src.agents.data_feature_agent.get_influxdb_client', return_value=mock_influxdb_client):
+            agent = DataFeatureAgent(
+                indicator_service=mock_indicator_service,
+                data_availability_service=mock_data_availability_service,
+                data_retrieval_service=mock_data_retrieval_service
+            )
+            
+            result = agent._handle_create_visualization({
+                "instrument": "BTCUSDT",
+                "timeframe": "1h",
+                "start_date": "2023-01-01",
+                "end_date": "2023-01-02",
+                "indicators": [
+                    {"type": "sma", "name": "SMA"},
+                    {"type": "rsi", "name": "RSI"}
+                ]
+            })
+            
+            # Verify both indicators were calculated and formatted
+            assert result["type"] == "visualization_result"
+            visualization = result["data"]["data"]
+            assert set(visualization["indicators"].keys()) == {"SMA", "RSI"}
+            assert visualization["indicators"]["RSI"]["values"] == [100.0, 101.0]
+            assert mock_indicator_service.calculate_multiple_indicators.call_count == 2
+            
+            # OHLCV columns are typed arrays aligned with the timestamps
+            assert len(visualization["ohlcv"]["timestamps"]) == 5
+            assert visualization["ohlcv"]["close"].dtype.name == "float32"
+            assert visualization["ohlcv"]["close"].tolist() == [101.0, 102.0, 103.0, 104.0, 105.0]
+            assert result["data"]["format"] == "numpy"
+    
+    def test_format_ohlcv_keeps_large_volumes_exact(self, mock_influxdb_client, mock_indicator_service,
+                                                    mock_data_availability_service, mock_data_retrieval_service):
+        """Test that volumes above float32 integer precision are not rounded."""
+        from src.agents.data_feature_agent import DataFeatureAgent
+        
+        with patch('src.agents.data_feature_agent.get_influxdb_client', return_value=mock_influxdb_client):
+            agent = DataFeatureAgent(
+                indicator_service=mock_indicator_service,
+                data_availability_service=mock_data_availability_service,
+                data_retrieval_service=mock_data_retrieval_service
+            )
+            
+            ohlcv_data = OHLCV(
+                instrument="AAPL",
+                timeframe="1d",
+                source="test",
+                data=[OHLCVPoint(
+                    timestamp=datetime(2023, 1, 3),
+                    open=130.0,
+                    high=131.0,
+                    low=124.0,
+                    close=125.0,
+                    volume=112_117_471
+                )]
+            )
+            
+            formatted = agent._format_ohlcv_for_visualization(ohlcv_data)
+            
+            assert formatted["volume"].dtype.name == "float64"
+            assert formatted["volume"].tolist() == [112_117_471.0]
+    
+    def test_format_timestamps_matches_isoformat(self, mock_influxdb_client, mock_indicator_service,
+                                                 mock_data_availability_service, mock_data_retrieval_service):
+        """Test that batch timestamp formatting matches isoformat() for uniform and mixed batches."""
+        from src.agents.data_feature_agent import DataFeatureAgent
+        
+        with patch('src.agents.data_feature_agent.get_influxdb_client', return_value=mock_influxdb_client):
+            agent = DataFeatureAgent(
+                indicator_service=mock_indicator_service,
+                data_availability_service=mock_data_availability_service,
+                data_retrieval_service=mock_data_retrieval_service
+            )
+            
+            batches = [
+                [datetime(2023, 1, 1, 0), datetime(2023, 1, 1, 1)],
+                [datetime(2023, 1, 1, 0, 0, 0, 250), datetime(2023, 1, 1, 1, 0, 0, 500)],
+                [datetime(2023, 1, 1, 0), datetime(2023, 1, 1, 1, 0, 0, 500)],
+                [datetime(2023, 1, 1, 0, tzinfo=timezone.utc), datetime(2023, 1, 1, 1, tzinfo=timezone.utc)]
+            ]
+            
+            for timestamps in batches:
+                assert agent._format_timestamps(timestamps) == [t.isoformat() for t in timestamps]
+            
+            # Whole-second points in a mixed batch keep their short form
+            assert agent._format_timestamps(batches[2])[0] == "2023-01-01T00:00:00"
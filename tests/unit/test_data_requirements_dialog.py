@@ -0,0 +1,20 @@
+from src.agents.templates.data_requirements_dialog import (
+    DATA_NOT_AVAILABLE_TEMPLATE,
+    DATA_SOURCE_SELECTION_PROMPT,
+    render
+)
+
+
+def test_render_fills_placeholders():
+    """Test that render substitutes the provided values."""
+    text = render(DATA_NOT_AVAILABLE_TEMPLATE, external_source="Binance")
+    
+    assert "fetch the data from Binance" in text
+    assert "{" not in text
+
+
+def test_render_keeps_missing_placeholders():
+    """Test that placeholders without a value are left in place."""
+    text = render(DATA_SOURCE_SELECTION_PROMPT, instrument="BTC/USD")
+    
+    assert "For the instrument BTC/USD at {frequency} timeframe" in text
@@ -231,6 +231,33 @@ class TestDataRetrievalService:
             version="latest"
         )
     
+    @pytest.mark.asyncio
+    async def test_get_ohlcv_data(self, mock_influxdb_client, mock_indicator_service):
+        """Test retrieving stored OHLCV data for a market data request."""
+        service = DataRetrievalService(mock_influxdb_client, mock_indicator_service)
+        request = MarketDataRequest(
+            instrument="BTCUSDT",
+            timeframe="1h",
+            start_date="2023-01-01",
+            end_date="2023-01-02"
+        )
+        
+        result = await service.get_ohlcv_data(request)
+        
+        assert isinstance(result, OHLCV)
+        assert result.source == "influxdb"
+        assert len(result.data) == 2
+        mock_influxdb_client.query_ohlcv.assert_called_once_with(
+            instrument="BTCUSDT",
+            timeframe="1h",
+            start_date=datetime(2023, 1, 1),
+            end_date=datetime(2023, 1, 2),
+            version="latest"
+        )
+        
+        mock_influxdb_client.query_ohlcv.return_value = []
+        assert await service.get_ohlcv_data(request) is None
+    
     def test_get_data_with_indicators(self, mock_influxdb_client, mock_indicator_service, sample_ohlcv_data):
         """Test retrieving data with indicators."""
         service = DataRetrievalService(mock_influxdb_client, mock_indicator_service)
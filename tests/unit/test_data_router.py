@@ -0,0 +1,409 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from src.app.routers import data
+from src.database.connection import get_db_manager
+
+
+@pytest.fixture
+def db():
+    """Create a database manager with a mock InfluxDB client."""
+    db = MagicMock()
+    db.influxdb_client.check_data_availability.return_value = {"is_complete": True}
+    db.redis_client = None
+    return db
+
+
+@pytest.fixture
+def client(db):
+    """Create a test client for the data router."""
+    data.clear_data_cache()
+    app = FastAPI()
+    app.include_router(data.router)
+    app.dependency_overrides[get_db_manager] = lambda: db
+    yield TestClient(app)
+    data.clear_data_cache()
+
+
+def test_availability_is_cached(client, db):
+    """Test that repeated availability checks reuse the cached response."""
+    params = {
+        "instrument": "BTC/USD",
+        "timeframe": "1h",
+        "start_date": "2024-01-01",
+        "end_date": "2024-02-01"
+    }
+    with patch.object(data.DataAvailabilityService, "get_missing_segments", AsyncMock(return_value=[])):
+        first = client.get("/data/availability", params=params)
+        second = client.get("/data/availability", params=params)
+        other = client.get("/data/availability", params={**params, "version": "v2"})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() == {"availability": {"is_complete": True}, "missing_segments": []}
+    assert first.headers["cache-control"] == "public, max-age=60"
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert other.status_code == 200
+    assert db.influxdb_client.check_data_availability.call_count == 2
+
+
+def test_availability_queries_run_concurrently(client, db):
+    """Test that the availability and missing-segment queries overlap."""
+    # Each query waits for the other, so running them one after the other fails
+    barrier = threading.Barrier(2, timeout=5)
+
+    def query_ohlcv(**kwargs):
+        barrier.wait()
+        return []
+
+    def check_data_availability(**kwargs):
+        barrier.wait()
+        return {"is_complete": False}
+
+    db.influxdb_client.query_ohlcv.side_effect = query_ohlcv
+    db.influxdb_client.check_data_availability.side_effect = check_data_availability
+    response = client.get("/data/availability", params={
+        "instrument": "BTC/USD",
+        "timeframe": "1h",
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-02"
+    })
+
+    assert response.status_code == 200
+    assert response.json()["availability"] == {"is_complete": False}
+    assert len(response.json()["missing_segments"]) == 1
+
+
+def test_snapshot_invalidates_cached_versions(client):
+    """Test that creating a snapshot refreshes the cached versions."""
+    params = {"instrument": "BTC/USD", "timeframe": "1h"}
+    with patch.object(data.DataVersioningService, "list_versions", AsyncMock(return_value=["latest"])) as list_versions, \
+            patch.object(data.DataVersioningService, "create_snapshot", AsyncMock(return_value="snap-1")):
+        client.get("/data/versions", params=params)
+        client.get("/data/versions", params=params)
+        assert list_versions.await_count == 1
+
+        client.post("/data/snapshot", params={**params, "start_date": "2024-01-01", "end_date": "2024-02-01"})
+        client.get("/data/versions", params=params)
+        assert list_versions.await_count == 2
+
+
+def test_versions_support_conditional_requests(client):
+    """Test that a current ETag gets a 304 and writes change the ETag."""
+    params = {"instrument": "BTC/USD", "timeframe": "1h"}
+    # ETags also change with the cache period, so keep the test inside one
+    with patch.object(data.DataVersioningService, "list_versions", AsyncMock(return_value=["latest"])) as list_versions, \
+            patch.object(data.DataVersioningService, "create_snapshot", AsyncMock(return_value="snap-1")), \
+            patch.object(data.time, "time", return_value=1_700_000_000.0):
+        first = client.get("/data/versions", params=params)
+        etag = first.headers["etag"]
+
+        data.clear_data_cache()
+        not_modified = client.get("/data/versions", params=params, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+        assert list_versions.await_count == 1
+
+        client.post("/data/snapshot", params={**params, "start_date": "2024-01-01", "end_date": "2024-02-01"})
+        modified = client.get("/data/versions", params=params, headers={"If-None-Match": etag})
+        assert modified.status_code == 200
+        assert modified.headers["etag"] != etag
+        assert list_versions.await_count == 2
+
+
+def test_cached_data_is_shared_through_redis(client, db):
+    """Test that a body computed by one process is served to others from Redis."""
+    store = {}
+    redis_client = MagicMock()
+    redis_client.get.side_effect = store.get
+    redis_client.set.return_value = True
+    redis_client.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+    redis_client.scan_iter.side_effect = lambda match, count: [key for key in store if key.startswith("data:quality:BTC/USD:1h:")]
+    db.redis_client = redis_client
+
+    params = {"instrument": "BTC/USD", "timeframe": "1h", "start_date": "2024-01-01", "end_date": "2024-02-01"}
+    report = {"status": "ok", "score": 0.97}
+    with patch.object(data.DataIntegrityService, "verify_data_quality", AsyncMock(return_value=report)) as verify:
+        first = client.get("/data/quality", params=params)
+        # Another process has an empty local cache but shares Redis
+        data.clear_data_cache()
+        second = client.get("/data/quality", params=params)
+
+        assert verify.await_count == 1
+        assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+        assert first.json() == second.json() == report
+        redis_client.set.assert_called_once()
+        assert redis_client.set.call_args.kwargs["nx"] is True
+
+        with patch.object(data.DataIntegrityService, "create_adjustment", AsyncMock(return_value={"status": "success"})):
+            client.post("/data/adjustments", params={
+                "instrument": "BTC/USD",
+                "timeframe": "1h",
+                "adjustment_type": "split",
+                "adjustment_factor": 2.0,
+                "reference_date": "2024-01-15"
+            })
+        redis_client.delete.assert_called_with(*[key for key in store if key.startswith("data:quality:")])
+
+
+def test_failed_computation_releases_redis_lock(client, db):
+    """Test that a failed computation releases the Redis fill lock."""
+    redis_client = MagicMock()
+    redis_client.get.return_value = None
+    redis_client.set.return_value = True
+    db.redis_client = redis_client
+
+    params = {"instrument": "BTC/USD", "timeframe": "1h", "start_date": "2024-01-01", "end_date": "2024-02-01"}
+    with patch.object(data.DataIntegrityService, "detect_anomalies", AsyncMock(return_value={"error": "timeout"})):
+        assert client.get("/data/anomalies", params=params).status_code == 500
+
+    lock_key = redis_client.set.call_args.args[0]
+    assert lock_key.endswith(":lock")
+    redis_client.delete.assert_called_once_with(lock_key)
+    redis_client.setex.assert_not_called()
+
+
+def test_waiting_requests_keep_the_fill_lock(client):
+    """Test that a lock with queued waiters is reused by later requests."""
+    key = ("availability", "BTC/USD", "1h")
+    calls = []
+    running = 0
+    overlapped = False
+
+    async def scenario():
+        first_failed = asyncio.Event()
+        second_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def compute():
+            nonlocal running, overlapped
+            calls.append(len(calls))
+            running += 1
+            overlapped = overlapped or running > 1
+            try:
+                if len(calls) == 1:
+                    await first_failed.wait()
+                    raise RuntimeError("lookup failed")
+                second_started.set()
+                await release.wait()
+                return {"ok": True}
+            finally:
+                running -= 1
+
+        first = asyncio.create_task(data._cached_data(key, compute, Response()))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(data._cached_data(key, compute, Response()))
+        await asyncio.sleep(0)
+        first_failed.set()
+        with pytest.raises(RuntimeError):
+            await first
+
+        # The second request still waits on the lock, so a third must share it
+        await second_started.wait()
+        third = asyncio.create_task(data._cached_data(key, compute, Response()))
+        await asyncio.sleep(0)
+        release.set()
+        return await second, await third
+
+    assert asyncio.run(scenario()) == ({"ok": True}, {"ok": True})
+    assert len(calls) == 2
+    assert not overlapped
+    assert data._data_cache_locks == {} and data._data_cache_lock_users == {}
+
+
+def test_failed_lookups_are_not_cached(client):
+    """Test that error responses are computed again on the next request."""
+    params = {"instrument": "BTC/USD", "timeframe": "1h", "start_date": "2024-01-01", "end_date": "2024-02-01"}
+    with patch.object(data.DataIntegrityService, "detect_anomalies", AsyncMock(return_value={"error": "timeout"})) as detect:
+        assert client.get("/data/anomalies", params=params).status_code == 500
+        assert client.get("/data/anomalies", params=params).status_code == 500
+
+    assert detect.await_count == 2
+
+
+def test_indicators_are_streamed_as_one_document(client):
+    """Test that streamed indicator results decode to the calculated result."""
+    result = {
+        "sma": {"values": {"2024-01-01": 1.5, "2024-01-02": float("nan")}},
+        "rsi": {"error": "Invalid parameters"}
+    }
+    body = {
+        "ohlcv_data": {"instrument": "BTC/USD", "timeframe": "1h", "source": "binance", "data": []},
+        "indicators": [{"type": "sma"}, {"type": "rsi"}]
+    }
+    with patch.object(data, "_calculate_indicators", AsyncMock(return_value=result)):
+        response = client.post("/data/indicators", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "sma": {"values": {"2024-01-01": 1.5, "2024-01-02": None}},
+        "rsi": {"error": "Invalid parameters"}
+    }
+
+
+@pytest.mark.asyncio
+async def test_small_indicator_requests_run_on_a_thread():
+    """Test that only large series are sent to the process pool."""
+    ohlcv = MagicMock()
+    ohlcv.data = [None] * 10
+    service = MagicMock()
+    service.calculate_multiple_indicators.return_value = {"sma": {}}
+    pool = MagicMock()
+
+    with patch.object(data, "get_process_indicator_service", return_value=service), \
+            patch.object(data, "_indicator_pool", pool):
+        assert await data._calculate_indicators(ohlcv, [{"type": "sma"}]) == {"sma": {}}
+
+    pool.submit.assert_not_called()
+    service.calculate_multiple_indicators.assert_called_once_with(ohlcv, [{"type": "sma"}])
+
+
+def test_indicator_pool_is_created_lazily_and_shut_down():
+    """Test that the process pool starts on first use and stops on shutdown."""
+    with patch.object(data, "_indicator_pool", None), \
+            patch.object(data, "ProcessPoolExecutor") as executor:
+        assert data._indicator_pool is None
+        pool = data._get_indicator_pool()
+        assert data._get_indicator_pool() is pool
+        executor.assert_called_once()
+        assert executor.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+
+        data.shutdown_indicator_pool()
+        pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        assert data._indicator_pool is None
+
+
+def test_available_indicators_revalidate_with_etag(client):
+    """Test that the precomputed indicator list supports conditional requests."""
+    response = client.get("/data/indicators/available")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=3600"
+    assert "sma" in {item["type"] for items in response.json().values() for item in items}
+
+    etag = response.headers["etag"]
+    not_modified = client.get("/data/indicators/available", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    stale = client.get("/data/indicators/available", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+    assert stale.content == response.content
+
+
+def test_historical_indicators_take_one_request_body(client):
+    """Test that historical indicator requests are validated as one model."""
+    body = {
+        "instrument": "BTC/USD",
+        "timeframe": "1h",
+        "start_date": "2024-01-01",
+        "end_date": "2024-02-01",
+        "indicators": [{"type": "sma"}]
+    }
+    ohlcv = MagicMock()
+    ohlcv.data = [None] * 3
+    retrieval = MagicMock()
+    retrieval.get_ohlcv_data = AsyncMock(return_value=ohlcv)
+    with patch.object(data, "_retrieval_service", return_value=retrieval), \
+            patch.object(data, "_calculate_indicators", AsyncMock(return_value={"sma": {}})) as calculate:
+        response = client.post("/data/indicators/historical", json=body)
+        invalid = client.post("/data/indicators/historical", json={**body, "end_date": "2023-12-01"})
+
+    assert response.status_code == 200
+    assert response.json()["data_source"] == {
+        "instrument": "BTC/USD",
+        "timeframe": "1h",
+        "start_date": "2024-01-01T00:00:00",
+        "end_date": "2024-02-01T00:00:00",
+        "version": "latest",
+        "data_points": 3
+    }
+    request = retrieval.get_ohlcv_data.await_args.args[0]
+    assert request.instrument == "BTC/USD"
+    calculate.assert_awaited_once_with(ohlcv, [{"type": "sma"}])
+    assert invalid.status_code == 422
+
+
+def test_empty_indicator_requests_skip_calculation(client):
+    """Test that requests without indicators neither query nor calculate."""
+    retrieval = MagicMock()
+    retrieval.get_ohlcv_data = AsyncMock()
+    body = {"instrument": "BTC/USD", "timeframe": "1h", "start_date": "2024-01-01", "end_date": "2024-02-01"}
+    with patch.object(data, "_retrieval_service", return_value=retrieval), \
+            patch.object(data, "_calculate_indicators", AsyncMock()) as calculate:
+        historical = client.post("/data/indicators/historical", json={**body, "indicators": []})
+        provided = client.post("/data/indicators", json={
+            "ohlcv_data": {"instrument": "BTC/USD", "timeframe": "1h", "source": "binance", "data": []},
+            "indicators": []
+        })
+
+    assert historical.status_code == provided.status_code == 200
+    assert historical.json()["data_source"]["data_points"] is None
+    assert provided.json() == {}
+    retrieval.get_ohlcv_data.assert_not_awaited()
+    calculate.assert_not_awaited()
+
+
+def test_integrity_report_queries_data_once(client, db):
+    """Test that the fused integrity report runs every check over one query."""
+    db.influxdb_client.query_ohlcv.return_value = [
+        {
+            "timestamp": datetime(2024, 1, 1) + timedelta(hours=i),
+            "open": 100 + i * 0.1,
+            "high": 101 + i * 0.1,
+            "low": 99 + i * 0.1,
+            "close": 100.5 + i * 0.1,
+            "volume": 1000 + i * 10
+        }
+        for i in range(48)
+    ]
+    params = {"instrument": "BTC/USD", "timeframe": "1h", "start_date": "2024-01-01", "end_date": "2024-01-03"}
+
+    report = client.get("/data/integrity/report", params=params)
+    quality_only = client.get("/data/integrity/report", params={**params, "checks": "quality"})
+    invalid = client.get("/data/integrity/report", params={**params, "checks": "nonsense"})
+
+    assert report.status_code == quality_only.status_code == 200
+    assert {"quality", "anomalies", "corporate_actions"} <= report.json().keys()
+    assert report.json()["quality"]["status"] == "success"
+    assert "anomalies" not in quality_only.json()
+    assert invalid.status_code == 422
+    assert db.influxdb_client.query_ohlcv.call_count == 2
+
+
+@pytest.mark.parametrize("params", [
+    {"instrument": 'BTC") |> drop(columns: ["_value'},
+    {"timeframe": "hourly"},
+    {"version": "latest\" or true"},
+])
+def test_identifiers_are_validated(client, db, params):
+    """Test that malformed identifiers are rejected before any query runs."""
+    base = {"instrument": "BTC/USD", "timeframe": "1h", "start_date": "2024-01-01", "end_date": "2024-01-02"}
+
+    response = client.get("/data/quality", params={**base, **params})
+
+    assert response.status_code == 422
+    db.influxdb_client.query_ohlcv.assert_not_called()
+
+
+@pytest.mark.parametrize("method, path", [
+    ("get", "/data/health"),
+    ("get", "/data/versions?instrument=BTC/USD&timeframe=1h"),
+    ("post", "/data/version/tag?instrument=BTC/USD&timeframe=1h&version=v1&tag_name=a&tag_value=b"),
+])
+def test_routes_require_influxdb(client, db, method, path):
+    """Test that data routes answer 503 without an InfluxDB client."""
+    db.influxdb_client = None
+
+    response = getattr(client, method)(path)
+
+    assert response.status_code == 503
+    assert response.json()["detail"] == "InfluxDB client not available"
@@ -8,7 +8,7 @@ import numpy as np
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
-from src.services.indicators import IndicatorService
+from src.services.indicators import IndicatorService, get_process_indicator_service, warmup_indicator_service
 from src.models.market_data import OHLCV, OHLCVPoint
 
 
@@ -308,4 +308,17 @@ class TestIndicatorService:
         assert "parameters" in result["metadata"]
         assert "instrument" in result["metadata"]
         assert "timeframe" in result["metadata"]
-        assert "data_points" in result["metadata"]
\ No newline at end of file
+        assert "data_points" in result["metadata"]
+    
+    def test_static_calculation_reuses_process_service(self, sample_ohlcv_data):
+        """Test that the process-pool entry point shares one warmed-up service."""
+        warmup_indicator_service()
+        service = get_process_indicator_service()
+        assert get_process_indicator_service() is service
+        
+        config = [{"type": "sma", "parameters": {"period": 10}, "name": "sma_10"}]
+        first = IndicatorService.calculate_multiple_indicators_static(sample_ohlcv_data, config)
+        second = IndicatorService.calculate_multiple_indicators_static(sample_ohlcv_data, config)
+        
+        assert "error" not in first["sma_10"]
+        assert second["sma_10"] is first["sma_10"]
@@ -1,6 +1,7 @@
 """
 Test the knowledge graph integration with agents.
 """
+import asyncio
 import unittest
 import logging
 import os
@@ -11,7 +12,9 @@ from unittest.mock import MagicMock, patch
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 from src.agents.knowledge_integration import (
+    clear_recommendation_cache,
     get_knowledge_recommendations,
+    get_knowledge_recommendations_async,
     enhance_validation_feedback,
     enhance_strategy_with_knowledge
 )
@@ -22,6 +25,8 @@ class TestKnowledgeIntegration(unittest.TestCase):
     
     def setUp(self):
         """Set up the test case."""
+        clear_recommendation_cache()
+        
         # Create a mock strategy repository
         self.mock_repository = MagicMock()
         
@@ -32,6 +37,10 @@ class TestKnowledgeIntegration(unittest.TestCase):
             {"name": "Bollinger Bands", "explanation": "Bollinger Bands help identify volatility."}
         ]
         
+        self.mock_repository.get_indicator_names_for_strategy_type.return_value = [
+            "RSI", "MACD", "Bollinger Bands"
+        ]
+        
         self.mock_repository.get_position_sizing_for_strategy_type.return_value = [
             {"name": "percent_of_equity", "explanation": "Common position sizing method."}
         ]
@@ -41,9 +50,21 @@ class TestKnowledgeIntegration(unittest.TestCase):
             {"name": "trailing_stop", "explanation": "Follows price movement to lock in profits."}
         ]
         
+        self.mock_repository.get_recommendations_bundle.return_value = {
+            "indicators": self.mock_repository.get_indicators_for_strategy_type.return_value,
+            "position_sizing": self.mock_repository.get_position_sizing_for_strategy_type.return_value,
+            "risk_management": self.mock_repository.get_risk_management_for_strategy_type.return_value
+        }
+        
         self.mock_repository.get_parameters_for_indicator.return_value = [
             {"name": "period", "default_value": 14}
         ]
+        
+        self.mock_repository.get_parameters_for_indicators.return_value = {
+            "RSI": [{"name": "period", "default_value": 14}],
+            "MACD": [{"name": "fast_period", "default_value": 12}],
+            "Bollinger Bands": [{"name": "period", "default_value": 20}]
+        }
     
     def test_get_knowledge_recommendations(self):
         """Test getting knowledge recommendations."""
@@ -58,11 +79,51 @@ class TestKnowledgeIntegration(unittest.TestCase):
         self.assertEqual(recommendations["risk_management"][0], "stop_loss")
         self.assertIn("RSI is ideal", recommendations["explanation"])
         
+        # All three component types come from a single repository call
+        self.mock_repository.get_recommendations_bundle.assert_called_once()
+        self.mock_repository.get_indicators_for_strategy_type.assert_not_called()
+        
         # Test with error handling
-        self.mock_repository.get_indicators_for_strategy_type.side_effect = Exception("Test error")
+        clear_recommendation_cache()
+        self.mock_repository.get_recommendations_bundle.side_effect = Exception("Test error")
         recommendations = get_knowledge_recommendations(self.mock_repository, "momentum")
         self.assertIn("Error", recommendations["explanation"])
     
+    def test_get_knowledge_recommendations_cached(self):
+        """Test that repeated recommendations are served from the cache."""
+        first = get_knowledge_recommendations(self.mock_repository, "momentum")
+        
+        # Mutating a returned result must not affect later callers
+        first["indicators"].append("ATR")
+        second = get_knowledge_recommendations(self.mock_repository, "momentum")
+        
+        self.assertEqual(second["indicators"], ["RSI", "MACD", "Bollinger Bands"])
+        self.mock_repository.get_recommendations_bundle.assert_called_once()
+        
+        # Empty results are not cached so an unavailable graph is retried
+        self.mock_repository.get_recommendations_bundle.return_value = {}
+        get_knowledge_recommendations(self.mock_repository, "breakout")
+        get_knowledge_recommendations(self.mock_repository, "breakout")
+        self.assertEqual(self.mock_repository.get_recommendations_bundle.call_count, 3)
+    
+    def test_get_knowledge_recommendations_async(self):
+        """Test getting recommendations from async code."""
+        recommendations = asyncio.run(
+            get_knowledge_recommendations_async(self.mock_repository, "momentum")
+        )
+        self.assertEqual(recommendations["indicators"][0], "RSI")
+    
+    def test_get_knowledge_recommendations_without_strategy_type(self):
+        """Test that a missing strategy type skips the knowledge graph."""
+        for strategy_type in ("", None):
+            recommendations = get_knowledge_recommendations(self.mock_repository, strategy_type)
+            self.assertEqual(recommendations["indicators"], [])
+            self.assertEqual(recommendations["explanation"], "")
+        
+        self.assertEqual(enhance_validation_feedback(self.mock_repository, ["Invalid threshold"], ""), [])
+        self.mock_repository.get_recommendations_bundle.assert_not_called()
+        self.mock_repository.generate_strategy_template.assert_not_called()
+    
     def test_enhance_validation_feedback(self):
         """Test enhancing validation feedback."""
         # Test with validation errors
@@ -72,6 +133,7 @@ class TestKnowledgeIntegration(unittest.TestCase):
         # Verify results
         self.assertTrue(len(suggestions) > 0)
         self.assertIn("Based on our trading knowledge", suggestions[0])
+        self.assertIn("RSI, MACD, Bollinger Bands", suggestions[0])
         
         # Test with different error type
         errors = ["Parameter 'threshold' value 0.001 is below minimum 0.01"]
@@ -79,6 +141,35 @@ class TestKnowledgeIntegration(unittest.TestCase):
         self.assertTrue(len(suggestions) > 0)
         self.assertIn("default parameters", suggestions[0])
     
+    def test_enhance_validation_feedback_deduplicates(self):
+        """Test that repeated error types produce one suggestion each."""
+        errors = [
+            "Parameter 'lookback_period' value 2 is below minimum 5",
+            "Parameter 'signal_period' value 1 is below minimum 2",
+            "Parameter 'threshold' value 0.001 is below minimum 0.01",
+            "Parameter 'deviation' value 0 is below minimum 0.5"
+        ]
+        suggestions = enhance_validation_feedback(self.mock_repository, errors, "momentum")
+        
+        self.assertEqual(len(suggestions), 2)
+        self.mock_repository.get_indicator_names_for_strategy_type.assert_called_once()
+    
+    def test_enhance_validation_feedback_template_fallback(self):
+        """Test that unmatched errors fall back to a cached strategy template."""
+        self.mock_repository.generate_strategy_template.return_value = {
+            "component_indicators": ["RSI", "MACD"],
+            "component_position_sizing": "percent_of_equity"
+        }
+        errors = ["Strategy name is required"]
+        
+        for _ in range(2):
+            suggestions = enhance_validation_feedback(self.mock_repository, errors, "momentum")
+            self.assertEqual(len(suggestions), 1)
+            self.assertIn("pre-defined template", suggestions[0])
+            self.assertIn("RSI, MACD", suggestions[0])
+        
+        self.mock_repository.generate_strategy_template.assert_called_once()
+    
     def test_enhance_strategy_with_knowledge(self):
         """Test enhancing strategy with knowledge."""
         # Test with basic strategy params
@@ -91,6 +182,13 @@ class TestKnowledgeIntegration(unittest.TestCase):
         self.assertIn("risk_management", enhanced)
         self.assertEqual(enhanced["strategy_type"], "momentum")
         self.assertEqual(enhanced.get("parameters"), {"lookback_period": 10})
+        
+        # Indicator parameters are fetched in one batched call
+        self.assertEqual(enhanced["indicators"][1], {"name": "MACD", "parameters": {"fast_period": 12}})
+        self.mock_repository.get_parameters_for_indicators.assert_called_once_with(
+            ["RSI", "MACD", "Bollinger Bands"]
+        )
+        self.mock_repository.get_parameters_for_indicator.assert_not_called()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+import anyio.to_thread
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.app.config import settings
+from src.app.main import app
+
+
+async def raise_http_error(kind: str):
+    """Raise an HTTPException with a string or structured detail."""
+    if kind == "dict":
+        raise HTTPException(
+            status_code=422,
+            detail={"code": "INVALID", "message": "Bad strategy", "details": {"field": "name"}}
+        )
+    raise HTTPException(status_code=401, detail="Token expired", headers={"WWW-Authenticate": "Bearer"})
+
+
+async def large_payload():
+    """Return a payload large enough to be compressed."""
+    return {"values": list(range(1000))}
+
+
+@pytest.fixture
+def test_routes():
+    """Register the helper routes on the app and remove them afterwards."""
+    routes = list(app.router.routes)
+    app.add_api_route("/_test/http-error/{kind}", raise_http_error)
+    app.add_api_route("/_test/large", large_payload)
+    yield
+    app.router.routes[:] = routes
+    app.openapi_schema = None
+
+
+client = TestClient(app)
+
+
+def test_http_exception_with_string_detail(test_routes):
+    """Test that string details produce an error envelope with the original status."""
+    response = client.get("/_test/http-error/string")
+
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert response.json() == {"status": "error", "code": "ERROR", "message": "Token expired", "details": {}}
+
+
+def test_http_exception_with_dict_detail(test_routes):
+    """Test that structured details are unpacked into the error envelope."""
+    response = client.get("/_test/http-error/dict")
+
+    assert response.status_code == 422
+    assert response.json() == {
+        "status": "error",
+        "code": "INVALID",
+        "message": "Bad strategy",
+        "details": {"field": "name"}
+    }
+
+
+def test_http_exception_rendered_with_orjson(test_routes):
+    """Test that error responses are compact JSON from the orjson renderer."""
+    response = client.get("/_test/http-error/string")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == b'{"status":"error","code":"ERROR","message":"Token expired","details":{}}'
+
+
+def test_lifespan_sizes_threadpool():
+    """Test that startup applies the configured threadpool size."""
+    with TestClient(app) as lifespan_client:
+        tokens = lifespan_client.portal.call(
+            lambda: anyio.to_thread.current_default_thread_limiter().total_tokens
+        )
+
+    assert tokens == settings.THREADPOOL_SIZE
+
+
+def test_large_responses_are_gzipped(test_routes):
+    """Test that large responses are compressed and small ones are not."""
+    large = client.get("/_test/large", headers={"Accept-Encoding": "gzip"})
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.json() == {"values": list(range(1000))}
+    assert "content-encoding" not in small.headers
+    # Both encodings are marked, once each, for shared caches
+    assert large.headers["vary"].count("Accept-Encoding") == 1
+    assert small.headers["vary"].count("Accept-Encoding") == 1
+
+
+def test_health_endpoints_return_json():
+    """Test that the pre-encoded probe responses are valid JSON."""
+    assert client.get("/").json() == {"message": "Multi-Agent Trading System API V2"}
+
+    response = client.get("/health")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"status": "healthy", "version": "2.0.0"}
+
+
+def test_helper_routes_are_not_left_on_the_app():
+    """Test that the production app only has its own routes outside the fixture."""
+    assert not any(getattr(route, "path", "").startswith("/_test/") for route in app.router.routes)
@@ -78,8 +78,57 @@ class TestMasterAgent(unittest.TestCase):
         )
         self.assertEqual(result, "conversation")
         
-        # In a more complete implementation, we would test different routing
-        # scenarios, but for now our implementation has a fixed return value
+        # Data keywords route to the data agent, including phrases and
+        # keywords embedded in longer words
+        self.assertEqual(self.master_agent.route_message("Show me a Chart of BTC", state), "data")
+        self.assertEqual(self.master_agent.route_message("I need historical data for ETH", state), "data")
+        self.assertEqual(self.master_agent.route_message("Which indicators work best?", state), "data")
+        self.assertEqual(self.master_agent.route_message("CALCULATE THE RSI", state), "data")
+
+    
+    def test_process_routes_on_content_text(self):
+        """Test that dict content is routed on its text field only."""
+        with patch.object(self.master_agent, "route_message", return_value="conversation") as route:
+            self.master_agent.process({"sender": "user", "content": {"text": "Plot RSI", "chart": {"type": "line"}}})
+            route.assert_called_once_with("Plot RSI", self.master_agent.conversation_state)
+            
+            # Content without text goes to the conversation agent unrouted
+            route.reset_mock()
+            self.master_agent.process({"sender": "user", "content": {"chart": {"type": "line"}}})
+            route.assert_not_called()
+    
+    def test_data_agent_built_lazily(self):
+        """Test that the data agent is only built when a message needs it."""
+        data_agent = MagicMock()
+        data_agent.process.return_value = self.master_agent.create_message(
+            recipient="user", message_type="response", content={"text": "ok"}
+        )
+        factory = MagicMock(return_value=data_agent)
+        self.master_agent._agent_factories["data"] = factory
+        
+        # Conversation traffic never builds the data agent
+        self.master_agent.specialized_agents["conversation"] = MagicMock()
+        self.master_agent.process({"sender": "user", "content": "Hello there"})
+        factory.assert_not_called()
+        
+        # The first data message builds it once and later messages reuse it
+        for _ in range(2):
+            response = self.master_agent.process({"sender": "user", "content": "Show me a chart"})
+            self.assertEqual(response["message_type"], "response")
+        factory.assert_called_once()
+    
+    def test_data_agent_unavailable(self):
+        """Test the error response when the data agent cannot be built."""
+        factory = MagicMock(side_effect=RuntimeError("InfluxDB connection details not configured"))
+        self.master_agent._agent_factories["data"] = factory
+        
+        for _ in range(2):
+            response = self.master_agent.process({"sender": "user", "content": "Show me a chart"})
+            self.assertEqual(response["message_type"], "error")
+            self.assertIn("Data/Feature Agent not available", response["content"]["error"])
+        
+        # A failed build is not retried on every message
+        factory.assert_called_once()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,74 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from src.app.middleware import WildcardCORSMiddleware
+
+
+def make_client(middleware_class, allow_credentials=True):
+    """Create a test client for a small app using the given CORS middleware."""
+    app = FastAPI()
+
+    @app.get("/plain")
+    async def plain():
+        return {"ok": True}
+
+    @app.post("/plain")
+    async def plain_post():
+        return {"ok": True}
+
+    @app.get("/varied")
+    async def varied():
+        return PlainTextResponse("ok", headers={"Vary": "Accept-Encoding"})
+
+    app.add_middleware(
+        middleware_class,
+        allow_origins=["*"],
+        allow_credentials=allow_credentials,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Request-Id"],
+    )
+    return TestClient(app)
+
+
+def cors_headers(response):
+    """Get the CORS-relevant response headers."""
+    return {
+        key: value for key, value in response.headers.items()
+        if key.startswith("access-control-") or key == "vary"
+    }
+
+
+@pytest.mark.parametrize("allow_credentials", [True, False])
+@pytest.mark.parametrize("method,path,kwargs", [
+    ("GET", "/plain", {}),
+    ("GET", "/varied", {}),
+    ("GET", "/plain", {"headers": {"Origin": "https://example.com"}}),
+    ("GET", "/varied", {"headers": {"Origin": "https://example.com"}}),
+    ("POST", "/plain", {"headers": {"Origin": "https://example.com"}}),
+    ("OPTIONS", "/plain", {"headers": {"Origin": "https://example.com"}}),
+])
+def test_matches_cors_middleware(allow_credentials, method, path, kwargs):
+    """Test that the wildcard middleware produces the same CORS headers."""
+    expected = make_client(CORSMiddleware, allow_credentials).request(method, path, **kwargs)
+    actual = make_client(WildcardCORSMiddleware, allow_credentials).request(method, path, **kwargs)
+
+    assert actual.status_code == expected.status_code
+    assert cors_headers(actual) == cors_headers(expected)
+
+
+def test_preflight_matches_cors_middleware():
+    """Test that preflight requests are answered like CORSMiddleware."""
+    headers = {
+        "Origin": "https://example.com",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "Authorization",
+    }
+    expected = make_client(CORSMiddleware).options("/plain", headers=headers)
+    actual = make_client(WildcardCORSMiddleware).options("/plain", headers=headers)
+
+    assert actual.status_code == expected.status_code == 200
+    assert cors_headers(actual) == cors_headers(expected)
@@ -5,7 +5,7 @@ Unit tests for the Strategy Repository module.
 import pytest
 from src.database.strategy_repository import StrategyRepository, ComponentType, ComponentFilter
 from src.database.connection import db_manager
-from src.database.init import init_neo4j
+from src.database.init import init_neo4j, ensure_neo4j_schema
 import logging
 
 # Set up logging
@@ -36,9 +36,11 @@ def setup_neo4j():
                 count = result.single()["count"]
                 logger.info(f"Connected to Neo4j database, found {count} nodes")
                 
-                # If we have nodes, we can skip initialization
+                # If we have nodes, we can skip initialization but still
+                # make sure the name lookups are indexed
                 if count > 0:
                     logger.info("Neo4j database already has data, skipping initialization")
+                    ensure_neo4j_schema(enhanced=True)
                     return True
         except Exception as e:
             logger.error(f"Error testing Neo4j connection: {e}")
@@ -123,6 +125,13 @@ class TestStrategyRepository:
             score = indicator.get("compatibility_score", 0)
             assert score >= 0.9
     
+    def test_get_indicator_names_for_strategy_type(self, repo):
+        """Test retrieving only indicator names for a strategy type."""
+        names = repo.get_indicator_names_for_strategy_type("momentum", limit=3)
+        full = repo.get_indicators_for_strategy_type("momentum", limit=3)
+        
+        assert names == [i["name"] for i in full]
+    
     def test_get_position_sizing_for_strategy_type(self, repo):
         """Test retrieving position sizing methods for a strategy type."""
         # Get position sizing for trend_following strategy
@@ -141,6 +150,25 @@ class TestStrategyRepository:
         # Check that we have compatibility scores
         assert "compatibility_score" in risk_management[0] or "strength" in risk_management[0]
     
+    def test_get_recommendations_bundle(self, repo):
+        """Test retrieving all strategy type recommendations in one query."""
+        bundle = repo.get_recommendations_bundle("momentum")
+        
+        # Limits default to the knowledge recommendation sizes
+        assert 0 < len(bundle["indicators"]) <= 3
+        assert len(bundle["position_sizing"]) <= 1
+        assert len(bundle["risk_management"]) <= 2
+        assert "name" in bundle["indicators"][0]
+        assert "explanation" in bundle["indicators"][0]
+        
+        # Results match the individual component queries
+        indicators = repo.get_indicators_for_strategy_type("momentum", limit=3)
+        assert [i["name"] for i in bundle["indicators"]] == [i["name"] for i in indicators]
+        
+        # Unknown strategy types return empty lists
+        empty = repo.get_recommendations_bundle("NonExistentStrategy")
+        assert empty == {"indicators": [], "position_sizing": [], "risk_management": []}
+    
     def test_get_parameters_for_indicator(self, repo):
         """Test retrieving parameters for an indicator."""
         # Get parameters for RSI
@@ -152,6 +180,15 @@ class TestStrategyRepository:
         assert "default_value" in parameters[0]
         assert "is_required" in parameters[0]
     
+    def test_get_parameters_for_indicators(self, repo):
+        """Test retrieving parameters for several indicators at once."""
+        parameters = repo.get_parameters_for_indicators(["RSI", "NonExistentIndicator"])
+        
+        # Every requested indicator gets an entry
+        assert parameters["NonExistentIndicator"] == []
+        by_name = lambda params: sorted(params, key=lambda p: p["name"])
+        assert by_name(parameters["RSI"]) == by_name(repo.get_parameters_for_indicator("RSI"))
+    
     def test_get_compatible_frequencies_for_instrument(self, repo):
         """Test retrieving compatible frequencies for an instrument."""
         # Get frequencies for BTCUSDT
@@ -130,4 +130,12 @@ async def test_get_user_by_id(mock_db_manager):
     assert retrieved_user.id == created_user.id
     assert retrieved_user.username == "iduser"
     assert retrieved_user.email == "id@example.com"
-    assert retrieved_user.password_hash == hashed_password
\ No newline at end of file
+    assert retrieved_user.password_hash == hashed_password
+
+def test_get_user_repository_shared(mock_db_manager):
+    """Test that the user repository is shared per database manager."""
+    from src.database.repositories.user_repository import get_user_repository
+    
+    repo = get_user_repository(mock_db_manager)
+    assert repo is get_user_repository(mock_db_manager)
+    assert repo.db_manager is mock_db_manager
@@ -238,4 +238,91 @@ def test_error_handling(validation_agent):
     
     # Verify appropriate error response
     assert response["message_type"] == "error"
-    assert "no strategy parameters" in response["content"]["text"].lower()
\ No newline at end of file
+    assert "no strategy parameters" in response["content"]["text"].lower()
+
+def test_llm_consistency_check_cached(validation_agent, mock_llm):
+    """Test that identical parameters reuse the cached LLM consistency check."""
+    params = {"strategy_type": "momentum", "parameters": {"lookback_period": 14, "threshold": 0.05}}
+    reordered = {"parameters": {"threshold": 0.05, "lookback_period": 14}, "strategy_type": "momentum"}
+    
+    first = validation_agent._llm_consistency_check(params)
+    first["suggestions"].append("mutated by caller")
+    second = validation_agent._llm_consistency_check(reordered)
+    
+    assert mock_llm.extract_json.call_count == 1
+    assert "mutated by caller" not in second["suggestions"]
+    
+    # LLM failures are not cached
+    mock_llm.extract_json.side_effect = Exception("LLM unavailable")
+    params["parameters"]["lookback_period"] = 20
+    assert "Error during LLM consistency check" in validation_agent._llm_consistency_check(params)["errors"][0]
+    validation_agent._llm_consistency_check(params)
+    assert mock_llm.extract_json.call_count == 3
+
+
+def test_validate_batch(validation_agent):
+    """Test vectorized range checks across many candidate values."""
+    import numpy as np
+    
+    results = validation_agent.validate_batch("momentum", {
+        "lookback_period": np.array([0, 5, 50, 200, 600]),
+        "threshold": [0.05, 0.9],
+        "unknown_param": np.array([1, 2])
+    })
+    
+    assert set(results) == {"lookback_period", "threshold"}
+    assert results["lookback_period"]["errors"].tolist() == [True, False, False, False, True]
+    assert results["lookback_period"]["warnings"].tolist() == [True, True, False, True, True]
+    assert results["threshold"]["errors"].tolist() == [False, True]
+    
+    # Agrees with the single-strategy check
+    errors, warnings, suggestions = [], [], []
+    validation_agent._check_parameter_rules(
+        {"strategy_type": "momentum", "parameters": {"lookback_period": 5, "threshold": 0.05}},
+        errors, warnings, suggestions
+    )
+    assert errors == [] and len(warnings) == 1
+
+
+def test_validate_batch_large_matches_numpy(validation_agent):
+    """Test that large batches give the same masks as the NumPy comparisons."""
+    import numpy as np
+    from src.agents.validation_agent import JIT_BATCH_THRESHOLD
+    
+    values = np.linspace(-10, 700, JIT_BATCH_THRESHOLD + 7)
+    values[3] = np.nan
+    results = validation_agent.validate_batch("momentum", {"lookback_period": values})
+    
+    assert np.array_equal(results["lookback_period"]["errors"], (values < 1) | (values > 500))
+    assert np.array_equal(results["lookback_period"]["warnings"], (values < 10) | (values > 100))
+
+
+def test_llm_check_skipped_when_rules_fail(validation_agent, mock_llm):
+    """Test that the LLM is not consulted when rule-based checks already fail."""
+    result = validation_agent._run_validation_checks({
+        "strategy_type": "momentum",
+        "parameters": {"lookback_period": 0, "threshold": 0.05}
+    })
+    
+    assert result["is_valid"] is False
+    mock_llm.extract_json.assert_not_called()
+
+
+def test_bounds_kernel_not_compiled_on_import():
+    """Test that importing the agent does not compile the Numba kernel."""
+    import subprocess
+    import sys
+    from pathlib import Path
+    
+    pytest.importorskip("numba")
+    script = (
+        "from src.agents.validation_agent import _check_bounds_kernel; "
+        "print(len(_check_bounds_kernel.signatures))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).resolve().parents[2],
+        capture_output=True, text=True, check=True
+    ).stdout
+    
+    assert output.strip() == "0"